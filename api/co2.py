@@ -7,15 +7,11 @@ This reduces serverless function count for Vercel Hobby plan limit
 from http.server import BaseHTTPRequestHandler
 import json
 import os
-import importlib.util
+import sys
 
-def load_module(name):
-    """Dynamically load a module from the api/lib directory"""
-    module_path = os.path.join(os.path.dirname(__file__), 'lib', f'{name}.py')
-    spec = importlib.util.spec_from_file_location(name, module_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+# Shared dispatch registry (api/lib/dispatch.py) handles validation and routing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'lib'))
+from dispatch import handle_post, names
 
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
@@ -32,41 +28,8 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps({
             "status": "CO-2 Cipher API ready",
-            "ciphers": ["rsa"]
+            "ciphers": names('co2')
         }).encode('utf-8'))
     
     def do_POST(self):
-        try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
-            cipher = data.get('cipher', 'rsa')
-            result = None
-            
-            if cipher == 'rsa':
-                module = load_module('rsa')
-                p = int(data.get('p', 61))
-                q = int(data.get('q', 53))
-                e = int(data.get('e', 17))
-                m = int(data.get('m', 65))
-                result = module.rsa_encrypt_detailed(p, q, e, m)
-            
-            else:
-                result = {"success": False, "error": f"Unknown cipher: {cipher}"}
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(result).encode('utf-8'))
-            
-        except Exception as ex:
-            self.send_response(500)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({
-                'success': False,
-                'error': str(ex)
-            }).encode('utf-8'))
+        handle_post(self, 'co2')
@@ -2,6 +2,11 @@ from http.server import BaseHTTPRequestHandler
 import json
 import math
 
+from narration import final_result_section
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+HEADERS = "ADFGVX"
+
 def generate_polybius_square_detailed(keyword):
     """Generate 6x6 Polybius square with detailed steps"""
     lines = []
@@ -80,8 +85,74 @@ def generate_polybius_square_detailed(keyword):
     return char_to_coords, coords_to_char, '\n'.join(lines), grid_content
 
 
-def encrypt_adfgvx_detailed(plaintext, poly_key, trans_key):
-    """ADFGVX Encryption with detailed atomic steps"""
+def polybius_square(keyword):
+    """6×6 Polybius square as (char_to_coords, coords_to_char), no narration"""
+    grid_content = ""
+    for char in keyword.lower() + ALPHABET:
+        if char in ALPHABET and char not in grid_content:
+            grid_content += char
+    char_to_coords = {}
+    for index, char in enumerate(grid_content):
+        char_to_coords[char] = HEADERS[index // 6] + HEADERS[index % 6]
+    return char_to_coords, {pair: char for char, pair in char_to_coords.items()}
+
+
+def adfgvx_encrypt(plaintext, poly_key, trans_key, square=None):
+    """ADFGVX encryption, no narration. Returns (ciphertext, fractionated_text)
+    square: polybius_square(poly_key), when already computed"""
+    char_map, _ = square or polybius_square(poly_key)
+    fractionated_text = "".join(char_map[c] for c in plaintext.lower() if c.isalnum() and c in char_map)
+    key_len = len(trans_key)
+    key_order = sorted((char, i) for i, char in enumerate(trans_key.upper()))
+    ciphertext = " ".join(fractionated_text[i::key_len] for _, i in key_order)
+    return ciphertext, fractionated_text
+
+
+def adfgvx_decrypt(ciphertext, poly_key, trans_key, square=None):
+    """ADFGVX decryption, no narration. Returns (plaintext, fractionated_text)
+    square: polybius_square(poly_key), when already computed"""
+    _, coords_map = square or polybius_square(poly_key)
+    clean_cipher = ciphertext.replace(" ", "")
+    key_len = len(trans_key)
+    col_height, remainder = divmod(len(clean_cipher), key_len)
+    key_order = sorted((char, i) for i, char in enumerate(trans_key.upper()))
+    columns = [""] * key_len
+    current_idx = 0
+    for _, original_idx in key_order:
+        height = col_height + (1 if original_idx < remainder else 0)
+        columns[original_idx] = clean_cipher[current_idx:current_idx + height]
+        current_idx += height
+    fractionated_text = "".join(columns[c][r] for r in range(col_height + 1)
+                                for c in range(key_len) if r < len(columns[c]))
+    plaintext = "".join(coords_map[fractionated_text[i:i + 2]] for i in range(0, len(fractionated_text), 2)
+                        if fractionated_text[i:i + 2] in coords_map)
+    return plaintext, fractionated_text
+
+
+def _summary_lines(mode, text, poly_key, trans_key, fractionated_text, output):
+    """Lines of the "Final Result" section"""
+    return [
+        f"ADFGVX {'ENCRYPTION' if mode == 'encrypt' else 'DECRYPTION'} COMPLETE",
+        "",
+        f"{'Plaintext:' if mode == 'encrypt' else 'Ciphertext:'}         {text}",
+        f"Polybius Key:       {poly_key}",
+        f"Transposition Key:  {trans_key}",
+        f"Fractionated:       {fractionated_text}",
+        f"{'Ciphertext:' if mode == 'encrypt' else 'Plaintext:'}         {output}",
+    ]
+
+
+def encrypt_adfgvx_detailed(plaintext, poly_key, trans_key, verbosity='full', schedule=None):
+    """ADFGVX Encryption with detailed atomic steps
+    schedule: polybius_square(poly_key), when already computed (used by non-full verbosity)"""
+    if verbosity != 'full':
+        ciphertext, fractionated_text = adfgvx_encrypt(plaintext, poly_key, trans_key, schedule)
+        result = {"success": True, "mode": "encrypt", "ciphertext": ciphertext, "fractionated": fractionated_text}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(
+                _summary_lines('encrypt', plaintext, poly_key, trans_key, fractionated_text, ciphertext))]
+        return result
+    
     all_sections = []
     
     # Section 1: Input Parameters
@@ -232,8 +303,17 @@ ADFGVX Cipher Overview:
     }
 
 
-def decrypt_adfgvx_detailed(ciphertext, poly_key, trans_key):
-    """ADFGVX Decryption with detailed atomic steps"""
+def decrypt_adfgvx_detailed(ciphertext, poly_key, trans_key, verbosity='full', schedule=None):
+    """ADFGVX Decryption with detailed atomic steps
+    schedule: polybius_square(poly_key), when already computed (used by non-full verbosity)"""
+    if verbosity != 'full':
+        plaintext, fractionated_text = adfgvx_decrypt(ciphertext, poly_key, trans_key, schedule)
+        result = {"success": True, "mode": "decrypt", "plaintext": plaintext, "fractionated": fractionated_text}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(
+                _summary_lines('decrypt', ciphertext, poly_key, trans_key, fractionated_text, plaintext))]
+        return result
+    
     all_sections = []
     
     # Section 1: Input Parameters
@@ -0,0 +1,856 @@
+"""
+Declarative dispatch registry shared by the serverless entry points (co1, co2, math-ops)
+and the dev server.
+
+Each cipher/operation is registered once with its parameter schema. Incoming JSON is
+validated and coerced against the schema before any cipher code runs, then dispatched
+with a single dict lookup. Adding a cipher only means adding one @register block here.
+
+Requests with "stream": true are answered as NDJSON (see narration.py). Entries with a
+@sections_for generator stream each section as it is built; the rest stream the
+sections of their finished result.
+
+A body with a "jobs" list is a batch: each job is one request object (its "params" dict
+merged with its other fields) and the response carries one result per job. Entries with
+a @schedule_for builder compute their key schedule once per distinct key in the batch.
+"""
+
+import base64
+import binascii
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+from loader import load_module
+from narration import DEFAULT_MAX_STEPS, DEFAULT_VERBOSITY, VERBOSITY_LEVELS
+
+
+class SchemaError(ValueError):
+    """Request parameters failed schema validation (reported as HTTP 400)"""
+
+
+# ========== Parameter Types ==========
+
+def integer(min=None, max=None):
+    """Integer parameter (accepts ints, integral floats and numeric strings)"""
+    def coerce(value, name):
+        if isinstance(value, bool):
+            raise SchemaError(f"'{name}' must be an integer")
+        if isinstance(value, float):
+            if not value.is_integer():
+                raise SchemaError(f"'{name}' must be an integer")
+            value = int(value)
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise SchemaError(f"'{name}' must be an integer")
+        if min is not None and value < min:
+            raise SchemaError(f"'{name}' must be ≥ {min}")
+        if max is not None and value > max:
+            raise SchemaError(f"'{name}' must be ≤ {max}")
+        return value
+    return coerce
+
+
+def text():
+    """String parameter"""
+    def coerce(value, name):
+        if not isinstance(value, str):
+            raise SchemaError(f"'{name}' must be a string")
+        return value
+    return coerce
+
+
+def payload():
+    """String, or the raw bytes of an application/octet-stream upload (see handle_post)"""
+    def coerce(value, name):
+        if not isinstance(value, (str, bytes)):
+            raise SchemaError(f"'{name}' must be a string")
+        return value
+    return coerce
+
+
+def hex_integer():
+    """Non-negative big integer given as a hex string (or a JSON number); optional.
+    Hex strings avoid the precision loss of JSON numbers beyond 2⁵³ in browsers."""
+    def coerce(value, name):
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value, 16)
+            except ValueError:
+                pass
+        raise SchemaError(f"'{name}' must be a hexadecimal string")
+    return coerce
+
+
+def boolean():
+    """JSON true/false (or "true"/"false"/"1"/"0", as sent in an upload's query string)"""
+    def coerce(value, name):
+        if isinstance(value, str) and value.lower() in ('true', 'false', '1', '0'):
+            return value.lower() in ('true', '1')
+        if not isinstance(value, bool):
+            raise SchemaError(f"'{name}' must be true or false")
+        return value
+    return coerce
+
+
+def choice(*options):
+    """String parameter restricted to a fixed set of values"""
+    def coerce(value, name):
+        if value not in options:
+            raise SchemaError(f"'{name}' must be one of: {', '.join(options)}")
+        return value
+    return coerce
+
+
+def int_list(length=None, min=None, max=None, optional=False):
+    """List of integers, optionally of fixed length and value range"""
+    item = integer(min, max)
+
+    def coerce(value, name):
+        if value is None and optional:
+            return None
+        if not isinstance(value, list):
+            raise SchemaError(f"'{name}' must be a list of integers")
+        if length is not None and len(value) != length:
+            raise SchemaError(f"'{name}' must have exactly {length} values")
+        return [item(v, name) for v in value]
+    return coerce
+
+
+def int_matrix():
+    """Square matrix of integers"""
+    item = integer()
+
+    def coerce(value, name):
+        if not isinstance(value, list) or not all(isinstance(row, list) for row in value):
+            raise SchemaError(f"'{name}' must be a matrix (list of rows)")
+        if any(len(row) != len(value) for row in value):
+            raise SchemaError(f"'{name}' must be square")
+        return [[item(v, name) for v in row] for row in value]
+    return coerce
+
+
+def bits(length):
+    """Bit string of an exact length, e.g. '10111101'"""
+    def coerce(value, name):
+        if not isinstance(value, str) or len(value) != length or set(value) - {'0', '1'}:
+            raise SchemaError(f"'{name}' must be exactly {length} binary digits")
+        return value
+    return coerce
+
+
+def sbox():
+    """4×4 S-box of 2-bit strings"""
+    entry = bits(2)
+
+    def coerce(value, name):
+        if (not isinstance(value, list) or len(value) != 4
+                or any(not isinstance(row, list) or len(row) != 4 for row in value)):
+            raise SchemaError(f"'{name}' must be a 4×4 table")
+        return [[entry(v, name) for v in row] for row in value]
+    return coerce
+
+
+def bit_pairs(length, max_pairs):
+    """Non-empty list of [input, output] bit-string pairs, e.g. known plaintext/ciphertext blocks"""
+    entry = bits(length)
+
+    def coerce(value, name):
+        if (not isinstance(value, list) or not 1 <= len(value) <= max_pairs
+                or any(not isinstance(pair, list) or len(pair) != 2 for pair in value)):
+            raise SchemaError(f"'{name}' must be a list of 1 to {max_pairs} [input, output] pairs")
+        return [[entry(v, name) for v in pair] for pair in value]
+    return coerce
+
+
+class Param:
+    """One request field: JSON name, coercion function and default value"""
+
+    def __init__(self, name, coerce, default):
+        self.name = name
+        self.coerce = coerce
+        self.default = default
+
+    def parse(self, data):
+        value = data.get(self.name)
+        if value is None:
+            return self.default
+        return self.coerce(value, self.name)
+
+
+class Entry:
+    """A registered cipher/operation: its handler plus parameter schema"""
+
+    def __init__(self, name, run, params, check=None):
+        self.name = name
+        self.run = run
+        self.params = params
+        self.check = check
+        self.sections = None  # optional fn(args) -> section generator, see sections_for
+        self.schedule = None  # optional (key fn, builder fn), see schedule_for
+
+    def parse(self, data):
+        args = {param.name: param.parse(data) for param in self.params}
+        if self.check:
+            self.check(args)
+        return args
+
+
+# endpoint -> (selector field, default name)
+ENDPOINTS = {
+    'co1': ('cipher', 'monoalphabetic'),
+    'co2': ('cipher', 'rsa'),
+    'math-ops': ('operation', 'gcd'),
+}
+
+REGISTRY = {endpoint: {} for endpoint in ENDPOINTS}
+
+# Accepted by every cipher/operation: how much narration to build (see narration.py)
+VERBOSITY = Param('verbosity', choice(*VERBOSITY_LEVELS), DEFAULT_VERBOSITY)
+
+# Step-by-step exponentiation loops: steps narrated in full at each end (see narration.step_window)
+MAX_STEPS = Param('maxSteps', integer(min=1), DEFAULT_MAX_STEPS)
+
+# Read by handle_post: answer as an NDJSON stream instead of one JSON document
+STREAM = Param('stream', boolean(), False)
+
+# Batch requests: most jobs per request, and the narration level jobs get unless they set one
+MAX_BATCH_JOBS = 1000
+BATCH_VERBOSITY = Param('verbosity', choice(*VERBOSITY_LEVELS), 'result')
+
+
+def register(endpoint, name, *params, check=None):
+    """Decorator registering fn(args) as the handler for `name` on `endpoint`"""
+    def decorator(fn):
+        REGISTRY[endpoint][name] = Entry(name, fn, params + (VERBOSITY,), check)
+        return fn
+    return decorator
+
+
+def sections_for(endpoint, name):
+    """Decorator adding a section generator fn(args) to an already registered entry"""
+    def decorator(fn):
+        REGISTRY[endpoint][name].sections = fn
+        return fn
+    return decorator
+
+
+def schedule_for(endpoint, name, key):
+    """Decorator adding a key-schedule builder fn(args) to an already registered entry.
+    `key(args)` gives the hashable cache key; within a batch the builder runs once per key
+    and its value is passed to the handler as args['schedule']."""
+    def decorator(fn):
+        REGISTRY[endpoint][name].schedule = (key, fn)
+        return fn
+    return decorator
+
+
+def names(endpoint):
+    """Cipher/operation names available on an endpoint"""
+    return list(REGISTRY[endpoint])
+
+
+def dispatch(endpoint, data, schedules=None):
+    """Validate `data` against the selected entry's schema and run it.
+    `schedules` is a batch-wide key schedule cache (see dispatch_batch)."""
+    field, default = ENDPOINTS[endpoint]
+    name = data.get(field, default)
+    entry = REGISTRY[endpoint].get(name)
+    if entry is None:
+        return {"success": False, "error": f"Unknown {field}: {name}"}
+    args = entry.parse(data)
+    # Narrated runs rebuild the schedule step by step anyway, so only the fast paths take one
+    if schedules is not None and entry.schedule is not None and args['verbosity'] != 'full':
+        key, build = entry.schedule
+        cache_key = (endpoint, name, key(args))
+        if cache_key not in schedules:
+            schedules[cache_key] = build(args)
+        args['schedule'] = schedules[cache_key]
+    return entry.run(args)
+
+
+def dispatch_batch(endpoint, data):
+    """Run every job in data["jobs"]; one job failing does not fail the batch"""
+    jobs = data['jobs']
+    if not isinstance(jobs, list):
+        raise SchemaError("'jobs' must be a list")
+    if len(jobs) > MAX_BATCH_JOBS:
+        raise SchemaError(f"'jobs' must have at most {MAX_BATCH_JOBS} entries")
+    if data.get('stream'):
+        raise SchemaError("Batch requests cannot be streamed")
+    verbosity = BATCH_VERBOSITY.parse(data)
+
+    schedules = {}
+    results = []
+    for job in jobs:
+        try:
+            if not isinstance(job, dict):
+                raise SchemaError("Each job must be a JSON object")
+            params = job.get('params') or {}
+            if not isinstance(params, dict):
+                raise SchemaError("'params' must be a JSON object")
+            job_data = {'verbosity': verbosity, **params}
+            job_data.update((k, v) for k, v in job.items() if k != 'params')
+            results.append(dispatch(endpoint, job_data, schedules))
+        except Exception as ex:
+            results.append({'success': False, 'error': str(ex)})
+
+    return {
+        "success": True,
+        "count": len(results),
+        "key_schedules": len(schedules),
+        "results": results
+    }
+
+
+def dispatch_stream(endpoint, data):
+    """Like dispatch, but returns an iterator of NDJSON records: each section, then the result.
+    Validation happens before this returns, so SchemaError can still become an HTTP 400."""
+    field, default = ENDPOINTS[endpoint]
+    name = data.get(field, default)
+    entry = REGISTRY[endpoint].get(name)
+    if entry is None:
+        return iter([{"success": False, "error": f"Unknown {field}: {name}"}])
+    args = entry.parse(data)
+    if entry.sections is not None and args['verbosity'] == 'full':
+        return _stream_generator(entry.sections(args))
+    return _stream_result(entry.run(args))
+
+
+def _stream_generator(sections):
+    result = yield from sections
+    yield result
+
+
+def _stream_result(result):
+    sections = result.pop("sections", [])
+    yield from sections
+    yield result
+
+
+# ========== HTTP Helpers ==========
+
+def send_json(handler, status, payload):
+    """Write a JSON response with the CORS header every endpoint uses"""
+    handler.send_response(status)
+    handler.send_header('Content-type', 'application/json')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.end_headers()
+    handler.wfile.write(json.dumps(payload).encode('utf-8'))
+
+
+def send_ndjson(handler, records):
+    """Write each record as one JSON line, flushing after every line.
+    Errors after the headers are sent are reported as a final error record."""
+    handler.send_response(200)
+    handler.send_header('Content-type', 'application/x-ndjson')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.send_header('Cache-Control', 'no-cache')
+    handler.end_headers()
+    try:
+        for record in records:
+            handler.wfile.write(json.dumps(record).encode('utf-8'))
+            handler.wfile.write(b'\n')
+            handler.wfile.flush()
+    except Exception as ex:
+        handler.wfile.write(json.dumps({'success': False, 'error': str(ex)}).encode('utf-8') + b'\n')
+
+
+def handle_post(handler, endpoint):
+    """Read the JSON body from `handler`, dispatch it and write the response.
+    An application/octet-stream body is a file upload: the parameters come from the
+    query string and the raw body becomes the "data" field."""
+    try:
+        content_length = int(handler.headers['Content-Length'])
+        post_data = handler.rfile.read(content_length)
+        if (handler.headers.get('Content-Type') or '').startswith('application/octet-stream'):
+            data = dict(parse_qsl(urlsplit(handler.path).query))
+            data['data'] = post_data
+        else:
+            data = json.loads(post_data.decode('utf-8'))
+        if not isinstance(data, dict):
+            raise SchemaError("Request body must be a JSON object")
+        if 'jobs' in data:
+            send_json(handler, 200, dispatch_batch(endpoint, data))
+            return
+        if STREAM.parse(data):
+            send_ndjson(handler, dispatch_stream(endpoint, data))
+            return
+        send_json(handler, 200, dispatch(endpoint, data))
+    except SchemaError as ex:
+        send_json(handler, 400, {'success': False, 'error': str(ex)})
+    except Exception as ex:
+        send_json(handler, 500, {'success': False, 'error': str(ex)})
+
+
+# ========== CO-1: Classical Ciphers ==========
+
+@register('co1', 'monoalphabetic',
+          Param('plaintext', text(), 'HELLO'),
+          Param('mode', choice('additive', 'multiplicative', 'affine'), 'additive'),
+          Param('operation', choice('encrypt', 'decrypt'), 'encrypt'),
+          Param('key_k', integer(), 3),
+          Param('key_a', integer(), 5),
+          Param('key_b', integer(), 8))
+def _monoalphabetic(p):
+    return load_module('monoalphabetic').monoalphabetic_cipher_detailed(
+        p['plaintext'], p['mode'], key_k=p['key_k'], key_a=p['key_a'], key_b=p['key_b'],
+        operation=p['operation'], verbosity=p['verbosity'], schedule=p.get('schedule'))
+
+
+@schedule_for('co1', 'monoalphabetic', key=lambda p: (p['mode'], p['key_a'], p['key_b'], p['key_k']))
+def _monoalphabetic_schedule(p):
+    return load_module('monoalphabetic').compile_key(p['mode'], p['key_a'], p['key_b'], p['key_k'])
+
+
+def _check_hill(p):
+    if len(p['keyMatrix']) != p['m']:
+        raise SchemaError(f"Key matrix must be {p['m']}×{p['m']}")
+
+
+@register('co1', 'hill',
+          Param('plaintext', text(), 'HELLO'),
+          Param('keyMatrix', int_matrix(), [[6, 24, 1], [13, 16, 10], [20, 17, 15]]),
+          Param('m', integer(min=2), 3),
+          Param('vectorMode', choice('column', 'row'), 'column'),
+          check=_check_hill)
+def _hill(p):
+    return load_module('hill').hill_cipher_detailed(p['plaintext'], p['keyMatrix'], p['m'], p['vectorMode'],
+                                                    verbosity=p['verbosity'], schedule=p.get('schedule'))
+
+
+@schedule_for('co1', 'hill', key=lambda p: tuple(map(tuple, p['keyMatrix'])))
+def _hill_schedule(p):
+    return load_module('hill').key_schedule(p['keyMatrix'])
+
+
+def _check_hill_attack(p):
+    if p['mode'] == 'ciphertext_only':
+        if p['m'] != 2:
+            raise SchemaError("Ciphertext-only search supports 2×2 keys only")
+        if len(p['ciphertext']) < 4:
+            raise SchemaError("Ciphertext needs at least 2 blocks")
+        return
+    if len(p['plaintext']) != len(p['ciphertext']):
+        raise SchemaError("Plaintext and ciphertext must have the same length")
+    if len(p['plaintext']) % p['m'] != 0:
+        raise SchemaError(f"Plaintext length ({len(p['plaintext'])}) must be a multiple of {p['m']}")
+
+
+@register('co1', 'hill_attack',
+          Param('mode', choice('known_plaintext', 'ciphertext_only'), 'known_plaintext'),
+          Param('plaintext', text(), 'SHORTEXAMPLE'),
+          Param('ciphertext', text(), 'XTPJRGRUDVTQ'),
+          Param('m', integer(min=2, max=10), 2),
+          Param('vectorMode', choice('column', 'row'), 'column'),
+          Param('top', integer(min=1, max=50), 5),
+          MAX_STEPS,
+          check=_check_hill_attack)
+def _hill_attack(p):
+    hill = load_module('hill')
+    if p['mode'] == 'ciphertext_only':
+        return hill.ciphertext_only_detailed(p['ciphertext'], p['vectorMode'], p['top'], verbosity=p['verbosity'])
+    return hill.known_plaintext_detailed(p['plaintext'], p['ciphertext'], p['m'], p['vectorMode'],
+                                         max_steps=p['maxSteps'], verbosity=p['verbosity'])
+
+
+@register('co1', 'adfgvx',
+          Param('mode', choice('encrypt', 'decrypt'), 'encrypt'),
+          Param('polyKey', text(), 'privacy'),
+          Param('transKey', text(), 'cipher'),
+          Param('plaintext', text(), 'attackat1200am'),
+          Param('ciphertext', text(), ''))
+def _adfgvx(p):
+    module = load_module('adfgvx')
+    if p['mode'] == 'encrypt':
+        return module.encrypt_adfgvx_detailed(p['plaintext'], p['polyKey'], p['transKey'],
+                                              verbosity=p['verbosity'], schedule=p.get('schedule'))
+    return module.decrypt_adfgvx_detailed(p['ciphertext'], p['polyKey'], p['transKey'],
+                                          verbosity=p['verbosity'], schedule=p.get('schedule'))
+
+
+@schedule_for('co1', 'adfgvx', key=lambda p: p['polyKey'])
+def _adfgvx_schedule(p):
+    return load_module('adfgvx').polybius_square(p['polyKey'])
+
+
+def _check_playfair(p):
+    if p['mode'] == 'decrypt':
+        letters = len(load_module('playfair').clean_ciphertext(p['ciphertext']))
+        if letters == 0 or letters % 2:
+            raise SchemaError("Playfair ciphertext must have an even, non-zero number of letters")
+
+
+@register('co1', 'playfair',
+          Param('mode', choice('encrypt', 'decrypt'), 'encrypt'),
+          Param('plaintext', text(), 'HELLO'),
+          Param('ciphertext', text(), ''),
+          Param('keyword', text(), 'MONARCHY'),
+          check=_check_playfair)
+def _playfair(p):
+    module = load_module('playfair')
+    if p['mode'] == 'encrypt':
+        return module.playfair_cipher_detailed(p['plaintext'], p['keyword'], verbosity=p['verbosity'],
+                                               schedule=p.get('schedule'))
+    return module.playfair_decrypt_detailed(p['ciphertext'], p['keyword'], verbosity=p['verbosity'],
+                                            schedule=p.get('schedule'))
+
+
+@schedule_for('co1', 'playfair', key=lambda p: p['keyword'])
+def _playfair_schedule(p):
+    return load_module('playfair').key_schedule(p['keyword'])
+
+
+def _check_playfair_attack(p):
+    letters = len(load_module('playfair').clean_ciphertext(p['ciphertext']))
+    if letters < 4 or letters % 2:
+        raise SchemaError("Playfair ciphertext must have an even number of letters (at least 4)")
+
+
+@register('co1', 'playfair_attack',
+          Param('ciphertext', text(), 'RKMEFPUFRYFKMVKFRANAIGBIMLUBBWPFNHRDKOIAMEDLGVKGRKHFRKKCTFALGFFMTIKGTFFMTQGRZU'
+                                      'CDHFGMDOFHAINRFHUGNALCPTVMVMSCHFPBOHMLBIGNRYRKGFULYBIQBFQIKMIFHZEKNCPCBXVKNOP'
+                                      'TTMHFZFEMEGOIXGDUGFRKHFUQRFBRLCIRRKMEONBEUTBRKGUMQWWATIPBBCRKHFTURDEATPIRCMNA'
+                                      'KRMVWAONTXOFYV'),
+          Param('timeLimit', integer(min=1, max=60), 5),
+          Param('restarts', integer(min=1, max=64), 4),
+          check=_check_playfair_attack)
+def _playfair_attack(p):
+    return load_module('playfair').playfair_attack_detailed(p['ciphertext'], p['timeLimit'], p['restarts'],
+                                                            verbosity=p['verbosity'])
+
+
+@sections_for('co1', 'playfair_attack')
+def _playfair_attack_sections(p):
+    return load_module('playfair').playfair_attack_sections(p['ciphertext'], p['timeLimit'], p['restarts'])
+
+
+# S-DES permutation and S-box tables, shared by the single-block and byte-stream entries
+SDES_TABLES = (
+    Param('P10', int_list(10, 1, 10), [3, 5, 2, 7, 4, 10, 1, 9, 8, 6]),
+    Param('P8', int_list(8, 1, 10), [6, 3, 7, 4, 8, 5, 10, 9]),
+    Param('IP', int_list(8, 1, 8), [2, 6, 3, 1, 4, 8, 5, 7]),
+    Param('EP', int_list(8, 1, 4), [4, 1, 2, 3, 2, 3, 4, 1]),
+    Param('P4', int_list(4, 1, 4), [2, 4, 3, 1]),
+    Param('S0', sbox(), [["01", "00", "11", "10"], ["11", "10", "01", "00"], ["00", "10", "01", "11"], ["11", "01", "11", "10"]]),
+    Param('S1', sbox(), [["00", "01", "10", "11"], ["10", "00", "01", "11"], ["11", "00", "01", "00"], ["10", "01", "00", "11"]]),
+)
+
+
+def _sdes_key(p):
+    return (p['key'], *map(tuple, (p['P10'], p['P8'], p['IP'], p['EP'], p['P4'])),
+            tuple(map(tuple, p['S0'])), tuple(map(tuple, p['S1'])))
+
+
+@register('co1', 'sdes',
+          Param('mode', choice('encrypt', 'decrypt'), 'encrypt'),
+          Param('plaintext', bits(8), '10111101'),
+          Param('ciphertext', bits(8), '01110101'),
+          Param('key', bits(10), '1010000010'),
+          *SDES_TABLES)
+def _sdes(p):
+    module = load_module('sdes')
+    IP_INV = module.calculate_ip_inverse(p['IP'])
+    if p['mode'] == 'decrypt':
+        return module.decrypt_with_detailed_steps(p['ciphertext'], p['key'], p['P10'], p['P8'], p['IP'],
+                                                  IP_INV, p['EP'], p['P4'], p['S0'], p['S1'], verbosity=p['verbosity'],
+                                                  schedule=p.get('schedule'))
+    return module.encrypt_with_detailed_steps(p['plaintext'], p['key'], p['P10'], p['P8'], p['IP'],
+                                              IP_INV, p['EP'], p['P4'], p['S0'], p['S1'], verbosity=p['verbosity'],
+                                              schedule=p.get('schedule'))
+
+
+@schedule_for('co1', 'sdes', key=_sdes_key)
+def _sdes_schedule(p):
+    return load_module('sdes').compile_key(p['key'], p['P10'], p['P8'], p['IP'], p['EP'], p['P4'], p['S0'], p['S1'])
+
+
+def _check_sdes_stream(p):
+    # Uploads arrive as raw bytes; JSON strings are decoded per inputEncoding
+    if isinstance(p['data'], bytes):
+        return
+    try:
+        if p['inputEncoding'] == 'hex':
+            p['data'] = bytes.fromhex(p['data'])
+        elif p['inputEncoding'] == 'base64':
+            p['data'] = base64.b64decode(p['data'], validate=True)
+        else:
+            p['data'] = p['data'].encode('utf-8')
+    except (ValueError, binascii.Error):
+        raise SchemaError(f"'data' is not valid {p['inputEncoding']}")
+
+
+@register('co1', 'sdes_stream',
+          Param('mode', choice('encrypt', 'decrypt'), 'encrypt'),
+          Param('blockMode', choice('ecb', 'cbc', 'ctr'), 'ecb'),
+          Param('data', payload(), 'Hello, S-DES!'),
+          Param('inputEncoding', choice('utf8', 'hex', 'base64'), 'utf8'),
+          Param('outputEncoding', choice('base64', 'hex'), 'base64'),
+          Param('key', bits(10), '1010000010'),
+          Param('iv', bits(8), '00000000'),
+          *SDES_TABLES,
+          MAX_STEPS,
+          check=_check_sdes_stream)
+def _sdes_stream(p):
+    return load_module('sdes').stream_with_detailed_steps(
+        p['data'], p['key'], p['P10'], p['P8'], p['IP'], p['EP'], p['P4'], p['S0'], p['S1'],
+        block_mode=p['blockMode'], mode=p['mode'], iv=p['iv'], output_encoding=p['outputEncoding'],
+        verbosity=p['verbosity'], max_steps=p['maxSteps'], schedule=p.get('schedule'))
+
+
+@schedule_for('co1', 'sdes_stream', key=_sdes_key)
+def _sdes_stream_schedule(p):
+    return _sdes_schedule(p)
+
+
+# Known pairs for key 1010000010 (single), and for Ka = 1010000010, Kb = 0111111101 (double)
+SDES_ATTACK_PAIRS = {
+    'single': [['10111101', '01110101'], ['01110010', '01110111'], ['11001100', '11000011']],
+    'double': [['10111101', '11110010'], ['01110010', '00100101'], ['11001100', '01010001'], ['00110101', '11010010']],
+}
+
+
+def _check_sdes_attack(p):
+    if p['pairs'] is None:
+        p['pairs'] = SDES_ATTACK_PAIRS[p['mode']]
+
+
+@register('co1', 'sdes_attack',
+          Param('mode', choice('single', 'double'), 'single'),
+          Param('pairs', bit_pairs(8, 256), None),
+          *SDES_TABLES,
+          check=_check_sdes_attack)
+def _sdes_attack(p):
+    return load_module('sdes').sdes_attack_detailed(p['pairs'], p['P10'], p['P8'], p['IP'], p['EP'], p['P4'],
+                                                    p['S0'], p['S1'], mode=p['mode'], verbosity=p['verbosity'])
+
+
+@sections_for('co1', 'sdes_attack')
+def _sdes_attack_sections(p):
+    return load_module('sdes').sdes_attack_sections(p['pairs'], p['P10'], p['P8'], p['IP'], p['EP'], p['P4'],
+                                                    p['S0'], p['S1'], mode=p['mode'])
+
+
+@register('co1', 'sdes_analysis', *SDES_TABLES)
+def _sdes_analysis(p):
+    return load_module('sdes').sdes_analysis_detailed(p['P10'], p['P8'], p['IP'], p['EP'], p['P4'], p['S0'], p['S1'],
+                                                      verbosity=p['verbosity'])
+
+
+@sections_for('co1', 'sdes_analysis')
+def _sdes_analysis_sections(p):
+    return load_module('sdes').sdes_analysis_sections(p['P10'], p['P8'], p['IP'], p['EP'], p['P4'], p['S0'], p['S1'])
+
+
+@register('co1', 'vigenere',
+          Param('mode', choice('encrypt', 'decrypt'), 'encrypt'),
+          Param('cipherType', choice('vigenere', 'autokey'), 'vigenere'),
+          Param('key', text(), 'KEY'),
+          Param('plaintext', text(), 'HELLO'),
+          Param('ciphertext', text(), ''))
+def _vigenere(p):
+    module = load_module('vigenere')
+    if p['cipherType'] == 'vigenere':
+        if p['mode'] == 'encrypt':
+            return module.vigenere_encrypt_detailed(p['plaintext'], p['key'], verbosity=p['verbosity'])
+        return module.vigenere_decrypt_detailed(p['ciphertext'], p['key'], verbosity=p['verbosity'])
+    if p['mode'] == 'encrypt':
+        return module.autokey_encrypt_detailed(p['plaintext'], p['key'], verbosity=p['verbosity'])
+    return module.autokey_decrypt_detailed(p['ciphertext'], p['key'], verbosity=p['verbosity'])
+
+
+def _check_rail_fence(p):
+    module = load_module('rail_fence')
+    if p['mode'] == 'analyze':
+        if len(p['ciphertext'].replace(' ', '')) < module.SCORE_NGRAM:
+            raise SchemaError(f"Rail fence analysis needs at least {module.SCORE_NGRAM} ciphertext characters")
+        return
+    cycle = module.cycle_length(p['numRails'])
+    if p['offset'] >= cycle:
+        raise SchemaError(f"'offset' must be less than the zig-zag cycle length 2 × (numRails − 1) = {cycle}")
+
+
+@register('co1', 'rail_fence',
+          Param('mode', choice('encrypt', 'decrypt', 'analyze'), 'encrypt'),
+          Param('numRails', integer(min=2), 3),
+          Param('offset', integer(min=0), 0),
+          Param('maxRails', integer(min=2, max=64), 10),
+          Param('top', integer(min=1, max=50), 5),
+          Param('plaintext', text(), 'WEAREDISCOVEREDFLEEATONCE'),
+          Param('ciphertext', text(), ''),
+          MAX_STEPS,
+          check=_check_rail_fence)
+def _rail_fence(p):
+    module = load_module('rail_fence')
+    if p['mode'] == 'analyze':
+        return module.rail_fence_analyze_detailed(p['ciphertext'], p['maxRails'], p['top'], verbosity=p['verbosity'])
+    if p['mode'] == 'encrypt':
+        return module.rail_fence_encrypt_detailed(p['plaintext'], p['numRails'], verbosity=p['verbosity'],
+                                                  offset=p['offset'], max_steps=p['maxSteps'])
+    return module.rail_fence_decrypt_detailed(p['ciphertext'], p['numRails'], verbosity=p['verbosity'],
+                                              offset=p['offset'], max_steps=p['maxSteps'])
+
+
+@sections_for('co1', 'rail_fence')
+def _rail_fence_sections(p):
+    module = load_module('rail_fence')
+    if p['mode'] == 'analyze':
+        return module.rail_fence_analyze_sections(p['ciphertext'], p['maxRails'], p['top'])
+    if p['mode'] == 'encrypt':
+        return module.rail_fence_encrypt_sections(p['plaintext'], p['numRails'], p['offset'], p['maxSteps'])
+    return module.rail_fence_decrypt_sections(p['ciphertext'], p['numRails'], p['offset'], p['maxSteps'])
+
+
+@register('co1', 'keyed',
+          Param('mode', choice('encrypt', 'decrypt'), 'encrypt'),
+          Param('keyword', text(), 'KEY'),
+          Param('columnOrder', int_list(optional=True), None),
+          Param('secondKeyword', text(), ''),
+          Param('plaintext', text(), 'WEAREDISCOVEREDFLEEATONCE'),
+          Param('ciphertext', text(), ''))
+def _keyed(p):
+    module = load_module('keyed_cipher')
+    if p['mode'] == 'encrypt':
+        return module.keyed_encrypt_detailed(p['plaintext'], p['keyword'], p['columnOrder'],
+                                             verbosity=p['verbosity'], second_keyword=p['secondKeyword'])
+    return module.keyed_decrypt_detailed(p['ciphertext'], p['keyword'], p['columnOrder'],
+                                         verbosity=p['verbosity'], second_keyword=p['secondKeyword'])
+
+
+@sections_for('co1', 'keyed')
+def _keyed_sections(p):
+    module = load_module('keyed_cipher')
+    if p['mode'] == 'encrypt':
+        return module.keyed_encrypt_sections(p['plaintext'], p['keyword'], p['columnOrder'], p['secondKeyword'])
+    return module.keyed_decrypt_sections(p['ciphertext'], p['keyword'], p['columnOrder'], p['secondKeyword'])
+
+
+def _check_keyed_attack(p):
+    if p['minLength'] > p['maxLength']:
+        raise SchemaError("'minLength' must not exceed 'maxLength'")
+    module = load_module('keyed_cipher')
+    letters = sum(c.isalpha() for c in p['ciphertext'])
+    if not module.attack_lengths(letters, p['minLength'], p['maxLength']):
+        raise SchemaError(f"No key length from {p['minLength']} to {p['maxLength']} divides the ciphertext "
+                          f"length ({letters}) with at least 2 rows")
+
+
+@register('co1', 'keyed_attack',
+          Param('ciphertext', text(), 'OENTYNCEHGTELPOAXETTLDNDWRIEIOREPXHIEOSROEERVRHEREDCTODAIEHTDRVUEDLXMEAUMG'
+                                      'ITEEHRDARCXTMMCEOTDHBOESBIRE'),
+          Param('minLength', integer(min=2, max=12), 2),
+          Param('maxLength', integer(min=2, max=12), 12),
+          Param('top', integer(min=1, max=50), 5),
+          check=_check_keyed_attack)
+def _keyed_attack(p):
+    return load_module('keyed_cipher').keyed_attack_detailed(p['ciphertext'], p['minLength'], p['maxLength'],
+                                                             p['top'], verbosity=p['verbosity'])
+
+
+@sections_for('co1', 'keyed_attack')
+def _keyed_attack_sections(p):
+    return load_module('keyed_cipher').keyed_attack_sections(p['ciphertext'], p['minLength'], p['maxLength'], p['top'])
+
+
+# ========== CO-2: RSA ==========
+
+@register('co2', 'rsa',
+          Param('p', integer(min=2), 61),
+          Param('q', integer(min=2), 53),
+          Param('e', integer(min=1), 17),
+          Param('m', integer(min=0), 65))
+def _rsa(p):
+    return load_module('rsa').rsa_encrypt_detailed(p['p'], p['q'], p['e'], p['m'], verbosity=p['verbosity'])
+
+
+def _check_rsa_engine(p):
+    if (p['p'] is None) != (p['q'] is None):
+        raise SchemaError("Give both p and q, or neither to generate a key")
+    if p['e'] % 2 == 0:
+        raise SchemaError("'e' must be odd")
+
+
+@register('co2', 'rsa_engine',
+          Param('bits', integer(min=1024, max=4096), 2048),
+          Param('e', integer(min=3), 65537),
+          Param('message', text(), 'HELLO RSA'),
+          Param('p', hex_integer(), None),
+          Param('q', hex_integer(), None),
+          check=_check_rsa_engine)
+def _rsa_engine(p):
+    return load_module('rsa').rsa_engine_detailed(p['bits'], p['e'], p['message'], p['p'], p['q'],
+                                                  verbosity=p['verbosity'])
+
+
+# ========== Math Operations ==========
+
+def _check_gcd(p):
+    if p['a'] == 0 and p['b'] == 0:
+        raise SchemaError("GCD(0, 0) is undefined: 'a' and 'b' cannot both be 0")
+
+
+@register('math-ops', 'gcd',
+          Param('a', integer(), 48),
+          Param('b', integer(), 18),
+          check=_check_gcd)
+def _gcd(p):
+    return load_module('gcd').gcd_detailed(p['a'], p['b'], verbosity=p['verbosity'])
+
+
+@register('math-ops', 'extended-euclidean',
+          Param('a', integer(), 17),
+          Param('m', integer(min=1), 26))
+def _extended_euclidean(p):
+    return load_module('extended-euclidean').extended_euclidean_detailed(p['a'], p['m'], verbosity=p['verbosity'])
+
+
+@register('math-ops', 'mod-exp',
+          Param('a', integer(), 7),
+          Param('n', integer(min=0), 256),
+          Param('m', integer(min=1), 13),
+          Param('algorithm', choice('right_to_left', 'left_to_right', 'sliding_window', 'montgomery_ladder'),
+                'right_to_left'),
+          Param('compare', boolean(), False),
+          MAX_STEPS)
+def _mod_exp(p):
+    return load_module('mod-exp').mod_exp_detailed(p['a'], p['n'], p['m'], verbosity=p['verbosity'],
+                                                   max_steps=p['maxSteps'], algorithm=p['algorithm'],
+                                                   compare=p['compare'])
+
+
+@sections_for('math-ops', 'mod-exp')
+def _mod_exp_sections(p):
+    return load_module('mod-exp').mod_exp_sections(p['a'], p['n'], p['m'], p['maxSteps'], p['algorithm'],
+                                                   p['compare'])
+
+
+@register('math-ops', 'euler',
+          Param('base', integer(), 7),
+          Param('exponent', integer(min=0), 256),
+          Param('modulus', integer(min=1), 13),
+          MAX_STEPS)
+def _euler(p):
+    return load_module('euler').euler_theorem_detailed(p['base'], p['exponent'], p['modulus'],
+                                                         verbosity=p['verbosity'], max_steps=p['maxSteps'])
+
+
+# Largest fermat modulus: testing a prime this size stays well inside a function timeout
+FERMAT_MAX_BITS = 4096
+
+
+def _check_fermat(p):
+    if p['modulus'].bit_length() > FERMAT_MAX_BITS:
+        raise SchemaError(f"'modulus' must have at most {FERMAT_MAX_BITS} bits")
+
+
+@register('math-ops', 'fermat',
+          Param('base', integer(), 3),
+          Param('exponent', integer(min=0), 100),
+          Param('modulus', integer(min=1), 7),
+          MAX_STEPS,
+          check=_check_fermat)
+def _fermat(p):
+    return load_module('fermat').fermat_theorem_detailed(p['base'], p['exponent'], p['modulus'],
+                                                           verbosity=p['verbosity'], max_steps=p['maxSteps'])
@@ -0,0 +1,318 @@
+"""
+English-language fitness scores for the cryptanalysis solvers (Hill, Playfair,
+rail fence, columnar). Texts are scored by summing log₁₀ n-gram probabilities
+estimated from the reference corpus below; an n-gram never seen in the corpus
+costs log₁₀(0.01 / N), so a single rare n-gram cannot veto an otherwise good
+candidate. Tables are flat lists indexed by the n-gram read as a base-26
+number (A=0), built on first use and kept for the life of the process.
+"""
+
+import math
+
+# Plain modern English prose; only its letters are used
+CORPUS = """
+When the morning train pulled out of the station, the town was still asleep. A few
+lights burned in the windows above the bakery, and the smell of fresh bread drifted
+down the empty street. Nobody noticed the man with the grey coat who stepped off the
+last carriage and stood for a moment on the platform, looking at the clock as if he
+had forgotten what time meant. He had been away for almost twenty years. The station
+had been painted, the old wooden benches had been replaced with metal ones, and the
+newspaper stand where he used to buy his father a paper every Sunday was gone. But
+the clock was the same, and so was the sound it made at the top of every hour.
+
+He picked up his bag and walked toward the centre of town. The houses were smaller
+than he remembered, which is what everyone says about the places they knew as
+children, and it was true. The river was lower, the bridge was narrower, and the
+church that had once seemed to touch the clouds was only a modest stone building
+with a slate roof and a tower that needed repair. He stopped at the corner where the
+school used to be and found a supermarket in its place, with a car park full of
+puddles and a sign promising the lowest prices in the county.
+
+There is a particular kind of silence that belongs to early mornings in small towns.
+It is not the absence of sound, because there are always birds, and a dog somewhere,
+and the distant hum of traffic on the main road. It is rather the feeling that the
+day has not yet decided what it will be. Anything might still happen. The shops
+have not opened, the arguments have not started, and the letters have not arrived.
+For a little while everyone is equal, and the whole town waits together.
+
+The history of writing is also, in a sense, the history of secrets. Almost as soon
+as people learned to record their thoughts in marks on clay or stone, they began to
+look for ways to hide those thoughts from the wrong readers. The earliest methods
+were simple. A scribe might replace one sign with another, or write the words in an
+unusual order, or leave out every second letter. Such tricks would not have stopped
+a determined reader for long, but they were enough to keep casual eyes away from
+private matters, and they show that the desire for privacy is as old as writing.
+
+Over the centuries the methods became more careful. Military commanders needed to
+send orders that the enemy could not read even if a messenger was captured. Merchants
+wanted to protect the prices they paid and the routes they used. Diplomats exchanged
+letters that could start or end a war, and every court in Europe employed clerks
+whose only task was to read the letters of other courts. The contest between those
+who made codes and those who broke them shaped the outcome of battles, the fate of
+queens, and the course of entire nations.
+
+A good cipher must be easy to use for the people who know the key and hard to break
+for everyone else. These two goals pull in opposite directions. A system that is too
+complicated will be used badly, and a system that is used badly will leak its secrets
+through careless mistakes. Many famous ciphers were not defeated by clever
+mathematics alone but by operators who sent the same message twice, who used the
+names of their wives as keys, or who began every report with the same greeting and
+the same weather forecast.
+
+The simplest substitution ciphers replace each letter of the alphabet with another
+letter. They are easy to describe and easy to use, but they preserve the frequency
+of the letters in the original language. In English the letter E is by far the most
+common, followed by T, A, O, I, N, S, H and R. A long message written in a simple
+substitution cipher will therefore show one symbol that appears much more often than
+the others, and a patient reader can start from there. Once a few letters are known,
+short words such as the, and, of and to fall into place, and the rest of the message
+follows quickly.
+
+To defeat this kind of attack, later systems used several alphabets in turn, or
+replaced pairs of letters instead of single letters, or moved the letters around so
+that their positions no longer matched the original order. Each of these ideas made
+the work of the code breaker harder, but none of them made it impossible. Statistics
+that are flat for single letters are often not flat for pairs, and the patterns of a
+language survive in surprising ways even after the text has been scrambled.
+
+It was raining again by the time she reached the office. She shook the water from
+her umbrella, hung her coat on the hook behind the door, and switched on the kettle
+before she even looked at the post. There were three letters on the desk. The first
+was a bill, the second was an invitation to a conference she had no intention of
+attending, and the third had no stamp and no return address. Her name was written on
+the envelope in careful capital letters, as if the writer had wanted to make sure
+that nobody could recognise the hand.
+
+Inside was a single sheet of paper covered with groups of five letters. She counted
+them twice. There were forty groups, arranged in eight neat rows, and at the bottom
+of the page someone had drawn a small star. She made a cup of tea, sat down at the
+window, and began to work. By the middle of the afternoon she knew that the message
+was not a simple substitution, because the letter counts were too even. By the
+evening she suspected that it used pairs of letters. By midnight she had found the
+word meeting, and after that it was only a matter of time.
+
+The meeting was to take place at the old boat house on the north shore of the lake,
+on the first Friday of the following month, at nine in the evening. The writer asked
+her to come alone and to bring the notebook that had belonged to her grandfather. She
+did not know that anyone else had heard of the notebook. She had found it herself,
+only a year earlier, in a box of papers that had been stored in the attic since the
+house was sold. It was full of numbers and diagrams that she had never been able to
+understand, and she had almost thrown it away.
+
+Scientists have long been interested in how people learn to read. A skilled reader
+does not look at every letter in turn but moves the eyes in short jumps, taking in
+several letters at once and using the context to predict what comes next. This is
+why a sentence with a missing word is still easy to understand, and why we often fail
+to notice spelling mistakes in familiar text. The brain is constantly guessing, and
+most of the time its guesses are correct. Only when something unexpected appears does
+the reader slow down and look more closely.
+
+The same ability to predict makes it possible to measure how much information a text
+contains. If the next letter is easy to guess, it tells us very little that we did
+not already know. If it is hard to guess, it carries more information. English is
+highly predictable. After the letter Q the next letter is almost always U, and after
+the words in the middle of the the reader can expect a noun. Experiments have shown
+that a fluent speaker can guess the next letter of ordinary text correctly more than
+half of the time, which means that much of what we write is redundant.
+
+Redundancy is not a weakness in ordinary communication. It allows us to understand
+each other on a noisy telephone line, to read a letter that has been damaged by
+water, and to follow a conversation in a crowded room. But for anyone who wants to
+keep a message secret, redundancy is dangerous. Every regular pattern in the plain
+text is a clue that may survive encryption, and every clue makes the work of the
+attacker a little easier. Modern systems are designed so that the output looks like
+random noise, with no trace of the language that went in.
+
+The farm had belonged to the same family for four generations. The house stood at
+the end of a long track between two fields, with an orchard on one side and a yard
+full of machinery on the other. In summer the hedges were thick with flowers and the
+air was loud with insects. In winter the track turned to mud and the wind came down
+from the hills with nothing to stop it. The children walked to the village school
+every day, whatever the weather, and learned to recognise every bird and every tree
+along the way.
+
+Their father kept cattle and grew wheat and barley. He was up before dawn every
+morning and rarely finished before dark. Their mother kept the accounts, looked after
+the hens, and sold eggs and vegetables at the market on Saturdays. Nobody in the
+family had much time for reading, but there was a shelf of old books in the front
+room, and on wet afternoons the youngest daughter would take one down and lose
+herself in stories of travellers and explorers who crossed deserts and mountains and
+oceans in search of places that nobody had ever seen.
+
+She grew up to be a teacher. She taught history and geography at a school in the
+city, and every year she told her students about the farm and the books on the
+shelf. She wanted them to understand that the world is larger than any one place,
+and that the people who lived before us were as clever and as foolish, as brave and
+as frightened, as we are ourselves. Some of her students remembered these lessons for
+the rest of their lives. Others forgot them by the end of the week. That, she said,
+is what teaching is like.
+
+Computers have changed the way we think about numbers. A calculation that once took
+a team of clerks several weeks can now be done in a fraction of a second, and
+problems that were once too large to attempt are now routine. Yet some questions
+remain hard no matter how fast the machine. There is no known quick method for
+finding the prime factors of a very large number, for example, and the security of
+much of the modern internet depends on the belief that no such method exists. If
+someone were to find one, many of the locks that protect our messages and our money
+would suddenly open.
+
+Mathematicians have studied prime numbers for more than two thousand years. A prime
+is a whole number greater than one that cannot be divided exactly by any number
+except one and itself. The first few primes are two, three, five, seven, eleven and
+thirteen. There are infinitely many of them, as the ancient Greeks already knew, but
+they become rarer as the numbers grow larger, and their exact pattern has never been
+fully understood. Some of the most famous unsolved problems in mathematics are
+questions about how the primes are spread along the number line.
+
+The expedition left the coast at the beginning of the dry season. There were twelve
+people in the party, with four trucks, enough water for three weeks, and a radio
+that worked only at night. For the first few days the road was good, and they made
+rapid progress across the plain. Then the road became a track, the track became a
+line of stones, and finally there was nothing but sand and rock in every direction.
+They navigated by the sun during the day and by the stars at night, and they checked
+their position against the old maps whenever they found a landmark they could trust.
+
+On the ninth day they reached the ruins. At first there was not much to see, only a
+few low walls and the outline of what might once have been a courtyard. But as they
+cleared away the sand they began to find inscriptions carved into the stone, rows of
+small signs that nobody in the party could read. They photographed every surface,
+made careful drawings, and measured the distance between the walls. In the evenings
+they sat around the fire and argued about what the signs might mean and who might
+have carved them.
+
+It took another six years, and the work of many people in many countries, before
+the inscriptions were finally understood. They turned out to be lists of goods and
+prices, records of trade between the city and its neighbours, together with a few
+prayers and the names of the rulers who had built the walls. There were no great
+secrets in them, no hidden treasure and no forgotten wisdom. But they told the story
+of ordinary people who had bought and sold, worked and worshipped, in a place that
+the rest of the world had forgotten, and that was treasure enough.
+
+Good habits are easier to keep than to start. Most people know that they ought to
+sleep more, eat better, and spend less time looking at their phones, but knowing is
+not the same as doing. The secret, according to those who study such things, is to
+make the new habit as small and as easy as possible at the beginning. Walk for five
+minutes instead of an hour. Read one page instead of a chapter. Once the habit is
+part of the daily routine it can grow, but if it starts too large it will probably
+be abandoned within a week.
+
+The same advice applies to learning a new skill. A musician does not begin with a
+concerto but with scales, repeated slowly until the fingers know them without
+thought. A painter begins with simple shapes and plain colours. A writer begins with
+short sentences and learns to make them clear before trying to make them beautiful.
+There is no shortcut through this stage, and the people who seem to have found one
+have usually practised for longer than anyone realised.
+
+The storm arrived just after midnight. It began with a low rumble far away to the
+west, and then, quite suddenly, the wind rose and the rain came down so hard that it
+was impossible to hear anything else. The lights in the harbour went out one by one.
+The boats pulled against their ropes, and somewhere a shutter banged again and again
+against a wall. In the morning the streets were covered with branches and broken
+tiles, and the sea was brown and angry as far as anyone could see.
+
+By noon the sky had cleared and people came out of their houses to look at the
+damage. Neighbours who had not spoken for months helped each other to clear the
+roads and repair the roofs. The owner of the café at the end of the harbour opened
+his doors and served coffee to anyone who needed it, and nobody was asked to pay.
+For a few days the whole town worked together as it had not done for years, and
+even after the last tile had been replaced, something of that feeling remained.
+
+Attack at dawn, the message said, and the general read it twice before he handed it
+to his officers. They had been waiting for this order for more than a week. The men
+were tired and cold, the supplies were running low, and everyone knew that the enemy
+had been strengthening their positions on the far side of the valley. Now the
+waiting was over. The officers returned to their units, the orders were passed along
+the lines, and in the last hours of darkness the whole army began to move.
+
+Nobody slept that night. The soldiers checked their weapons and wrote letters home,
+and some of them prayed. When the first grey light appeared over the hills, the
+signal was given, and the long lines of men advanced across the frozen fields toward
+the river. What happened next was recorded in many books, and argued about for many
+years, but the men who were there rarely spoke of it. They remembered the cold, the
+noise, and the friends they lost, and that was all they wanted to remember.
+
+Every language changes over time. Words that were common a century ago now sound
+strange and old fashioned, and new words appear every year to describe new things
+and new ideas. The grammar changes too, although more slowly, and the way people
+pronounce their words shifts from one generation to the next. A reader today can
+understand most of what was written two hundred years ago, but a text from a
+thousand years ago needs to be translated almost as if it were a foreign language.
+
+Despite these changes, some features of a language are remarkably stable. The most
+common words in English, such as the, of, and, to, in and is, have been among the
+most common for as long as English has been written. The relative frequencies of the
+letters change very little from one kind of text to another, whether it is a novel,
+a newspaper, or a scientific report. These stable features are exactly what a code
+breaker relies on, because they are present in almost every message, whoever wrote
+it and whatever it was about.
+
+The library was the oldest building on the campus and the quietest place in the
+city. Students came there to study for their examinations, to write their essays,
+and sometimes to sleep in the deep leather chairs by the windows. The librarian had
+worked there for over thirty years and knew where every book was kept, even the ones
+that had not been borrowed for decades. If you asked her a question she would think
+for a moment, then walk without hesitation to a shelf in some distant corner and
+return with exactly the book you needed.
+
+She was especially fond of the collection of old letters that the library had
+received from the estate of a local family. There were hundreds of them, written
+over more than a century, and they described births and deaths, marriages and
+quarrels, journeys abroad and news from home. Some were cheerful and some were sad,
+and a few were written in a simple private code that the family had used to keep
+their affairs from the servants. The librarian had broken the code one winter
+evening, and she liked to say that it was the most exciting thing she had ever done.
+
+There are many ways to measure the success of a life. Some people count money, or
+possessions, or the number of people who know their name. Others count friendships,
+or the children they have raised, or the places they have seen. A few count nothing
+at all and simply try to live each day as well as they can. None of these measures
+is entirely wrong, and none is entirely right. Perhaps the best we can do is to
+choose our own measure with care, and to remember that other people may have chosen
+differently for good reasons of their own.
+"""
+
+# Pseudo-count (a fraction of one occurrence) given to each n-gram absent from the corpus:
+# its probability is FLOOR_MASS / total, and ngram_table stores the log₁₀ of that
+FLOOR_MASS = 0.01
+
+_tables = {}  # n -> flat list of 26ⁿ log₁₀ probabilities
+
+
+def letters(text):
+    """A–Z numbers (A=0) of the letters in text, case-insensitive; everything else is dropped"""
+    return [ord(c) - 65 for c in text.upper() if 'A' <= c <= 'Z']
+
+
+def ngram_table(n):
+    """Flat list of log₁₀ P(n-gram) for every n-gram over A–Z, built once per process"""
+    if n not in _tables:
+        nums = letters(CORPUS)
+        counts = [0] * 26 ** n
+        size = 26 ** (n - 1)
+        index = 0
+        for i, x in enumerate(nums):
+            index = index % size * 26 + x
+            if i >= n - 1:
+                counts[index] += 1
+        total = len(nums) - n + 1
+        floor = math.log10(FLOOR_MASS / total)
+        _tables[n] = [math.log10(c / total) if c else floor for c in counts]
+    return _tables[n]
+
+
+def score(nums, n=2):
+    """Sum of log₁₀ n-gram probabilities over a sequence of letter numbers (higher is more English)"""
+    table = ngram_table(n)
+    size = 26 ** (n - 1)
+    total = 0.0
+    index = 0
+    for i, x in enumerate(nums):
+        index = index % size * 26 + x
+        if i >= n - 1:
+            total += table[index]
+    return total
+
+
+def score_text(text, n=2):
+    """score() of the letters of a string"""
+    return score(letters(text), n)
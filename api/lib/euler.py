@@ -1,6 +1,11 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import math
+import time
+
+from loader import load_module
+from narration import DEFAULT_MAX_STEPS, abbreviate, final_result_section
+from numtheory import FACTOR_TIME_BUDGET, WHEEL_LIMIT, factorize, totient
 
 def get_gcd(a, b):
     """Calculate GCD using Euclidean algorithm"""
@@ -8,11 +13,44 @@ def get_gcd(a, b):
         a, b = b, a % b
     return a
 
+# Above this, the totient narration also explains the factorization engine
+TRIAL_DIVISION_LIMIT = 10 ** 12
+
+FACTOR_TIMEOUT = "Could not factor the modulus within the time budget"
+
+def _fallback_lines(base, exponent, modulus, result):
+    """Final Result lines when Euler's theorem is not applied (gcd(a, n) ≠ 1 or φ(n) unknown)"""
+    return [
+        "═" * 55,
+        "FALLBACK: STANDARD MODULAR EXPONENTIATION",
+        "═" * 55,
+        "",
+        f"Using Python's built-in pow({abbreviate(base)}, {abbreviate(exponent)}, {abbreviate(modulus)})",
+        "",
+        f"<b>★ {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)} = {abbreviate(result)}</b>",
+        "",
+    ]
+
+def _summary_lines(base, exponent, modulus, phi_n, reduced_exp, result):
+    """Condensed Final Result lines when Euler's theorem applies"""
+    return [
+        "═" * 55,
+        "FINAL RESULT",
+        "═" * 55,
+        "",
+        f"gcd({abbreviate(base)}, {abbreviate(modulus)}) = 1, φ({abbreviate(modulus)}) = {abbreviate(phi_n)}",
+        f"Reduced exponent: {abbreviate(exponent)} mod {abbreviate(phi_n)} = {abbreviate(reduced_exp)}",
+        "",
+        f"<b>★ {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)} = {abbreviate(result)}</b>",
+        "",
+        "═" * 55,
+    ]
+
 def calculate_totient_detailed(n):
     """Calculate Euler's Totient φ(n) with detailed steps"""
     lines = []
     lines.append("═" * 55)
-    lines.append(f"CALCULATING EULER'S TOTIENT φ({n})")
+    lines.append(f"CALCULATING EULER'S TOTIENT φ({abbreviate(n)})")
     lines.append("═" * 55)
     lines.append("")
     lines.append("Formula: φ(n) = n × ∏(1 - 1/p) for each prime factor p")
@@ -27,79 +65,103 @@ def calculate_totient_detailed(n):
     
     result = n
     original_n = n
-    p = 2
     temp_n = n
     prime_factors = []
     
-    lines.append(f"Initial: result = {result}")
+    start = time.perf_counter()
+    factors, rest = factorize(n)
+    elapsed = time.perf_counter() - start
+    
+    if n > TRIAL_DIVISION_LIMIT:
+        lines.append("Factoring engine (trial division up to √n would not finish):")
+        lines.append(f"  1. Trial division by 2, 3, 5 and the 2·3·5 wheel up to {WHEEL_LIMIT}")
+        lines.append("  2. Miller–Rabin primality test on each remaining cofactor")
+        lines.append("  3. Pollard rho (Brent's variant) to split composite cofactors")
+        lines.append(f"  Time: {elapsed * 1000:.1f} ms (budget {FACTOR_TIME_BUDGET:g} s)")
+        lines.append("")
+    
+    lines.append(f"Initial: result = {abbreviate(result)}")
     lines.append("")
     
-    # Find prime factors
+    # Walk the prime factors in ascending order, as trial division would find them
     step = 1
-    while p * p <= temp_n:
-        if temp_n % p == 0:
+    for p, count in factors.items():
+        if p * p <= temp_n:
             prime_factors.append(p)
-            lines.append(f"Step {step}: Check if {p} divides {temp_n}")
-            lines.append(f"  {temp_n} ÷ {p} = {temp_n // p} (remainder {temp_n % p})")
-            lines.append(f"  ✓ {p} is a prime factor!")
+            lines.append(f"Step {step}: Check if {abbreviate(p)} divides {abbreviate(temp_n)}")
+            lines.append(f"  {abbreviate(temp_n)} ÷ {abbreviate(p)} = {abbreviate(temp_n // p)} (remainder 0)")
+            lines.append(f"  ✓ {abbreviate(p)} is a prime factor!")
             lines.append("")
             
             # Remove all occurrences of p
-            count = 0
-            while temp_n % p == 0:
-                temp_n //= p
-                count += 1
-            
-            lines.append(f"  Factor {p} appears {count} time(s)")
-            lines.append(f"  After removing: temp_n = {temp_n}")
-            lines.append("")
+            temp_n //= p ** count
             
-            # Update result
-            old_result = result
-            result -= result // p
-            lines.append(f"  Update φ: result = result - result/{p}")
-            lines.append(f"          = {old_result} - {old_result // p}")
-            lines.append(f"          = {result}")
+            lines.append(f"  Factor {abbreviate(p)} appears {count} time(s)")
+            lines.append(f"  After removing: temp_n = {abbreviate(temp_n)}")
             lines.append("")
-            lines.append("─" * 55)
+        else:
+            # Only the last factor can exceed √temp_n: it is the remaining value itself
+            prime_factors.append(temp_n)
+            lines.append(f"Step {step}: Remaining value {abbreviate(temp_n)} > 1")
+            lines.append(f"  ✓ {abbreviate(temp_n)} is a prime factor!")
             lines.append("")
-            step += 1
-        p += 1
-    
-    # If remaining temp_n > 1, it's a prime factor
-    if temp_n > 1:
-        prime_factors.append(temp_n)
-        lines.append(f"Step {step}: Remaining value {temp_n} > 1")
-        lines.append(f"  ✓ {temp_n} is a prime factor!")
-        lines.append("")
+            temp_n = 1
         
+        # Update result
         old_result = result
-        result -= result // temp_n
-        lines.append(f"  Update φ: result = result - result/{temp_n}")
-        lines.append(f"          = {old_result} - {old_result // temp_n}")
-        lines.append(f"          = {result}")
+        result -= result // p
+        lines.append(f"  Update φ: result = result - result/{abbreviate(p)}")
+        lines.append(f"          = {abbreviate(old_result)} - {abbreviate(old_result // p)}")
+        lines.append(f"          = {abbreviate(result)}")
         lines.append("")
         lines.append("─" * 55)
         lines.append("")
+        step += 1
+    
+    if rest != 1:
+        lines.append(f"⚠️ Could not factor {abbreviate(rest)} within {FACTOR_TIME_BUDGET:g} s,")
+        lines.append("so φ(n) is unknown.")
+        return None, '\n'.join(lines)
     
     lines.append("SUMMARY:")
-    lines.append(f"  Prime factors of {original_n}: {prime_factors}")
-    lines.append(f"  <b>φ({original_n}) = {result}</b>")
+    lines.append(f"  Prime factors of {abbreviate(original_n)}: [{', '.join(abbreviate(p) for p in prime_factors)}]")
+    lines.append(f"  <b>φ({abbreviate(original_n)}) = {abbreviate(result)}</b>")
     lines.append("")
     
     return result, '\n'.join(lines)
 
-def euler_theorem_detailed(base, exponent, modulus):
-    """Euler's Theorem solver with detailed steps"""
+def euler_theorem_detailed(base, exponent, modulus, verbosity='full', max_steps=DEFAULT_MAX_STEPS):
+    """Euler's Theorem solver with detailed steps
+    max_steps: square-and-multiply bits narrated in full at each end
+    """
+    if verbosity != 'full':
+        if get_gcd(base, modulus) != 1:
+            result = pow(base, exponent, modulus)
+            response = {"success": True, "result": result, "euler_applied": False}
+            lines = _fallback_lines(base, exponent, modulus, result)
+        elif (phi_n := totient(modulus)) is None:
+            result = pow(base, exponent, modulus)
+            response = {"success": True, "result": result, "euler_applied": False, "reason": FACTOR_TIMEOUT}
+            lines = _fallback_lines(base, exponent, modulus, result)
+        else:
+            reduced_exp = exponent % phi_n
+            result = pow(base, reduced_exp, modulus)
+            response = {"success": True, "result": result, "euler_applied": True,
+                        "phi_n": phi_n, "reduced_exponent": reduced_exp}
+            lines = _summary_lines(base, exponent, modulus, phi_n, reduced_exp, result)
+        if verbosity == 'summary':
+            response["sections"] = [final_result_section(lines, title="Answer")]
+        return response
+    
     all_sections = []
     
     # Section 1: Input Parameters
     input_content = f"""Given:
-  Base a = {base}
-  Exponent b = {exponent}
-  Modulus n = {modulus}
+  Base a = {abbreviate(base)}
+  Exponent b = {abbreviate(exponent)}
+  Modulus n = {abbreviate(modulus)}
 
-Goal: Compute {base}^{exponent} mod {modulus}
+Goal: Compute {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)}
 
 Euler's Theorem:
   If gcd(a, n) = 1, then a^φ(n) ≡ 1 (mod n)
@@ -126,19 +188,19 @@ This allows us to reduce large exponents:
     # Show GCD calculation steps
     a, b = modulus, base % modulus
     gcd_lines.append("Using Euclidean Algorithm:")
-    gcd_lines.append(f"  gcd({base}, {modulus}):")
+    gcd_lines.append(f"  gcd({abbreviate(base)}, {abbreviate(modulus)}):")
     
     temp_a, temp_b = modulus, base % modulus
     while temp_b:
-        gcd_lines.append(f"    {temp_a} = {temp_b} × {temp_a // temp_b} + {temp_a % temp_b}")
+        gcd_lines.append(f"    {abbreviate(temp_a)} = {abbreviate(temp_b)} × {abbreviate(temp_a // temp_b)} + {abbreviate(temp_a % temp_b)}")
         temp_a, temp_b = temp_b, temp_a % temp_b
     
     gcd_lines.append("")
-    gcd_lines.append(f"  gcd({base}, {modulus}) = {gcd_value}")
+    gcd_lines.append(f"  gcd({abbreviate(base)}, {abbreviate(modulus)}) = {abbreviate(gcd_value)}")
     gcd_lines.append("")
     
     if gcd_value != 1:
-        gcd_lines.append(f"⚠️ GCD = {gcd_value} ≠ 1")
+        gcd_lines.append(f"⚠️ GCD = {abbreviate(gcd_value)} ≠ 1")
         gcd_lines.append("")
         gcd_lines.append("Since a and n are NOT coprime,")
         gcd_lines.append("Euler's theorem (a^φ(n) ≡ 1) does NOT strictly apply!")
@@ -153,20 +215,7 @@ This allows us to reduce large exponents:
         # Fallback calculation
         result = pow(base, exponent, modulus)
         
-        fallback_lines = []
-        fallback_lines.append("═" * 55)
-        fallback_lines.append("FALLBACK: STANDARD MODULAR EXPONENTIATION")
-        fallback_lines.append("═" * 55)
-        fallback_lines.append("")
-        fallback_lines.append(f"Using Python's built-in pow({base}, {exponent}, {modulus})")
-        fallback_lines.append("")
-        fallback_lines.append(f"<b>★ {base}^{exponent} mod {modulus} = {result}</b>")
-        fallback_lines.append("")
-        
-        all_sections.append({
-            "section": "Final Result",
-            "subsections": [{"title": "Answer", "content": '\n'.join(fallback_lines)}]
-        })
+        all_sections.append(final_result_section(_fallback_lines(base, exponent, modulus, result), title="Answer"))
         
         return {
             "success": True,
@@ -189,9 +238,20 @@ This allows us to reduce large exponents:
     
     all_sections.append({
         "section": "Calculate φ(n)",
-        "subsections": [{"title": f"Euler's Totient of {modulus}", "content": phi_detail}]
+        "subsections": [{"title": f"Euler's Totient of {abbreviate(modulus)}", "content": phi_detail}]
     })
     
+    if phi_n is None:
+        result = pow(base, exponent, modulus)
+        all_sections.append(final_result_section(_fallback_lines(base, exponent, modulus, result), title="Answer"))
+        return {
+            "success": True,
+            "result": result,
+            "euler_applied": False,
+            "reason": FACTOR_TIMEOUT,
+            "sections": all_sections
+        }
+    
     # Section 4: Reduce Exponent
     reduce_lines = []
     reduce_lines.append("═" * 55)
@@ -204,21 +264,21 @@ This allows us to reduce large exponents:
     reduce_lines.append("")
     reduce_lines.append("─" * 55)
     reduce_lines.append("")
-    reduce_lines.append(f"Original exponent: b = {exponent}")
-    reduce_lines.append(f"φ({modulus}) = {phi_n}")
+    reduce_lines.append(f"Original exponent: b = {abbreviate(exponent)}")
+    reduce_lines.append(f"φ({abbreviate(modulus)}) = {abbreviate(phi_n)}")
     reduce_lines.append("")
-    reduce_lines.append(f"New exponent = {exponent} mod {phi_n}")
+    reduce_lines.append(f"New exponent = {abbreviate(exponent)} mod {abbreviate(phi_n)}")
     
     reduced_exp = exponent % phi_n
     
-    reduce_lines.append(f"             = {exponent} ÷ {phi_n} = {exponent // phi_n} remainder {reduced_exp}")
-    reduce_lines.append(f"             = {reduced_exp}")
+    reduce_lines.append(f"             = {abbreviate(exponent)} ÷ {abbreviate(phi_n)} = {abbreviate(exponent // phi_n)} remainder {abbreviate(reduced_exp)}")
+    reduce_lines.append(f"             = {abbreviate(reduced_exp)}")
     reduce_lines.append("")
-    reduce_lines.append(f"<b>Reduced problem: {base}^{reduced_exp} mod {modulus}</b>")
+    reduce_lines.append(f"<b>Reduced problem: {abbreviate(base)}^{abbreviate(reduced_exp)} mod {abbreviate(modulus)}</b>")
     reduce_lines.append("")
     reduce_lines.append("This is MUCH easier to compute!")
     if exponent > 1000:
-        reduce_lines.append(f"(Reduced from {exponent} to just {reduced_exp})")
+        reduce_lines.append(f"(Reduced from {abbreviate(exponent)} to just {abbreviate(reduced_exp)})")
     
     all_sections.append({
         "section": "Reduce Exponent",
@@ -231,7 +291,7 @@ This allows us to reduce large exponents:
     calc_lines.append("STEP 3: FINAL CALCULATION")
     calc_lines.append("═" * 55)
     calc_lines.append("")
-    calc_lines.append(f"Compute: {base}^{reduced_exp} mod {modulus}")
+    calc_lines.append(f"Compute: {abbreviate(base)}^{abbreviate(reduced_exp)} mod {abbreviate(modulus)}")
     calc_lines.append("")
     
     # Show step-by-step if small enough
@@ -242,21 +302,22 @@ This allows us to reduce large exponents:
         for i in range(reduced_exp):
             old_current = current
             current = (current * base) % modulus
-            calc_lines.append(f"  Step {i+1}: {old_current} × {base} mod {modulus} = {current}")
+            calc_lines.append(f"  Step {i+1}: {abbreviate(old_current)} × {abbreviate(base)} mod {abbreviate(modulus)} = {abbreviate(current)}")
         calc_lines.append("")
     else:
-        calc_lines.append(f"Using fast modular exponentiation:")
-        calc_lines.append(f"  pow({base}, {reduced_exp}, {modulus})")
+        calc_lines.append(f"Using fast modular exponentiation (square-and-multiply):")
         calc_lines.append("")
+        _, steps = load_module('mod-exp').square_and_multiply_lines(base, reduced_exp, modulus, max_steps)
+        calc_lines.extend(steps)
     
     result = pow(base, reduced_exp, modulus)
     
     calc_lines.append("─" * 55)
     calc_lines.append("")
-    calc_lines.append(f"<b>★ {base}^{exponent} mod {modulus} = {result}</b>")
+    calc_lines.append(f"<b>★ {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)} = {abbreviate(result)}</b>")
     calc_lines.append("")
     calc_lines.append("Verification:")
-    calc_lines.append(f"  {base}^{reduced_exp} mod {modulus} = {result} ✓")
+    calc_lines.append(f"  {abbreviate(base)}^{abbreviate(reduced_exp)} mod {abbreviate(modulus)} = {abbreviate(result)} ✓")
     calc_lines.append("")
     calc_lines.append("═" * 55)
     
@@ -1,8 +1,59 @@
 from http.server import BaseHTTPRequestHandler
 import json
 
-def extended_euclidean_detailed(a, m):
+from narration import final_result_section
+from numtheory import egcd
+
+def extended_euclidean(a, m):
+    """Extended Euclid on (m, a); returns (gcd, s, t) with m×s + a×t = gcd.
+    Like the narrated table, stops at once when a ≤ 0."""
+    if a <= 0:
+        return m, 1, 0
+    return egcd(m, a)
+
+def _summary_lines(a, m, gcd, s1, t1):
+    """Lines of the "Final Result" section"""
+    lines = [
+        "═" * 55,
+        "RESULT",
+        "═" * 55,
+        "",
+        f"GCD({a}, {m}) = {gcd}",
+        "",
+    ]
+    if gcd == 1:
+        inverse = t1
+        if inverse < 0:
+            lines.append(f"Coefficient t = {inverse} (negative)")
+            lines.append(f"Adjusting: {inverse} + {m} = {inverse + m}")
+            inverse = inverse + m
+        lines.append("")
+        lines.append(f"<b>★ Multiplicative Inverse of {a} mod {m} = {inverse}</b>")
+        lines.append("")
+        lines.append("Bézout Coefficients:")
+        lines.append(f"  s = {s1}, t = {t1 if t1 >= 0 else inverse}")
+        lines.append(f"  {a} × {inverse} + {m} × {s1} = {a * inverse + m * s1}")
+        lines.append("")
+        lines.append("Verification:")
+        lines.append(f"  {a} × {inverse} = {a * inverse}")
+        lines.append(f"  {a * inverse} mod {m} = {(a * inverse) % m} ✓")
+    else:
+        lines.append(f"Since GCD({a}, {m}) = {gcd} ≠ 1,")
+        lines.append(f"{a} and {m} are NOT coprime!")
+        lines.append("")
+        lines.append("<b>★ NO MULTIPLICATIVE INVERSE EXISTS</b>")
+    lines.append("═" * 55)
+    return lines
+
+def extended_euclidean_detailed(a, m, verbosity='full'):
     """Extended Euclidean Algorithm with Fast Guess Method"""
+    if verbosity != 'full':
+        gcd, s1, t1 = extended_euclidean(a, m)
+        result = {"success": True, "gcd": gcd, "inverse": (t1 % m) if gcd == 1 else None}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_summary_lines(a, m, gcd, s1, t1))]
+        return result
+    
     all_sections = []
     
     # Section 1: Input Parameters
@@ -152,42 +203,7 @@ Goal: Find GCD(a, m) and multiplicative inverse of a mod m
         })
     
     # Section 4: Result
-    result_lines = []
-    result_lines.append("═" * 55)
-    result_lines.append("RESULT")
-    result_lines.append("═" * 55)
-    result_lines.append("")
-    result_lines.append(f"GCD({a}, {m}) = {gcd}")
-    result_lines.append("")
-    
-    if gcd == 1:
-        inverse = t1
-        if inverse < 0:
-            result_lines.append(f"Coefficient t = {inverse} (negative)")
-            result_lines.append(f"Adjusting: {inverse} + {m} = {inverse + m}")
-            inverse = inverse + m
-        result_lines.append("")
-        result_lines.append(f"<b>★ Multiplicative Inverse of {a} mod {m} = {inverse}</b>")
-        result_lines.append("")
-        result_lines.append("Bézout Coefficients:")
-        result_lines.append(f"  s = {s1}, t = {t1 if t1 >= 0 else inverse}")
-        result_lines.append(f"  {a} × {inverse} + {m} × {s1} = {a * inverse + m * s1}")
-        result_lines.append("")
-        result_lines.append("Verification:")
-        result_lines.append(f"  {a} × {inverse} = {a * inverse}")
-        result_lines.append(f"  {a * inverse} mod {m} = {(a * inverse) % m} ✓")
-    else:
-        result_lines.append(f"Since GCD({a}, {m}) = {gcd} ≠ 1,")
-        result_lines.append(f"{a} and {m} are NOT coprime!")
-        result_lines.append("")
-        result_lines.append("<b>★ NO MULTIPLICATIVE INVERSE EXISTS</b>")
-    
-    result_lines.append("═" * 55)
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
-    })
+    all_sections.append(final_result_section(_summary_lines(a, m, gcd, s1, t1)))
     
     return {
         "success": True,
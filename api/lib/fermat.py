@@ -1,23 +1,49 @@
 from http.server import BaseHTTPRequestHandler
 import json
 
-def is_prime(n):
-    """Check if n is a prime number"""
-    if n <= 1: return False
-    if n <= 3: return True
-    if n % 2 == 0 or n % 3 == 0: return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
+from loader import load_module
+from narration import DEFAULT_MAX_STEPS, abbreviate, final_result_section
+from numtheory import MR_BASES, MR_DETERMINISTIC_LIMIT, is_prime
+
+# Above this, trial division up to √n is too slow to narrate; Miller–Rabin is shown instead
+TRIAL_DIVISION_LIMIT = 10 ** 12
+
+# Random Miller–Rabin bases for a request-supplied modulus above MR_DETERMINISTIC_LIMIT:
+# a composite passes with probability ≤ 4⁻¹⁶, and a 4096-bit prime takes ~4 s instead of ~10 s
+MR_ROUNDS = 16
+
+def miller_rabin_detailed(n):
+    """Miller–Rabin primality test with a short explanation (no per-round arithmetic)"""
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    prime = is_prime(n, MR_ROUNDS)
+    lines = [
+        f"n = {abbreviate(n)} is too large for trial division up to √n.",
+        "Using the Miller–Rabin test instead:",
+        "",
+        f"  n - 1 = 2^{s} × d,  d = {abbreviate(d)}",
+        "  For each base a: x = a^d mod n; n passes if x = 1, or x becomes n - 1",
+        f"  within {s} squarings.",
+        "",
+    ]
+    if n < MR_DETERMINISTIC_LIMIT:
+        lines.append(f"  Bases {', '.join(map(str, MR_BASES))}: exact for every n < 3.3 × 10²⁴")
+    else:
+        lines.append("  16 random bases: a composite passes with probability ≤ 4⁻¹⁶")
+    lines.append("")
+    if prime:
+        lines.append(f"<b>✓ {abbreviate(n)} IS PRIME</b>")
+    else:
+        lines.append(f"✗ A base proves {abbreviate(n)} composite, NOT PRIME")
+    return prime, '\n'.join(lines)
 
 def is_prime_detailed(n):
     """Check if n is prime with detailed steps"""
     lines = []
     lines.append("═" * 55)
-    lines.append(f"PRIMALITY TEST FOR {n}")
+    lines.append(f"PRIMALITY TEST FOR {abbreviate(n)}")
     lines.append("═" * 55)
     lines.append("")
     
@@ -29,21 +55,26 @@ def is_prime_detailed(n):
         lines.append(f"{n} ∈ {{2, 3}}, so PRIME")
         return True, '\n'.join(lines)
     
-    lines.append(f"Step 1: Check if {n} is divisible by 2")
+    if n > TRIAL_DIVISION_LIMIT and n % 2 and n % 3:
+        prime, mr_text = miller_rabin_detailed(n)
+        lines.append(mr_text)
+        return prime, '\n'.join(lines)
+    
+    lines.append(f"Step 1: Check if {abbreviate(n)} is divisible by 2")
     if n % 2 == 0:
-        lines.append(f"  {n} ÷ 2 = {n // 2} (remainder 0)")
-        lines.append(f"  ✗ {n} is divisible by 2, NOT PRIME")
+        lines.append(f"  {abbreviate(n)} ÷ 2 = {abbreviate(n // 2)} (remainder 0)")
+        lines.append(f"  ✗ {abbreviate(n)} is divisible by 2, NOT PRIME")
         return False, '\n'.join(lines)
-    lines.append(f"  {n} ÷ 2 = {n // 2} (remainder {n % 2})")
+    lines.append(f"  {abbreviate(n)} ÷ 2 = {abbreviate(n // 2)} (remainder {n % 2})")
     lines.append(f"  ✓ Not divisible by 2")
     lines.append("")
     
-    lines.append(f"Step 2: Check if {n} is divisible by 3")
+    lines.append(f"Step 2: Check if {abbreviate(n)} is divisible by 3")
     if n % 3 == 0:
-        lines.append(f"  {n} ÷ 3 = {n // 3} (remainder 0)")
-        lines.append(f"  ✗ {n} is divisible by 3, NOT PRIME")
+        lines.append(f"  {abbreviate(n)} ÷ 3 = {abbreviate(n // 3)} (remainder 0)")
+        lines.append(f"  ✗ {abbreviate(n)} is divisible by 3, NOT PRIME")
         return False, '\n'.join(lines)
-    lines.append(f"  {n} ÷ 3 = {n // 3} (remainder {n % 3})")
+    lines.append(f"  {abbreviate(n)} ÷ 3 = {abbreviate(n // 3)} (remainder {n % 3})")
     lines.append(f"  ✓ Not divisible by 3")
     lines.append("")
     
@@ -76,17 +107,80 @@ def is_prime_detailed(n):
     return True, '\n'.join(lines)
 
 
-def fermat_theorem_detailed(base, exponent, modulus):
-    """Fermat's Little Theorem solver with detailed steps"""
+def _fallback_lines(base, exponent, modulus, result):
+    """Final Result lines when the modulus is not prime"""
+    return [
+        "═" * 55,
+        "⚠️ FERMAT'S THEOREM CANNOT BE APPLIED",
+        "═" * 55,
+        "",
+        f"The modulus p = {abbreviate(modulus)} is NOT prime.",
+        "",
+        "Fermat's Little Theorem requires a PRIME modulus.",
+        "",
+        "Alternative: Use Euler's Theorem for non-prime moduli.",
+        "  Euler's: a^φ(n) ≡ 1 (mod n) when gcd(a,n) = 1",
+        "",
+        "─" * 55,
+        "",
+        "Falling back to standard modular exponentiation...",
+        "",
+        f"<b>★ {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)} = {abbreviate(result)}</b>",
+        "",
+        "(Computed using fast modular exponentiation)",
+    ]
+
+def _summary_lines(base, exponent, modulus, reduced_exp, result):
+    """Condensed Final Result lines when Fermat's theorem applies"""
+    lines = [
+        "═" * 55,
+        "FINAL RESULT",
+        "═" * 55,
+        "",
+    ]
+    if reduced_exp is None:
+        lines.append(f"{abbreviate(base)} ≡ 0 (mod {abbreviate(modulus)}), so every positive power is 0")
+    else:
+        lines.append(f"{abbreviate(modulus)} is prime, gcd({abbreviate(base)}, {abbreviate(modulus)}) = 1")
+        lines.append(f"Reduced exponent: {abbreviate(exponent)} mod {abbreviate(modulus - 1)} = {abbreviate(reduced_exp)}")
+    lines.append("")
+    lines.append(f"<b>★ {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)} = {abbreviate(result)}</b>")
+    lines.append("")
+    lines.append("═" * 55)
+    return lines
+
+def fermat_theorem_detailed(base, exponent, modulus, verbosity='full', max_steps=DEFAULT_MAX_STEPS):
+    """Fermat's Little Theorem solver with detailed steps
+    max_steps: square-and-multiply bits narrated in full at each end
+    """
+    if verbosity != 'full':
+        if not is_prime(modulus, MR_ROUNDS):
+            result = pow(base, exponent, modulus)
+            response = {"success": True, "result": result, "fermat_applied": False,
+                        "reason": "Modulus is not prime"}
+            lines, title = _fallback_lines(base, exponent, modulus, result), "Fallback Calculation"
+        elif base % modulus == 0:
+            response = {"success": True, "result": 0, "fermat_applied": True}
+            lines, title = _summary_lines(base, exponent, modulus, None, 0), "Answer"
+        else:
+            reduced_exp = exponent % (modulus - 1)
+            result = pow(base, reduced_exp, modulus)
+            response = {"success": True, "result": result, "fermat_applied": True,
+                        "fermat_power": modulus - 1, "reduced_exponent": reduced_exp}
+            lines, title = _summary_lines(base, exponent, modulus, reduced_exp, result), "Answer"
+        if verbosity == 'summary':
+            response["sections"] = [final_result_section(lines, title=title)]
+        return response
+    
     all_sections = []
     
     # Section 1: Input Parameters
     input_content = f"""Given:
-  Base a = {base}
-  Exponent E = {exponent}
-  Modulus p = {modulus}
+  Base a = {abbreviate(base)}
+  Exponent E = {abbreviate(exponent)}
+  Modulus p = {abbreviate(modulus)}
 
-Goal: Compute {base}^{exponent} mod {modulus}
+Goal: Compute {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)}
 
 Fermat's Little Theorem:
   If p is PRIME and gcd(a, p) = 1, then:
@@ -105,37 +199,14 @@ This allows us to reduce large exponents:
     
     all_sections.append({
         "section": "Step 1: Primality Check",
-        "subsections": [{"title": f"Is {modulus} prime?", "content": prime_detail}]
+        "subsections": [{"title": f"Is {abbreviate(modulus)} prime?", "content": prime_detail}]
     })
     
     if not is_p_prime:
         # Cannot use Fermat's theorem
-        error_lines = []
-        error_lines.append("═" * 55)
-        error_lines.append("⚠️ FERMAT'S THEOREM CANNOT BE APPLIED")
-        error_lines.append("═" * 55)
-        error_lines.append("")
-        error_lines.append(f"The modulus p = {modulus} is NOT prime.")
-        error_lines.append("")
-        error_lines.append("Fermat's Little Theorem requires a PRIME modulus.")
-        error_lines.append("")
-        error_lines.append("Alternative: Use Euler's Theorem for non-prime moduli.")
-        error_lines.append("  Euler's: a^φ(n) ≡ 1 (mod n) when gcd(a,n) = 1")
-        error_lines.append("")
-        error_lines.append("─" * 55)
-        error_lines.append("")
-        error_lines.append("Falling back to standard modular exponentiation...")
-        error_lines.append("")
-        
         result = pow(base, exponent, modulus)
-        error_lines.append(f"<b>★ {base}^{exponent} mod {modulus} = {result}</b>")
-        error_lines.append("")
-        error_lines.append("(Computed using fast modular exponentiation)")
-        
-        all_sections.append({
-            "section": "Final Result",
-            "subsections": [{"title": "Fallback Calculation", "content": '\n'.join(error_lines)}]
-        })
+        all_sections.append(final_result_section(
+            _fallback_lines(base, exponent, modulus, result), title="Fallback Calculation"))
         
         return {
             "success": True,
@@ -151,17 +222,17 @@ This allows us to reduce large exponents:
     div_lines.append("STEP 2: DIVISIBILITY CHECK")
     div_lines.append("═" * 55)
     div_lines.append("")
-    div_lines.append(f"Check if base a = {base} is divisible by p = {modulus}")
+    div_lines.append(f"Check if base a = {abbreviate(base)} is divisible by p = {abbreviate(modulus)}")
     div_lines.append("")
-    div_lines.append(f"  {base} mod {modulus} = {base % modulus}")
+    div_lines.append(f"  {abbreviate(base)} mod {abbreviate(modulus)} = {abbreviate(base % modulus)}")
     div_lines.append("")
     
     if base % modulus == 0:
-        div_lines.append(f"Since {base} is divisible by {modulus}:")
-        div_lines.append(f"  {base} ≡ 0 (mod {modulus})")
-        div_lines.append(f"  Therefore: {base}^{exponent} ≡ 0 (mod {modulus})")
+        div_lines.append(f"Since {abbreviate(base)} is divisible by {abbreviate(modulus)}:")
+        div_lines.append(f"  {abbreviate(base)} ≡ 0 (mod {abbreviate(modulus)})")
+        div_lines.append(f"  Therefore: {abbreviate(base)}^{abbreviate(exponent)} ≡ 0 (mod {abbreviate(modulus)})")
         div_lines.append("")
-        div_lines.append(f"<b>★ {base}^{exponent} mod {modulus} = 0</b>")
+        div_lines.append(f"<b>★ {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)} = 0</b>")
         
         all_sections.append({
             "section": "Step 2: Divisibility Check",
@@ -175,8 +246,8 @@ This allows us to reduce large exponents:
             "sections": all_sections
         }
     
-    div_lines.append(f"✓ {base} is NOT divisible by {modulus}")
-    div_lines.append(f"  gcd({base}, {modulus}) = 1")
+    div_lines.append(f"✓ {abbreviate(base)} is NOT divisible by {abbreviate(modulus)}")
+    div_lines.append(f"  gcd({abbreviate(base)}, {abbreviate(modulus)}) = 1")
     div_lines.append("")
     div_lines.append("Fermat's Little Theorem can be applied!")
     
@@ -193,8 +264,8 @@ This allows us to reduce large exponents:
     fermat_lines.append("")
     fermat_lines.append("Theorem Statement:")
     fermat_lines.append(f"  a^(p-1) ≡ 1 (mod p)")
-    fermat_lines.append(f"  {base}^({modulus}-1) ≡ 1 (mod {modulus})")
-    fermat_lines.append(f"  {base}^{modulus - 1} ≡ 1 (mod {modulus})")
+    fermat_lines.append(f"  {abbreviate(base)}^({abbreviate(modulus)}-1) ≡ 1 (mod {abbreviate(modulus)})")
+    fermat_lines.append(f"  {abbreviate(base)}^{abbreviate(modulus - 1)} ≡ 1 (mod {abbreviate(modulus)})")
     fermat_lines.append("")
     fermat_lines.append("─" * 55)
     fermat_lines.append("")
@@ -205,19 +276,19 @@ This allows us to reduce large exponents:
     fermat_power = modulus - 1
     reduced_exp = exponent % fermat_power
     
-    fermat_lines.append(f"  Original exponent: E = {exponent}")
-    fermat_lines.append(f"  Reduction modulus: p - 1 = {modulus} - 1 = {fermat_power}")
+    fermat_lines.append(f"  Original exponent: E = {abbreviate(exponent)}")
+    fermat_lines.append(f"  Reduction modulus: p - 1 = {abbreviate(modulus)} - 1 = {abbreviate(fermat_power)}")
     fermat_lines.append("")
     fermat_lines.append(f"  E_new = E mod (p-1)")
-    fermat_lines.append(f"        = {exponent} mod {fermat_power}")
-    fermat_lines.append(f"        = {exponent} ÷ {fermat_power} = {exponent // fermat_power} remainder {reduced_exp}")
-    fermat_lines.append(f"        = {reduced_exp}")
+    fermat_lines.append(f"        = {abbreviate(exponent)} mod {abbreviate(fermat_power)}")
+    fermat_lines.append(f"        = {abbreviate(exponent)} ÷ {abbreviate(fermat_power)} = {abbreviate(exponent // fermat_power)} remainder {abbreviate(reduced_exp)}")
+    fermat_lines.append(f"        = {abbreviate(reduced_exp)}")
     fermat_lines.append("")
-    fermat_lines.append(f"<b>Reduced problem: {base}^{reduced_exp} mod {modulus}</b>")
+    fermat_lines.append(f"<b>Reduced problem: {abbreviate(base)}^{abbreviate(reduced_exp)} mod {abbreviate(modulus)}</b>")
     fermat_lines.append("")
     
     if exponent > 100:
-        fermat_lines.append(f"(Reduced exponent from {exponent} to just {reduced_exp}!)")
+        fermat_lines.append(f"(Reduced exponent from {abbreviate(exponent)} to just {abbreviate(reduced_exp)}!)")
     
     all_sections.append({
         "section": "Step 3: Apply Fermat's Theorem",
@@ -230,7 +301,7 @@ This allows us to reduce large exponents:
     calc_lines.append("STEP 4: FINAL CALCULATION")
     calc_lines.append("═" * 55)
     calc_lines.append("")
-    calc_lines.append(f"Compute: {base}^{reduced_exp} mod {modulus}")
+    calc_lines.append(f"Compute: {abbreviate(base)}^{abbreviate(reduced_exp)} mod {abbreviate(modulus)}")
     calc_lines.append("")
     
     # Show step-by-step if small
@@ -241,24 +312,25 @@ This allows us to reduce large exponents:
         for i in range(reduced_exp):
             old = current
             current = (current * base) % modulus
-            calc_lines.append(f"  {base}^{i+1} mod {modulus}: {old} × {base} = {old * base} mod {modulus} = {current}")
+            calc_lines.append(f"  {abbreviate(base)}^{i+1} mod {abbreviate(modulus)}: {abbreviate(old)} × {abbreviate(base)} = {abbreviate(old * base)} mod {abbreviate(modulus)} = {abbreviate(current)}")
         calc_lines.append("")
     elif reduced_exp == 0:
-        calc_lines.append(f"  {base}^0 = 1 (any number to power 0 is 1)")
+        calc_lines.append(f"  {abbreviate(base)}^0 = 1 (any number to power 0 is 1)")
         calc_lines.append("")
     else:
-        calc_lines.append(f"Using fast modular exponentiation:")
-        calc_lines.append(f"  pow({base}, {reduced_exp}, {modulus})")
+        calc_lines.append(f"Using fast modular exponentiation (square-and-multiply):")
         calc_lines.append("")
+        _, steps = load_module('mod-exp').square_and_multiply_lines(base, reduced_exp, modulus, max_steps)
+        calc_lines.extend(steps)
     
     result = pow(base, reduced_exp, modulus)
     
     calc_lines.append("─" * 55)
     calc_lines.append("")
-    calc_lines.append(f"<b>★ {base}^{exponent} mod {modulus} = {result}</b>")
+    calc_lines.append(f"<b>★ {abbreviate(base)}^{abbreviate(exponent)} mod {abbreviate(modulus)} = {abbreviate(result)}</b>")
     calc_lines.append("")
     calc_lines.append("Verification:")
-    calc_lines.append(f"  {base}^{reduced_exp} mod {modulus} = {result} ✓")
+    calc_lines.append(f"  {abbreviate(base)}^{abbreviate(reduced_exp)} mod {abbreviate(modulus)} = {abbreviate(result)} ✓")
     calc_lines.append("")
     calc_lines.append("═" * 55)
     
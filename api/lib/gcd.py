@@ -1,8 +1,43 @@
 from http.server import BaseHTTPRequestHandler
 import json
 
-def gcd_detailed(a, b):
+from narration import final_result_section
+
+def euclid(a, b):
+    """GCD by the Euclidean algorithm; returns (gcd, number of division steps)"""
+    if a < b:
+        a, b = b, a
+    steps = 0
+    while b != 0:
+        a, b = b, a % b
+        steps += 1
+    return a, steps
+
+def _summary_lines(a, b, gcd, step_count):
+    """Lines of the "Final Result" section"""
+    return [
+        "═" * 55,
+        "FINAL RESULT",
+        "═" * 55,
+        "",
+        f"<b>★ GCD({a}, {b}) = {gcd}</b>",
+        "",
+        f"Coprime: {'Yes ✓' if gcd == 1 else 'No ✗'}",
+        "",
+        f"Number of steps: {step_count}",
+        "",
+        "═" * 55,
+    ]
+
+def gcd_detailed(a, b, verbosity='full'):
     """Euclidean Algorithm for GCD with detailed steps"""
+    if verbosity != 'full':
+        gcd, step_count = euclid(a, b)
+        result = {"success": True, "gcd": gcd, "coprime": gcd == 1}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_summary_lines(a, b, gcd, step_count), title="Answer")]
+        return result
+    
     all_sections = []
     
     original_a, original_b = a, b
@@ -135,23 +170,7 @@ Euclidean Algorithm Principle:
     })
     
     # Section 5: Final Result
-    result_lines = []
-    result_lines.append("═" * 55)
-    result_lines.append("FINAL RESULT")
-    result_lines.append("═" * 55)
-    result_lines.append("")
-    result_lines.append(f"<b>★ GCD({original_a}, {original_b}) = {gcd}</b>")
-    result_lines.append("")
-    result_lines.append(f"Coprime: {'Yes ✓' if gcd == 1 else 'No ✗'}")
-    result_lines.append("")
-    result_lines.append(f"Number of steps: {len(steps_data)}")
-    result_lines.append("")
-    result_lines.append("═" * 55)
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Answer", "content": '\n'.join(result_lines)}]
-    })
+    all_sections.append(final_result_section(_summary_lines(original_a, original_b, gcd, len(steps_data)), title="Answer"))
     
     return {
         "success": True,
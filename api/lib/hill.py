@@ -1,5 +1,36 @@
 from http.server import BaseHTTPRequestHandler
+import heapq
 import json
+import math
+import operator
+
+try:
+    import numpy as np
+except ImportError:  # hill_transform falls back to pure Python
+    np = None
+
+import english
+from narration import DEFAULT_MAX_STEPS, final_result_section, step_window
+from numtheory import modinv, eliminate_mod_p, crt_basis, matrix_det_mod, matrix_inverse_mod, solve_mod_p
+from parallel import pool_map, split, worker_count
+
+# 26 = 2 × 13: K is eliminated over GF(2) and GF(13) and recombined by CRT
+PRIME_FACTORS = (2, 13)
+# Largest key whose inverse is narrated minor by minor (cofactor expansion)
+COFACTOR_NARRATION_LIMIT = 4
+# Below this many numbers the pure-Python product beats NumPy's call overhead
+NUMPY_MIN_LENGTH = 64
+KEY_CACHE_SIZE = 128
+
+# Largest key size the known-plaintext solver accepts
+MAX_ATTACK_SIZE = 10
+# Ciphertext blocks scored per candidate in the 2×2 ciphertext-only search
+SEARCH_BLOCKS = 60
+# Candidate first rows (u, v) of K⁻¹: 26² of them, so 26⁴ decryption matrices in all
+ROW_CANDIDATES = 26 * 26
+
+_schedule_cache = {}  # key matrix as tuples -> K⁻¹ or None, oldest first
+_UNITS = [math.gcd(x, 26) == 1 for x in range(26)]
 
 def char_to_num(ch):
     """Convert character to number (A=0, B=1, ... Z=25)"""
@@ -9,6 +40,10 @@ def num_to_char(num):
     """Convert number to character"""
     return chr((num % 26) + ord('A'))
 
+def nums_to_text(nums):
+    """Letters for numbers already reduced mod 26 (the output of hill_transform)"""
+    return bytes(n + 65 for n in nums).decode('ascii')
+
 def matrix_multiply(A, B, mod=26):
     """Multiply matrix A with vector B, return result mod 26"""
     n = len(A)
@@ -21,34 +56,11 @@ def matrix_multiply(A, B, mod=26):
     return result
 
 def determinant(matrix, mod=26):
-    """Calculate determinant of a matrix"""
-    n = len(matrix)
-    if n == 2:
-        return (matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]) % mod
-    
-    det = 0
-    for j in range(n):
-        minor = []
-        for i in range(1, n):
-            row = []
-            for k in range(n):
-                if k != j:
-                    row.append(matrix[i][k])
-            minor.append(row)
-        cofactor = ((-1) ** j) * matrix[0][j] * determinant(minor, mod)
-        det += cofactor
-    return det % mod
-
-def mod_inverse(a, m):
-    """Find modular inverse of a mod m"""
-    a = a % m
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None
+    """Calculate determinant of a matrix mod 26 (elimination mod 2 and mod 13, O(n³))"""
+    return matrix_det_mod(matrix, mod)
 
 def adjugate(matrix):
-    """Calculate adjugate (adjoint) matrix"""
+    """Calculate adjugate (adjoint) matrix, for the cofactor narration of small keys"""
     n = len(matrix)
     adj = [[0] * n for _ in range(n)]
     
@@ -95,10 +107,200 @@ def format_matrix(matrix, indent=""):
         lines.append(indent + "[ " + "  ".join(f"{x:3}" for x in row) + " ]")
     return '\n'.join(lines)
 
-def hill_cipher_detailed(plaintext, key_matrix, m, vector_mode='column'):
+def inverse_key_matrix(key_matrix):
+    """K⁻¹ mod 26 by Gauss–Jordan elimination mod 2 and mod 13, or None if K is not invertible mod 26"""
+    return matrix_inverse_mod(key_matrix, 26)
+
+def key_schedule(key_matrix):
+    """(K, K⁻¹ or None), computed once per key and reusable across messages and requests"""
+    key = tuple(map(tuple, key_matrix))
+    if key not in _schedule_cache:
+        if len(_schedule_cache) >= KEY_CACHE_SIZE:
+            del _schedule_cache[next(iter(_schedule_cache))]
+        _schedule_cache[key] = inverse_key_matrix(key_matrix)
+    return key_matrix, _schedule_cache[key]
+
+def hill_transform(nums, key_matrix, m, vector_mode='column'):
+    """Multiply each block of m numbers by the key (K × P or P × K) mod 26, no narration.
+    With NumPy the blocks form one (blocks × m) array multiplied by Kᵀ (or K in row mode)."""
+    if vector_mode == 'row':
+        key_matrix = list(zip(*key_matrix))
+    key_rows = [[k % 26 for k in row] for row in key_matrix]
+    usable = len(nums) - len(nums) % m
+    if np is not None and usable >= NUMPY_MIN_LENGTH:
+        blocks = np.array(nums[:usable], dtype=np.int64).reshape(-1, m) % 26
+        return (blocks @ np.array(key_rows, dtype=np.int64).T % 26).ravel().tolist()
+    out = []
+    for start in range(0, usable, m):
+        block = nums[start:start + m]
+        out.extend(sum(map(operator.mul, row, block)) % 26 for row in key_rows)
+    return out
+
+def _cofactor_inverse_lines(key_matrix, m, det_inv):
+    """(K⁻¹, lines) narrating K⁻¹ = det⁻¹ × adj(K) minor by minor"""
+    adj = adjugate(key_matrix)
+    K_inv = matrix_mod([[det_inv * adj[i][j] for j in range(m)] for i in range(m)])
+    
+    kinv_lines = []
+    kinv_lines.append("Formula: [K⁻¹]ᵢⱼ = det⁻¹ × (-1)^(i+j) × Dⱼᵢ mod 26")
+    kinv_lines.append("")
+    kinv_lines.append("Where Dⱼᵢ is the minor (subdeterminant) formed by")
+    kinv_lines.append("deleting row j and column i from K.")
+    kinv_lines.append("")
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("STEP 1: Calculate Cofactor Matrix C")
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("")
+    kinv_lines.append("Cᵢⱼ = (-1)^(i+j) × Mᵢⱼ")
+    kinv_lines.append("where Mᵢⱼ is the minor (delete row i, col j)")
+    kinv_lines.append("")
+    
+    # Show cofactor calculation for each element
+    cofactor_matrix = [[0] * m for _ in range(m)]
+    for i in range(m):
+        for j in range(m):
+            # Get minor
+            minor = []
+            for mi in range(m):
+                if mi == i:
+                    continue
+                row = []
+                for mj in range(m):
+                    if mj != j:
+                        row.append(key_matrix[mi][mj])
+                minor.append(row)
+            
+            kinv_lines.append(f"─ M[{i+1},{j+1}] (delete row {i+1}, col {j+1}) ─")
+            kinv_lines.append("")
+            # Display the minor matrix
+            for row in minor:
+                kinv_lines.append("  [ " + "  ".join(f"{x:3}" for x in row) + " ]")
+            kinv_lines.append("")
+            
+            # Calculate minor determinant
+            if len(minor) == 1:
+                minor_det = minor[0][0]
+                kinv_lines.append(f"  det(M[{i+1},{j+1}]) = {minor_det}")
+            elif len(minor) == 2:
+                a, b = minor[0][0], minor[0][1]
+                c, d = minor[1][0], minor[1][1]
+                minor_det = a * d - b * c
+                kinv_lines.append(f"  det(M[{i+1},{j+1}]) = ({a}×{d}) - ({b}×{c})")
+                kinv_lines.append(f"                = {a*d} - {b*c} = {minor_det}")
+            else:
+                minor_det = determinant(minor)
+                kinv_lines.append(f"  det(M[{i+1},{j+1}]) = {minor_det}")
+            
+            sign = ((-1) ** (i + j))
+            cofactor = sign * minor_det
+            cofactor_matrix[i][j] = cofactor
+            
+            sign_str = "+" if sign == 1 else "-"
+            kinv_lines.append("")
+            kinv_lines.append(f"  C[{i+1},{j+1}] = (-1)^({i+1}+{j+1}) × det(M[{i+1},{j+1}])")
+            kinv_lines.append(f"        = ({sign_str}1) × {minor_det} = {cofactor}")
+            kinv_lines.append("")
+    
+    kinv_lines.append("")
+    kinv_lines.append("Cofactor Matrix C:")
+    kinv_lines.append(format_matrix(cofactor_matrix, "  "))
+    kinv_lines.append("")
+    
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("STEP 2: Adjugate = Transpose of Cofactor Matrix")
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("")
+    kinv_lines.append("adj(K) = Cᵀ (transpose of cofactor matrix)")
+    kinv_lines.append("")
+    kinv_lines.append("Adjugate Matrix adj(K):")
+    kinv_lines.append(format_matrix(adj, "  "))
+    kinv_lines.append("")
+    
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("STEP 3: Multiply by det⁻¹ and apply mod 26")
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("")
+    kinv_lines.append(f"K⁻¹ = det⁻¹ × adj(K) mod 26")
+    kinv_lines.append(f"K⁻¹ = {det_inv} × adj(K) mod 26")
+    kinv_lines.append("")
+    
+    for i in range(m):
+        for j in range(m):
+            raw_val = det_inv * adj[i][j]
+            mod_val = raw_val % 26
+            if mod_val < 0:
+                mod_val += 26
+            kinv_lines.append(f"K⁻¹[{i+1},{j+1}] = {det_inv} × {adj[i][j]} = {raw_val} mod 26 = {K_inv[i][j]}")
+    
+    kinv_lines.append("")
+    kinv_lines.append("Inverse Key Matrix K⁻¹:")
+    kinv_lines.append(format_matrix(K_inv, "  "))
+    
+    return K_inv, kinv_lines
+
+def _elimination_inverse_lines(key_matrix, eliminations):
+    """(K⁻¹, lines) narrating K⁻¹ mod 2 and mod 13 by Gauss–Jordan, recombined by CRT"""
+    (_, inv_2), (_, inv_13) = eliminations
+    e_2, e_13 = crt_basis(PRIME_FACTORS)
+    K_inv = inverse_key_matrix(key_matrix)
+    
+    kinv_lines = []
+    kinv_lines.append("Z/26 is not a field, but 26 = 2 × 13 and Z/2, Z/13 are.")
+    kinv_lines.append("Gauss–Jordan elimination on [K | I] over each field gives [I | K⁻¹]")
+    kinv_lines.append("in O(n³) steps (cofactor expansion would need O(n!)).")
+    kinv_lines.append("")
+    for p, inv in zip(PRIME_FACTORS, (inv_2, inv_13)):
+        kinv_lines.append("─" * 50)
+        kinv_lines.append(f"K⁻¹ mod {p}:")
+        kinv_lines.append("─" * 50)
+        kinv_lines.append(format_matrix(inv, "  "))
+        kinv_lines.append("")
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("Recombine entrywise by CRT")
+    kinv_lines.append("─" * 50)
+    kinv_lines.append("")
+    kinv_lines.append(f"x ≡ a (mod 2), x ≡ b (mod 13)  ⇒  x = ({e_2}×a + {e_13}×b) mod 26")
+    kinv_lines.append("")
+    kinv_lines.append("Inverse Key Matrix K⁻¹:")
+    kinv_lines.append(format_matrix(K_inv, "  "))
+    
+    return K_inv, kinv_lines
+
+def _summary_lines(plaintext, ciphertext, decrypted_text):
+    """Lines of the "Final Result" section (decrypted_text is None when K is singular)"""
+    lines = [
+        "HILL CIPHER COMPLETE",
+        "",
+        f"Plaintext:   {plaintext}",
+        f"Ciphertext:  {ciphertext}",
+    ]
+    if decrypted_text is not None:
+        lines.append(f"Decrypted:   {decrypted_text}")
+        lines.append("")
+        if decrypted_text == plaintext:
+            lines.append("✓ Verification: Decrypted text matches original!")
+        else:
+            lines.append("✗ Error: Texts don't match!")
+    return lines
+
+def hill_cipher_detailed(plaintext, key_matrix, m, vector_mode='column', verbosity='full', schedule=None):
     """Hill Cipher with detailed steps
     vector_mode: 'column' for K × P (exam format), 'row' for P × K
+    schedule: key_schedule(key_matrix), when already computed (used by non-full verbosity)
     """
+    if verbosity != 'full':
+        _, K_inv = schedule or key_schedule(key_matrix)
+        plaintext_nums = [char_to_num(c) for c in plaintext]
+        cipher_nums = hill_transform(plaintext_nums, key_matrix, m, vector_mode)
+        ciphertext = nums_to_text(cipher_nums)
+        decrypted_text = None
+        if K_inv is not None:
+            decrypted_text = nums_to_text(hill_transform(cipher_nums, K_inv, m, vector_mode))
+        result = {"success": True, "plaintext": plaintext, "ciphertext": ciphertext, "decrypted": decrypted_text}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_summary_lines(plaintext, ciphertext, decrypted_text))]
+        return result
+    
     all_sections = []
     
     # Section 1: Alphabet Mapping
@@ -239,6 +441,13 @@ S=18  T=19  U=20  V=21  W=22  X=23  Y=24  Z=25"""
     if m == 2:
         det_lines.append(f"det(K) = ({key_matrix[0][0]}×{key_matrix[1][1]}) - ({key_matrix[0][1]}×{key_matrix[1][0]})")
         det_lines.append(f"det(K) = {key_matrix[0][0]*key_matrix[1][1]} - {key_matrix[0][1]*key_matrix[1][0]}")
+    eliminations = None
+    if m > COFACTOR_NARRATION_LIMIT:
+        eliminations = [eliminate_mod_p(key_matrix, p) for p in PRIME_FACTORS]
+        det_lines.append("Gaussian elimination mod 2 and mod 13 (product of pivots, negated per row swap):")
+        for p, (det_p, _) in zip(PRIME_FACTORS, eliminations):
+            det_lines.append(f"  det(K) mod {p} = {det_p}")
+        det_lines.append("Combined by CRT:")
     det_lines.append(f"det(K) mod 26 = {det}")
     
     all_sections.append({
@@ -247,7 +456,7 @@ S=18  T=19  U=20  V=21  W=22  X=23  Y=24  Z=25"""
     })
     
     # Section 7: Modular Inverse of Determinant
-    det_inv = mod_inverse(det, 26)
+    det_inv = modinv(det, 26)
     inv_lines = []
     inv_lines.append(f"Finding modular inverse of {det} mod 26:")
     inv_lines.append(f"We need d such that: {det} × d ≡ 1 (mod 26)")
@@ -267,107 +476,16 @@ S=18  T=19  U=20  V=21  W=22  X=23  Y=24  Z=25"""
     
     # Section 8: Inverse Key Matrix (if possible)
     if det_inv:
-        adj = adjugate(key_matrix)
-        K_inv = matrix_mod([[det_inv * adj[i][j] for j in range(m)] for i in range(m)])
-        
-        kinv_lines = []
-        kinv_lines.append("Formula: [K⁻¹]ᵢⱼ = det⁻¹ × (-1)^(i+j) × Dⱼᵢ mod 26")
-        kinv_lines.append("")
-        kinv_lines.append("Where Dⱼᵢ is the minor (subdeterminant) formed by")
-        kinv_lines.append("deleting row j and column i from K.")
-        kinv_lines.append("")
-        kinv_lines.append("─" * 50)
-        kinv_lines.append("STEP 1: Calculate Cofactor Matrix C")
-        kinv_lines.append("─" * 50)
-        kinv_lines.append("")
-        kinv_lines.append("Cᵢⱼ = (-1)^(i+j) × Mᵢⱼ")
-        kinv_lines.append("where Mᵢⱼ is the minor (delete row i, col j)")
-        kinv_lines.append("")
-        
-        # Show cofactor calculation for each element
-        cofactor_matrix = [[0] * m for _ in range(m)]
-        for i in range(m):
-            for j in range(m):
-                # Get minor
-                minor = []
-                for mi in range(m):
-                    if mi == i:
-                        continue
-                    row = []
-                    for mj in range(m):
-                        if mj != j:
-                            row.append(key_matrix[mi][mj])
-                    minor.append(row)
-                
-                kinv_lines.append(f"─ M[{i+1},{j+1}] (delete row {i+1}, col {j+1}) ─")
-                kinv_lines.append("")
-                # Display the minor matrix
-                for row in minor:
-                    kinv_lines.append("  [ " + "  ".join(f"{x:3}" for x in row) + " ]")
-                kinv_lines.append("")
-                
-                # Calculate minor determinant
-                if len(minor) == 1:
-                    minor_det = minor[0][0]
-                    kinv_lines.append(f"  det(M[{i+1},{j+1}]) = {minor_det}")
-                elif len(minor) == 2:
-                    a, b = minor[0][0], minor[0][1]
-                    c, d = minor[1][0], minor[1][1]
-                    minor_det = a * d - b * c
-                    kinv_lines.append(f"  det(M[{i+1},{j+1}]) = ({a}×{d}) - ({b}×{c})")
-                    kinv_lines.append(f"                = {a*d} - {b*c} = {minor_det}")
-                else:
-                    minor_det = determinant(minor)
-                    kinv_lines.append(f"  det(M[{i+1},{j+1}]) = {minor_det}")
-                
-                sign = ((-1) ** (i + j))
-                cofactor = sign * minor_det
-                cofactor_matrix[i][j] = cofactor
-                
-                sign_str = "+" if sign == 1 else "-"
-                kinv_lines.append("")
-                kinv_lines.append(f"  C[{i+1},{j+1}] = (-1)^({i+1}+{j+1}) × det(M[{i+1},{j+1}])")
-                kinv_lines.append(f"        = ({sign_str}1) × {minor_det} = {cofactor}")
-                kinv_lines.append("")
-        
-        kinv_lines.append("")
-        kinv_lines.append("Cofactor Matrix C:")
-        kinv_lines.append(format_matrix(cofactor_matrix, "  "))
-        kinv_lines.append("")
-        
-        kinv_lines.append("─" * 50)
-        kinv_lines.append("STEP 2: Adjugate = Transpose of Cofactor Matrix")
-        kinv_lines.append("─" * 50)
-        kinv_lines.append("")
-        kinv_lines.append("adj(K) = Cᵀ (transpose of cofactor matrix)")
-        kinv_lines.append("")
-        kinv_lines.append("Adjugate Matrix adj(K):")
-        kinv_lines.append(format_matrix(adj, "  "))
-        kinv_lines.append("")
-        
-        kinv_lines.append("─" * 50)
-        kinv_lines.append("STEP 3: Multiply by det⁻¹ and apply mod 26")
-        kinv_lines.append("─" * 50)
-        kinv_lines.append("")
-        kinv_lines.append(f"K⁻¹ = det⁻¹ × adj(K) mod 26")
-        kinv_lines.append(f"K⁻¹ = {det_inv} × adj(K) mod 26")
-        kinv_lines.append("")
-        
-        for i in range(m):
-            for j in range(m):
-                raw_val = det_inv * adj[i][j]
-                mod_val = raw_val % 26
-                if mod_val < 0:
-                    mod_val += 26
-                kinv_lines.append(f"K⁻¹[{i+1},{j+1}] = {det_inv} × {adj[i][j]} = {raw_val} mod 26 = {K_inv[i][j]}")
-        
-        kinv_lines.append("")
-        kinv_lines.append("Inverse Key Matrix K⁻¹:")
-        kinv_lines.append(format_matrix(K_inv, "  "))
+        if m <= COFACTOR_NARRATION_LIMIT:
+            K_inv, kinv_lines = _cofactor_inverse_lines(key_matrix, m, det_inv)
+            kinv_title = "K⁻¹ = det⁻¹ × adj(K) mod 26"
+        else:
+            K_inv, kinv_lines = _elimination_inverse_lines(key_matrix, eliminations)
+            kinv_title = "K⁻¹ by elimination mod 2 and mod 13, then CRT"
         
         all_sections.append({
             "section": "Calculate Inverse Key Matrix",
-            "subsections": [{"title": "K⁻¹ = det⁻¹ × adj(K) mod 26", "content": '\n'.join(kinv_lines)}]
+            "subsections": [{"title": kinv_title, "content": '\n'.join(kinv_lines)}]
         })
         
         # Section 9: Decryption
@@ -425,29 +543,326 @@ S=18  T=19  U=20  V=21  W=22  X=23  Y=24  Z=25"""
         K_inv = None
     
     # Section 10: Final Result
-    result_lines = []
-    result_lines.append("HILL CIPHER COMPLETE")
-    result_lines.append("")
-    result_lines.append(f"Plaintext:   {plaintext}")
-    result_lines.append(f"Ciphertext:  {ciphertext}")
-    if det_inv:
-        result_lines.append(f"Decrypted:   {decrypted_text}")
-        result_lines.append("")
-        if decrypted_text == plaintext:
-            result_lines.append("✓ Verification: Decrypted text matches original!")
+    all_sections.append(final_result_section(
+        _summary_lines(plaintext, ciphertext, decrypted_text if det_inv else None)))
+    
+    return {
+        "success": True,
+        "plaintext": plaintext,
+        "ciphertext": ciphertext,
+        "decrypted": decrypted_text if det_inv else None,
+        "sections": all_sections
+    }
+
+def recover_key(plain_nums, cipher_nums, m, vector_mode='column'):
+    """Known-plaintext attack: solve the block equations for K mod 2 and mod 13 and recombine.
+    Returns (K, {prime: indices of the blocks used}), or None when the blocks do not determine K."""
+    usable = min(len(plain_nums), len(cipher_nums)) // m * m
+    P = [plain_nums[i:i + m] for i in range(0, usable, m)]
+    C = [cipher_nums[i:i + m] for i in range(0, usable, m)]
+    if len(P) < m:
+        return None
+    parts = [solve_mod_p(P, C, p) for p in PRIME_FACTORS]
+    if any(part is None for part in parts):
+        return None
+    return _key_from_solutions(parts, m, vector_mode), {p: part[1] for p, part in zip(PRIME_FACTORS, parts)}
+
+def _key_from_solutions(parts, m, vector_mode):
+    """K from the solutions X mod 2 and mod 13 of the stacked blocks (X = K in row mode, Kᵀ in column mode)"""
+    basis = crt_basis(PRIME_FACTORS)
+    X = [[sum(e * part[0][i][j] for e, part in zip(basis, parts)) % 26 for j in range(m)] for i in range(m)]
+    return X if vector_mode == 'row' else [list(col) for col in zip(*X)]
+
+def _row_streams(c1, c2):
+    """Letters (u×c₁ + v×c₂) mod 26 over the blocks, for every candidate row (u, v) = divmod(r, 26)"""
+    return [[(u * a + v * b) % 26 for a, b in zip(c1, c2)] for u in range(26) for v in range(26)]
+
+def _search_rows(task):
+    """Top (score, r1, r2) decryption rows with r1 in [start, stop), against all 676 second rows.
+    With the first row fixed, every plaintext bigram has one free letter, so the score of each
+    second row is a sum of per-block weights (one gather per block, vectorized with NumPy)."""
+    start, stop, c1, c2, top = task
+    table = english.ngram_table(2)
+    streams = _row_streams(c1, c2)
+    best = []
+    if np is not None:
+        T = np.array(table).reshape(26, 26)
+        S = np.array(streams)
+        U, V = np.divmod(np.arange(ROW_CANDIDATES), 26)
+        units = np.array(_UNITS)
+        cols = np.arange(len(c1))[None, :]
+        for r1 in range(start, stop):
+            x1 = S[r1]
+            W = T[x1].copy()
+            W[:-1] += T[:, x1[1:]].T
+            scores = W[cols, S].sum(axis=1)
+            u1, v1 = divmod(r1, 26)
+            scores[~units[(u1 * V - v1 * U) % 26]] = -np.inf
+            for r2 in np.argpartition(scores, -top)[-top:]:
+                if scores[r2] > -np.inf:
+                    item = (float(scores[r2]), r1, int(r2))
+                    if len(best) < top:
+                        heapq.heappush(best, item)
+                    else:
+                        heapq.heappushpop(best, item)
+        return best
+    for r1 in range(start, stop):
+        x1 = streams[r1]
+        weights = [[table[a * 26 + y] + (table[y * 26 + b] if b is not None else 0.0) for y in range(26)]
+                   for a, b in zip(x1, x1[1:] + [None])]
+        u1, v1 = divmod(r1, 26)
+        for r2, x2 in enumerate(streams):
+            u2, v2 = divmod(r2, 26)
+            if not _UNITS[(u1 * v2 - v1 * u2) % 26]:
+                continue
+            item = (sum(map(list.__getitem__, weights, x2)), r1, r2)
+            if len(best) < top:
+                heapq.heappush(best, item)
+            else:
+                heapq.heappushpop(best, item)
+    return best
+
+def search_2x2(cipher_nums, vector_mode='column', top=5):
+    """Ciphertext-only attack on a 2×2 key: bigram-score all 26⁴ decryption matrices across
+    a process pool; returns the `top` candidates, best first"""
+    usable = min(len(cipher_nums) // 2, SEARCH_BLOCKS) * 2
+    c1, c2 = cipher_nums[0:usable:2], cipher_nums[1:usable:2]
+    tasks = [(start, stop, c1, c2, top) for start, stop in split(ROW_CANDIDATES, worker_count() * 4)]
+    found = heapq.nlargest(top, (item for chunk in pool_map(_search_rows, tasks) for item in chunk))
+    candidates = []
+    for _, r1, r2 in found:
+        rows = [list(divmod(r1, 26)), list(divmod(r2, 26))]
+        K_inv = rows if vector_mode == 'column' else [list(col) for col in zip(*rows)]
+        plain = hill_transform(cipher_nums, K_inv, 2, vector_mode)
+        candidates.append({
+            "key": inverse_key_matrix(K_inv),
+            "inverse": K_inv,
+            "plaintext": nums_to_text(plain),
+            "score": round(english.score(plain, 2), 2),
+        })
+    candidates.sort(key=lambda c: -c["score"])
+    return candidates
+
+def _block_lines(P, C, max_steps):
+    """One line per plaintext/ciphertext block pair, the middle ones elided for long texts"""
+    lines = []
+    skipped = step_window(len(P), max_steps)
+    for i, (p_block, c_block) in enumerate(zip(P, C)):
+        if skipped and i in skipped:
+            if i == skipped.start:
+                lines.append(f"  ⋯ Blocks {skipped.start + 1}–{skipped.stop}: {len(skipped)} pairs not shown ⋯")
+            continue
+        lines.append(f"  Block {i + 1}: P = [{', '.join(map(str, p_block))}]  →  C = [{', '.join(map(str, c_block))}]")
+    return lines
+
+def _attack_summary_lines(mode, key, plaintext=None, ciphertext=None):
+    """Lines of the "Final Result" section of either attack"""
+    lines = [
+        "HILL CIPHER KEY RECOVERED",
+        "",
+        f"Mode:        {'Known plaintext' if mode == 'known_plaintext' else 'Ciphertext only (2×2)'}",
+        "",
+        "Key Matrix K:",
+        format_matrix(key, "  "),
+    ]
+    if plaintext is not None:
+        lines.append("")
+        lines.append(f"Ciphertext:  {ciphertext}")
+        lines.append(f"Plaintext:   {plaintext}")
+    return lines
+
+def known_plaintext_detailed(plaintext, ciphertext, m, vector_mode='column', max_steps=DEFAULT_MAX_STEPS,
+                             verbosity='full'):
+    """Recover K from plaintext/ciphertext pairs with detailed steps"""
+    plain_nums = [char_to_num(c) % 26 for c in plaintext]
+    cipher_nums = [char_to_num(c) % 26 for c in ciphertext]
+    
+    if verbosity != 'full':
+        recovered = recover_key(plain_nums, cipher_nums, m, vector_mode)
+        if recovered is None:
+            return {"success": False, "error": "The plaintext blocks do not determine K: give more (independent) blocks"}
+        K, used = recovered
+        if hill_transform(plain_nums, K, m, vector_mode) != cipher_nums[:len(plain_nums) // m * m]:
+            return {"success": False, "error": "No Hill key maps this plaintext to this ciphertext"}
+        result = {"success": True, "mode": "known_plaintext", "key": K,
+                  "invertible": inverse_key_matrix(K) is not None,
+                  "blocks_used": {str(p): [i + 1 for i in rows] for p, rows in used.items()}}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_attack_summary_lines("known_plaintext", K))]
+        return result
+    
+    all_sections = []
+    usable = len(plain_nums) // m * m
+    P = [plain_nums[i:i + m] for i in range(0, usable, m)]
+    C = [cipher_nums[i:i + m] for i in range(0, usable, m)]
+    
+    # Section 1: Input Parameters
+    input_lines = []
+    input_lines.append(f"Plaintext:  {plaintext}")
+    input_lines.append(f"Ciphertext: {ciphertext}")
+    input_lines.append(f"Matrix Size: {m}×{m}  ({m * m} unknown key entries)")
+    input_lines.append(f"Vector Mode: {'Column Vector (C = K × P)' if vector_mode == 'column' else 'Row Vector (C = P × K)'}")
+    input_lines.append(f"Block pairs: {len(P)} (at least {m} independent ones are needed)")
+    
+    all_sections.append({
+        "section": "Input Parameters",
+        "subsections": [{"title": "Given Values", "content": '\n'.join(input_lines)}]
+    })
+    
+    # Section 2: Block Equations
+    eq_lines = []
+    if vector_mode == 'column':
+        eq_lines.append("Each block pair satisfies C = K × P, i.e. Pᵀ × Kᵀ = Cᵀ.")
+        eq_lines.append("Stacking the blocks as rows gives one linear system for X = Kᵀ:")
+    else:
+        eq_lines.append("Each block pair satisfies C = P × K.")
+        eq_lines.append("Stacking the blocks as rows gives one linear system for X = K:")
+    eq_lines.append("  [P rows] × X = [C rows] (mod 26)")
+    eq_lines.append("")
+    eq_lines.extend(_block_lines(P, C, max_steps))
+    
+    all_sections.append({
+        "section": "Block Equations",
+        "subsections": [{"title": "P × X = C (mod 26)", "content": '\n'.join(eq_lines)}]
+    })
+    
+    # Section 3: Solve modulo each prime
+    parts = [solve_mod_p(P, C, p) if len(P) >= m else None for p in PRIME_FACTORS]
+    solve_subsections = []
+    for p, part in zip(PRIME_FACTORS, parts):
+        lines = []
+        lines.append(f"Gauss–Jordan elimination on [P | C] over GF({p}).")
+        lines.append("Each pivot picks a block not spanned by the ones already chosen,")
+        lines.append("so an invertible subset of m blocks is found in one O(n·m²) pass.")
+        lines.append("")
+        if part is None:
+            lines.append(f"Rank of P mod {p} is below {m}: the blocks do not determine K mod {p}.")
         else:
-            result_lines.append("✗ Error: Texts don't match!")
+            lines.append(f"Blocks used: {', '.join(str(i + 1) for i in part[1])}")
+            lines.append("")
+            lines.append(f"X mod {p}:")
+            lines.append(format_matrix(part[0], "  "))
+        solve_subsections.append({"title": f"mod {p}", "content": '\n'.join(lines)})
+    
+    all_sections.append({
+        "section": "Solve mod 2 and mod 13",
+        "subsections": solve_subsections
+    })
+    
+    if any(part is None for part in parts):
+        return {"success": False, "error": "The plaintext blocks do not determine K: give more (independent) blocks",
+                "sections": all_sections}
+    
+    # Section 4: CRT Recombination
+    K = _key_from_solutions(parts, m, vector_mode)
+    e_2, e_13 = crt_basis(PRIME_FACTORS)
+    crt_lines = []
+    crt_lines.append(f"x ≡ a (mod 2), x ≡ b (mod 13)  ⇒  x = ({e_2}×a + {e_13}×b) mod 26, entry by entry")
+    crt_lines.append("")
+    if vector_mode == 'column':
+        crt_lines.append("K = Xᵀ:")
+    else:
+        crt_lines.append("K = X:")
+    crt_lines.append(format_matrix(K, "  "))
     
     all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
+        "section": "Combine by CRT",
+        "subsections": [{"title": "K mod 26", "content": '\n'.join(crt_lines)}]
     })
     
+    # Section 5: Verification
+    reencrypted = hill_transform(plain_nums, K, m, vector_mode)
+    verified = reencrypted == cipher_nums[:usable]
+    det = determinant(K)
+    ver_lines = []
+    ver_lines.append(f"Re-encrypting all {len(P)} plaintext blocks with K:")
+    ver_lines.append(f"  {nums_to_text(reencrypted)}")
+    if verified:
+        ver_lines.append("✓ Matches the given ciphertext")
+    else:
+        ver_lines.append("✗ Does not match: no Hill key maps this plaintext to this ciphertext")
+    ver_lines.append("")
+    ver_lines.append(f"det(K) mod 26 = {det} ({'invertible' if math.gcd(det, 26) == 1 else 'NOT invertible'} mod 26)")
+    
+    all_sections.append({
+        "section": "Verification",
+        "subsections": [{"title": "Re-encrypt with K", "content": '\n'.join(ver_lines)}]
+    })
+    
+    if not verified:
+        return {"success": False, "error": "No Hill key maps this plaintext to this ciphertext", "sections": all_sections}
+    
+    all_sections.append(final_result_section(_attack_summary_lines("known_plaintext", K)))
+    
     return {
         "success": True,
-        "plaintext": plaintext,
-        "ciphertext": ciphertext,
-        "decrypted": decrypted_text if det_inv else None,
+        "mode": "known_plaintext",
+        "key": K,
+        "invertible": math.gcd(det, 26) == 1,
+        "blocks_used": {str(p): [i + 1 for i in part[1]] for p, part in zip(PRIME_FACTORS, parts)},
+        "sections": all_sections
+    }
+
+def ciphertext_only_detailed(ciphertext, vector_mode='column', top=5, verbosity='full'):
+    """Search every 2×2 key for the most English-looking decryption, with detailed steps"""
+    cipher_nums = [char_to_num(c) % 26 for c in ciphertext]
+    candidates = search_2x2(cipher_nums, vector_mode, top)
+    best = candidates[0]
+    
+    if verbosity != 'full':
+        result = {"success": True, "mode": "ciphertext_only", "key": best["key"], "plaintext": best["plaintext"],
+                  "candidates": candidates}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(
+                _attack_summary_lines("ciphertext_only", best["key"], best["plaintext"], ciphertext))]
+        return result
+    
+    all_sections = []
+    
+    # Section 1: Search Space
+    blocks = min(len(cipher_nums) // 2, SEARCH_BLOCKS)
+    space_lines = []
+    space_lines.append(f"Ciphertext: {ciphertext}")
+    space_lines.append(f"Vector Mode: {'Column Vector (P = K⁻¹ × C)' if vector_mode == 'column' else 'Row Vector (P = C × K⁻¹)'}")
+    space_lines.append("")
+    space_lines.append(f"Candidate decryption matrices K⁻¹: 26⁴ = {26 ** 4:,}")
+    space_lines.append("Only those with det coprime to 26 are keys (the others are skipped).")
+    space_lines.append("")
+    space_lines.append(f"Each {'row' if vector_mode == 'column' else 'column'} of K⁻¹ produces every other plaintext letter,")
+    space_lines.append("so with the first one fixed, all 676 choices of the second are scored")
+    space_lines.append(f"together ({'NumPy gathers' if np is not None else 'pure Python'}, "
+                       f"{worker_count()} worker process{'es' if worker_count() > 1 else ''}).")
+    space_lines.append("")
+    space_lines.append(f"Score: sum of log₁₀ English bigram probabilities over the first {blocks} blocks")
+    
+    all_sections.append({
+        "section": "Search Space",
+        "subsections": [{"title": "All 2×2 keys", "content": '\n'.join(space_lines)}]
+    })
+    
+    # Section 2: Top Candidates
+    cand_lines = []
+    for rank, cand in enumerate(candidates, 1):
+        cand_lines.append(f"#{rank}  score {cand['score']:.2f}")
+        cand_lines.append("  K:")
+        cand_lines.append(format_matrix(cand["key"], "    "))
+        cand_lines.append(f"  Plaintext: {cand['plaintext']}")
+        cand_lines.append("")
+    
+    all_sections.append({
+        "section": "Top Candidates",
+        "subsections": [{"title": f"Best {len(candidates)} by bigram score", "content": '\n'.join(cand_lines)}]
+    })
+    
+    all_sections.append(final_result_section(
+        _attack_summary_lines("ciphertext_only", best["key"], best["plaintext"], ciphertext)))
+    
+    return {
+        "success": True,
+        "mode": "ciphertext_only",
+        "key": best["key"],
+        "plaintext": best["plaintext"],
+        "candidates": candidates,
         "sections": all_sections
     }
 
@@ -1,6 +1,24 @@
 from http.server import BaseHTTPRequestHandler
+import functools
+import heapq
 import json
 import math
+import time
+
+import english
+from narration import abbreviate, collect_sections, final_result_section
+from parallel import pool_map, worker_count
+
+KEY_CACHE_SIZE = 256
+# Text lengths whose column runs each compiled key remembers
+LENGTH_CACHE_SIZE = 16
+
+# Key search: lengths tried, rows of each column scored, and the branch-and-bound
+# node budget per length (a length that hits it is reported as not exhaustive)
+MIN_ATTACK_LENGTH = 2
+MAX_ATTACK_LENGTH = 12
+ATTACK_ROWS = 200
+NODE_LIMIT = 400_000
 
 def get_key_order(keyword):
     """
@@ -23,14 +41,175 @@ def get_key_order(keyword):
     return rank, read_order
 
 
-def keyed_encrypt_detailed(plaintext, keyword, column_order=None):
-    """Keyed Columnar Transposition Cipher Encryption with detailed steps"""
-    all_sections = []
-    
+def resolve_key_order(keyword, column_order=None):
+    """
+    Column ranks and read order, from a custom 1-indexed column_order when it
+    matches the keyword length, otherwise from the keyword itself.
+    Returns: (rank, read_order, using_custom)
+    """
+    if column_order and len(column_order) == len(keyword):
+        # Sort columns by their rank to get read order
+        sorted_by_rank = sorted(enumerate(column_order), key=lambda x: x[1])
+        return column_order, [item[0] for item in sorted_by_rank], True
+    rank, read_order = get_key_order(keyword)
+    return rank, read_order, False
+
+
+def column_heights(text_len, col_count):
+    """Characters held by each column (by original position) of the written grid"""
+    row_count = math.ceil(text_len / col_count)
+    full_cols = col_count - (row_count * col_count - text_len)
+    return [row_count if i < full_cols else row_count - 1 for i in range(col_count)]
+
+
+class ColumnarKey:
+    """A compiled columnar key: column ranks, read order and, per text length, where each
+    column's run starts in the ciphertext. A pass is one strided slice per column (slices
+    beat an index gather in CPython), so no grid is ever built."""
+
+    def __init__(self, rank, read_order, custom=False):
+        self.rank = rank
+        self.read_order = read_order
+        self.width = len(read_order)
+        self.custom = custom
+        self._runs = {}
+
+    def runs(self, n):
+        """(column, ciphertext start, height) in read order for an n-character text, cached per length"""
+        if n not in self._runs:
+            if len(self._runs) >= LENGTH_CACHE_SIZE:
+                del self._runs[next(iter(self._runs))]
+            heights = column_heights(n, self.width)
+            runs = []
+            start = 0
+            for col in self.read_order:
+                runs.append((col, start, heights[col]))
+                start += heights[col]
+            self._runs[n] = runs
+        return self._runs[n]
+
+    def permutation(self, n):
+        """Gather indices: the plaintext index read at each ciphertext position"""
+        order = []
+        for col in self.read_order:
+            order.extend(range(col, n, self.width))
+        return order
+
+    def encrypt(self, text):
+        """One transposition pass (ragged columns, no padding)"""
+        return ''.join([text[col::self.width] for col in self.read_order])
+
+    def decrypt(self, text):
+        """Undo one pass: each column's run of ciphertext is slice-assigned back into place"""
+        plain = [''] * len(text)
+        for col, start, height in self.runs(len(text)):
+            plain[col::self.width] = text[start:start + height]
+        return ''.join(plain)
+
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile(keyword, column_order):
+    rank, read_order, custom = resolve_key_order(keyword, list(column_order) if column_order else None)
+    return ColumnarKey(rank, read_order, custom)
+
+
+def compile_key(keyword, column_order=None):
+    """Compiled key for a keyword (or a custom 1-indexed column order), LRU-cached"""
+    return _compile(keyword.upper(), tuple(column_order) if column_order else None)
+
+
+def compile_passes(keyword, column_order=None, second_keyword=''):
+    """Compiled keys of every pass: the keyword, then the second keyword of a double transposition"""
+    passes = [compile_key(keyword, column_order)]
+    if second_keyword:
+        passes.append(compile_key(second_keyword))
+    return passes
+
+
+def keyed_encrypt(text, keyword, column_order=None, second_keyword=''):
+    """Columnar transposition encryption (X-padded to the first key's width), no narration"""
+    passes = compile_passes(keyword, column_order, second_keyword)
+    text = text + 'X' * (-len(text) % passes[0].width)
+    for key in passes:
+        text = key.encrypt(text)
+    return text
+
+
+def keyed_decrypt(text, keyword, column_order=None, second_keyword=''):
+    """Columnar transposition decryption (trailing X padding removed), no narration"""
+    for key in reversed(compile_passes(keyword, column_order, second_keyword)):
+        text = key.decrypt(text)
+    return text.rstrip('X')
+
+
+def _summary_lines(mode, text, keyword, rank, output, second_keyword=''):
+    """Lines of the "Final Result" section"""
+    if mode == 'encrypt':
+        lines = [
+            "KEYED COLUMNAR ENCRYPTION COMPLETE",
+            "",
+            f"Input Plaintext:   \"{text}\"",
+            f"Keyword:           \"{keyword}\"",
+            f"Column Order:      {rank}",
+            f"Output Ciphertext: \"{output}\"",
+        ]
+    else:
+        lines = [
+            "KEYED COLUMNAR DECRYPTION COMPLETE",
+            "",
+            f"Input Ciphertext:  \"{text}\"",
+            f"Keyword:           \"{keyword}\"",
+            f"Column Order:      {rank}",
+            f"Output Plaintext:  \"{output}\"",
+        ]
+    if second_keyword:
+        lines.insert(5, f"Second Keyword:    \"{second_keyword}\" (order {compile_key(second_keyword).rank})")
+    return lines
+
+
+def _result(mode, text, output, keyword, second_keyword):
+    """Result fields shared by every verbosity"""
+    source, target = ('plaintext', 'ciphertext') if mode == 'encrypt' else ('ciphertext', 'plaintext')
+    result = {"success": True, source: text, target: output, "keyword": keyword, "mode": mode}
+    if second_keyword:
+        result["second_keyword"] = second_keyword
+    return result
+
+
+def _second_pass_lines(key, keyword, text, mode):
+    """Lines of the section for the second pass of a double transposition: its key order and
+    each column's run, taken straight from the compiled key (no grid)"""
+    lines = []
+    lines.append(f"Second keyword: \"{keyword}\"")
+    lines.append("  Keyword:  " + "  ".join(f"{c:>3}" for c in keyword))
+    lines.append("  Rank:     " + "  ".join(f"{r:>3}" for r in key.rank))
+    lines.append(f"Read order: {[r+1 for r in key.read_order]}")
+    lines.append("")
+    if mode == 'encrypt':
+        lines.append(f"Writing \"{text}\" row-by-row under the second keyword (columns may be ragged)")
+        lines.append("and reading its columns in order:")
+        source = key.encrypt(text)
+    else:
+        lines.append(f"Splitting \"{text}\" into the second keyword's column runs (columns may be ragged)")
+        lines.append("and reading the rebuilt grid row-by-row:")
+        source = text
+    lines.append("")
+    for col, start, height in key.runs(len(text)):
+        lines.append(f"  Column {col+1} ('{keyword[col]}', Rank {key.rank[col]}): {source[start:start + height]}")
+    lines.append("")
+    lines.append("─" * 50)
+    output = source if mode == 'encrypt' else key.decrypt(text)
+    lines.append(f"{'Ciphertext after both passes' if mode == 'encrypt' else 'Text after undoing the second pass'}: {output}")
+    return lines, output
+
+
+def keyed_encrypt_sections(plaintext, keyword, column_order=None, second_keyword=''):
+    """Keyed Columnar Transposition Cipher Encryption, yielding each explanation section as soon as it is built"""
     # Clean plaintext
     text = plaintext.upper().replace(" ", "").replace("_", "")
     text = ''.join(c for c in text if c.isalpha())
     keyword = keyword.upper()
+    second_keyword = second_keyword.upper()
     
     # Section 1: Input Parameters
     input_lines = []
@@ -44,26 +223,18 @@ def keyed_encrypt_detailed(plaintext, keyword, column_order=None):
     input_lines.append("  1. Determine column order from keyword (or use custom order)")
     input_lines.append("  2. Write plaintext row-by-row into grid")
     input_lines.append("  3. Read columns in the sorted order")
+    if second_keyword:
+        input_lines.append(f"  4. Transpose the result again under \"{second_keyword}\" (double transposition)")
     
-    all_sections.append({
+    yield {
         "section": "Input Parameters",
         "subsections": [{"title": "Given Values", "content": '\n'.join(input_lines)}]
-    })
+    }
     
     # Section 2: Key Order Calculation
     # Use custom column_order if provided, otherwise calculate from keyword
-    if column_order and len(column_order) == len(keyword):
-        # User provided custom column order (1-indexed ranks)
-        rank = column_order
-        # Convert rank to read_order: read_order[i] = column to read at step i
-        # Sort columns by their rank to get read order
-        indexed_ranks = list(enumerate(rank))
-        sorted_by_rank = sorted(indexed_ranks, key=lambda x: x[1])
-        read_order = [item[0] for item in sorted_by_rank]
-        using_custom = True
-    else:
-        rank, read_order = get_key_order(keyword)
-        using_custom = False
+    key = compile_key(keyword, column_order)
+    rank, read_order, using_custom = key.rank, key.read_order, key.custom
     
     key_lines = []
     key_lines.append("Step 1: Determine column read order")
@@ -98,10 +269,10 @@ def keyed_encrypt_detailed(plaintext, keyword, column_order=None):
     key_lines.append("(Columns are read in this order: " + 
                     " → ".join(f"Col {r+1} ({keyword[r]})" for r in read_order) + ")")
     
-    all_sections.append({
+    yield {
         "section": "Key Order Calculation",
         "subsections": [{"title": "Determining Column Read Order", "content": '\n'.join(key_lines)}]
-    })
+    }
     
     # Section 3: Grid Construction
     col_count = len(keyword)
@@ -143,10 +314,10 @@ def keyed_encrypt_detailed(plaintext, keyword, column_order=None):
         row_str = f"Row {r+1}: " + "  ".join(f"{c:>3}" for c in row)
         grid_lines.append(row_str)
     
-    all_sections.append({
+    yield {
         "section": "Grid Construction",
         "subsections": [{"title": "Building the Transposition Grid", "content": '\n'.join(grid_lines)}]
-    })
+    }
     
     # Section 4: Reading Columns
     read_lines = []
@@ -166,43 +337,50 @@ def keyed_encrypt_detailed(plaintext, keyword, column_order=None):
     read_lines.append("─" * 50)
     read_lines.append(f"Concatenated Ciphertext: {ciphertext}")
     
-    all_sections.append({
+    yield {
         "section": "Reading Columns",
         "subsections": [{"title": "Extracting Ciphertext", "content": '\n'.join(read_lines)}]
-    })
-    
-    # Section 5: Final Result
-    result_lines = []
-    result_lines.append("KEYED COLUMNAR ENCRYPTION COMPLETE")
-    result_lines.append("")
-    result_lines.append(f"Input Plaintext:   \"{text}\"")
-    result_lines.append(f"Keyword:           \"{keyword}\"")
-    result_lines.append(f"Column Order:      {rank}")
-    result_lines.append(f"Output Ciphertext: \"{ciphertext}\"")
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
-    })
-    
-    return {
-        "success": True,
-        "plaintext": text,
-        "ciphertext": ciphertext,
-        "keyword": keyword,
-        "mode": "encrypt",
-        "sections": all_sections
     }
+    
+    # Section 5: Second Transposition
+    if second_keyword:
+        second_lines, ciphertext = _second_pass_lines(compile_key(second_keyword), second_keyword, ciphertext, 'encrypt')
+        yield {
+            "section": "Second Transposition",
+            "subsections": [{"title": "Transposing Again", "content": '\n'.join(second_lines)}]
+        }
+    
+    # Section 6: Final Result
+    yield final_result_section(_summary_lines('encrypt', text, keyword, rank, ciphertext, second_keyword))
+    
+    return _result('encrypt', text, ciphertext, keyword, second_keyword)
 
 
-def keyed_decrypt_detailed(ciphertext, keyword, column_order=None):
-    """Keyed Columnar Transposition Cipher Decryption with detailed steps"""
-    all_sections = []
-    
+def keyed_encrypt_detailed(plaintext, keyword, column_order=None, verbosity='full', second_keyword=''):
+    """Keyed Columnar Transposition Cipher Encryption with detailed steps"""
+    if verbosity != 'full':
+        text = plaintext.upper().replace(" ", "").replace("_", "")
+        text = ''.join(c for c in text if c.isalpha())
+        keyword = keyword.upper()
+        second_keyword = second_keyword.upper()
+        ciphertext = keyed_encrypt(text, keyword, column_order, second_keyword)
+        result = _result('encrypt', text, ciphertext, keyword, second_keyword)
+        if verbosity == 'summary':
+            rank = compile_key(keyword, column_order).rank
+            result["sections"] = [final_result_section(
+                _summary_lines('encrypt', text, keyword, rank, ciphertext, second_keyword))]
+        return result
+    
+    return collect_sections(keyed_encrypt_sections(plaintext, keyword, column_order, second_keyword))
+
+
+def keyed_decrypt_sections(ciphertext, keyword, column_order=None, second_keyword=''):
+    """Keyed Columnar Transposition Cipher Decryption, yielding each explanation section as soon as it is built"""
     # Clean ciphertext
     text = ciphertext.upper().replace(" ", "")
     text = ''.join(c for c in text if c.isalpha())
     keyword = keyword.upper()
+    second_keyword = second_keyword.upper()
     
     # Section 1: Input Parameters
     input_lines = []
@@ -217,38 +395,40 @@ def keyed_decrypt_detailed(ciphertext, keyword, column_order=None):
     input_lines.append("  2. Determine how many chars go in each column")
     input_lines.append("  3. Fill columns with ciphertext")
     input_lines.append("  4. Read grid row-by-row")
+    if second_keyword:
+        input_lines.append(f"  (First undo the second transposition under \"{second_keyword}\")")
     
-    all_sections.append({
+    yield {
         "section": "Input Parameters",
         "subsections": [{"title": "Given Values", "content": '\n'.join(input_lines)}]
-    })
+    }
+    
+    # Undo the second pass of a double transposition; the steps below work on its output
+    grid_text = text
+    if second_keyword:
+        second_lines, grid_text = _second_pass_lines(compile_key(second_keyword), second_keyword, text, 'decrypt')
+        yield {
+            "section": "Undoing Second Transposition",
+            "subsections": [{"title": "Second Keyword Columns", "content": '\n'.join(second_lines)}]
+        }
     
     # Section 2: Calculate dimensions and order
     col_count = len(keyword)
-    row_count = math.ceil(len(text) / col_count)
+    row_count = math.ceil(len(grid_text) / col_count)
     total_cells = row_count * col_count
-    short_cols = total_cells - len(text)  # Columns with one less char
+    short_cols = total_cells - len(grid_text)  # Columns with one less char
     full_cols = col_count - short_cols  # Columns with full height
     
     # Use custom column_order if provided, otherwise calculate from keyword
-    if column_order and len(column_order) == len(keyword):
-        # User provided custom column order (1-indexed ranks)
-        rank = column_order
-        # Convert rank to read_order: read_order[i] = column to read at step i
-        indexed_ranks = list(enumerate(rank))
-        sorted_by_rank = sorted(indexed_ranks, key=lambda x: x[1])
-        read_order = [item[0] for item in sorted_by_rank]
-        using_custom = True
-    else:
-        rank, read_order = get_key_order(keyword)
-        using_custom = False
+    key = compile_key(keyword, column_order)
+    rank, read_order, using_custom = key.rank, key.read_order, key.custom
     
     dim_lines = []
     dim_lines.append("Step 1: Calculate grid dimensions")
     dim_lines.append("")
-    dim_lines.append(f"Ciphertext length: {len(text)}")
+    dim_lines.append(f"Ciphertext length: {len(grid_text)}")
     dim_lines.append(f"Columns (keyword length): {col_count}")
-    dim_lines.append(f"Rows: ceil({len(text)} / {col_count}) = {row_count}")
+    dim_lines.append(f"Rows: ceil({len(grid_text)} / {col_count}) = {row_count}")
     dim_lines.append(f"Total grid cells: {total_cells}")
     dim_lines.append("")
     
@@ -276,10 +456,10 @@ def keyed_decrypt_detailed(ciphertext, keyword, column_order=None):
     dim_lines.append("")
     dim_lines.append(f"Read order: {[r+1 for r in read_order]}")
     
-    all_sections.append({
+    yield {
         "section": "Dimension Calculation",
         "subsections": [{"title": "Grid Setup", "content": '\n'.join(dim_lines)}]
-    })
+    }
     
     # Section 3: Determine column heights and fill
     fill_lines = []
@@ -310,7 +490,7 @@ def keyed_decrypt_detailed(ciphertext, keyword, column_order=None):
     
     for step, col_idx in enumerate(read_order):
         height = col_heights[col_idx]
-        segment = text[cipher_idx : cipher_idx + height]
+        segment = grid_text[cipher_idx : cipher_idx + height]
         
         fill_lines.append(f"Step {step+1}: Fill Column {col_idx+1} ('{keyword[col_idx]}', Rank {rank[col_idx]})")
         fill_lines.append(f"         Takes {height} chars: \"{segment}\"")
@@ -322,10 +502,10 @@ def keyed_decrypt_detailed(ciphertext, keyword, column_order=None):
         
         cipher_idx += height
     
-    all_sections.append({
+    yield {
         "section": "Filling Columns",
         "subsections": [{"title": "Distributing Ciphertext", "content": '\n'.join(fill_lines)}]
-    })
+    }
     
     # Section 4: Display filled grid
     grid_lines = []
@@ -342,10 +522,10 @@ def keyed_decrypt_detailed(ciphertext, keyword, column_order=None):
         row_str = f"Row {r+1}: " + "  ".join(f"{c if c else '.':>3}" for c in row)
         grid_lines.append(row_str)
     
-    all_sections.append({
+    yield {
         "section": "Reconstructed Grid",
         "subsections": [{"title": "Grid After Filling Columns", "content": '\n'.join(grid_lines)}]
-    })
+    }
     
     # Section 5: Read row-by-row
     read_lines = []
@@ -367,35 +547,208 @@ def keyed_decrypt_detailed(ciphertext, keyword, column_order=None):
     if plaintext != plaintext_clean:
         read_lines.append(f"After removing padding (X): {plaintext_clean}")
     
-    all_sections.append({
+    yield {
         "section": "Reading Rows",
         "subsections": [{"title": "Reconstructing Plaintext", "content": '\n'.join(read_lines)}]
-    })
+    }
     
     # Section 6: Final Result
-    result_lines = []
-    result_lines.append("KEYED COLUMNAR DECRYPTION COMPLETE")
-    result_lines.append("")
-    result_lines.append(f"Input Ciphertext:  \"{text}\"")
-    result_lines.append(f"Keyword:           \"{keyword}\"")
-    result_lines.append(f"Column Order:      {rank}")
-    result_lines.append(f"Output Plaintext:  \"{plaintext_clean}\"")
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
-    })
+    yield final_result_section(_summary_lines('decrypt', text, keyword, rank, plaintext_clean, second_keyword))
+    
+    return _result('decrypt', text, plaintext_clean, keyword, second_keyword)
+
+
+def keyed_decrypt_detailed(ciphertext, keyword, column_order=None, verbosity='full', second_keyword=''):
+    """Keyed Columnar Transposition Cipher Decryption with detailed steps"""
+    if verbosity != 'full':
+        text = ciphertext.upper().replace(" ", "")
+        text = ''.join(c for c in text if c.isalpha())
+        keyword = keyword.upper()
+        second_keyword = second_keyword.upper()
+        plaintext = keyed_decrypt(text, keyword, column_order, second_keyword)
+        result = _result('decrypt', text, plaintext, keyword, second_keyword)
+        if verbosity == 'summary':
+            rank = compile_key(keyword, column_order).rank
+            result["sections"] = [final_result_section(
+                _summary_lines('decrypt', text, keyword, rank, plaintext, second_keyword))]
+        return result
+    
+    return collect_sections(keyed_decrypt_sections(ciphertext, keyword, column_order, second_keyword))
+
+
+def _adjacency(blocks):
+    """W[a][b]: bigram score of column block a written immediately left of block b"""
+    table = english.ngram_table(2)
+    return [[sum(table[x * 26 + y] for x, y in zip(a, b)) if a is not b else 0.0 for b in blocks]
+            for a in blocks]
+
+
+def _search_length(task):
+    """Branch and bound over column orders for one key length: a partial order is extended one
+    grid column at a time and dropped once its score plus the best incoming edge of every
+    unplaced column cannot beat the current top. Returns (k, best, nodes, exhaustive, ms)."""
+    k, blocks, top = task
+    start_time = time.perf_counter()
+    W = _adjacency(blocks)
+    best_in = [max(W[a][b] for a in range(k) if a != b) for b in range(k)]
+    best = []
+    nodes = 0
+    
+    def extend(path, placed, score, bound_rest):
+        nonlocal nodes
+        # Every node visited counts against the budget, pruned subtrees included
+        if nodes >= NODE_LIMIT:
+            return False
+        nodes += 1
+        if len(path) == k:
+            item = (score, tuple(path))
+            if len(best) < top:
+                heapq.heappush(best, item)
+            else:
+                heapq.heappushpop(best, item)
+            return True
+        last = path[-1]
+        for nxt in sorted((b for b in range(k) if not placed >> b & 1), key=lambda b: -W[last][b]):
+            new_score = score + W[last][nxt]
+            rest = bound_rest - best_in[nxt]
+            if len(best) == top and new_score + rest <= best[0][0]:
+                continue
+            path.append(nxt)
+            going = extend(path, placed | 1 << nxt, new_score, rest)
+            path.pop()
+            if not going:
+                return False
+        return True
+    
+    total_in = sum(best_in)
+    exhaustive = all(extend([first], 1 << first, 0.0, total_in - best_in[first]) for first in range(k))
+    return k, sorted(best, reverse=True), nodes, exhaustive, (time.perf_counter() - start_time) * 1000
+
+
+def attack_lengths(n, min_length=MIN_ATTACK_LENGTH, max_length=MAX_ATTACK_LENGTH):
+    """Key lengths searched: those that divide the ciphertext length (encryption pads to a full
+    grid, so every column is one contiguous run) and leave at least two rows"""
+    return [k for k in range(min_length, max_length + 1) if n % k == 0 and n // k >= 2]
+
+
+def search_keys(text, min_length=MIN_ATTACK_LENGTH, max_length=MAX_ATTACK_LENGTH, top=5):
+    """Ciphertext-only search over column orders, one pool task per key length; returns the
+    `top` candidates across lengths (best mean bigram score first) and per-length stats"""
+    nums = [ord(c) - 65 for c in text]
+    tasks = []
+    for k in attack_lengths(len(text), min_length, max_length):
+        rows = len(text) // k
+        tasks.append((k, [nums[j * rows:j * rows + min(rows, ATTACK_ROWS)] for j in range(k)], top))
+    candidates = []
+    stats = []
+    for k, best, nodes, exhaustive, ms in pool_map(_search_length, tasks):
+        digrams = (k - 1) * min(len(text) // k, ATTACK_ROWS)
+        stats.append({"length": k, "nodes": nodes, "permutations": math.factorial(k),
+                      "exhaustive": exhaustive, "ms": round(ms, 1)})
+        for score, path in best:
+            read_order = sorted(range(k), key=path.__getitem__)
+            key = ColumnarKey([block + 1 for block in path], read_order, custom=True)
+            candidates.append({"length": k, "column_order": key.rank, "score": round(score / digrams, 4),
+                               "plaintext": key.decrypt(text).rstrip('X')})
+    candidates.sort(key=lambda c: -c["score"])
+    return candidates[:top], stats
+
+
+def _attack_summary_lines(text, best):
+    """Lines of the "Final Result" section of the key search"""
+    return [
+        "KEYED COLUMNAR KEY RECOVERED",
+        "",
+        f"Input Ciphertext:  \"{text}\"",
+        f"Key Length:        {best['length']}",
+        f"Column Order:      {best['column_order']}",
+        f"Output Plaintext:  \"{best['plaintext']}\"",
+    ]
+
+
+def keyed_attack_sections(ciphertext, min_length=MIN_ATTACK_LENGTH, max_length=MAX_ATTACK_LENGTH, top=5):
+    """Keyed Columnar ciphertext-only key search, yielding each explanation section as soon as it is built"""
+    text = ''.join(c for c in ciphertext.upper() if c.isalpha())
+    lengths = attack_lengths(len(text), min_length, max_length)
+    workers = worker_count(len(lengths))
+    
+    # Section 1: Search Space
+    space_lines = []
+    space_lines.append(f"Ciphertext: \"{abbreviate(text, keep=32, unit='characters')}\"")
+    space_lines.append(f"Text Length: {len(text)}")
+    space_lines.append("")
+    space_lines.append(f"Key lengths {min_length}–{max_length} that divide the text length: {lengths}")
+    space_lines.append("(encryption pads the grid with X, so each column is one contiguous run of ciphertext)")
+    space_lines.append("")
+    space_lines.append("For each length, columns are placed left to right. Two columns side by side spell one")
+    space_lines.append(f"bigram per row, so an order scores the log₁₀ English bigram probabilities of adjacent")
+    space_lines.append(f"columns over the first {ATTACK_ROWS} rows. A partial order is dropped as soon as its score")
+    space_lines.append("plus the best possible incoming pair of every unplaced column cannot reach the top")
+    space_lines.append(f"candidates (branch and bound; {workers} worker process{'es' if workers > 1 else ''}, one length per task).")
+    
+    yield {
+        "section": "Search Space",
+        "subsections": [{"title": "Key lengths and scoring", "content": '\n'.join(space_lines)}]
+    }
+    
+    # Section 2: Search per Key Length
+    candidates, stats = search_keys(text, min_length, max_length, top)
+    
+    stat_lines = []
+    for stat in stats:
+        stat_lines.append(f"  Length {stat['length']:>2}: {stat['nodes']:>9,} nodes of {stat['permutations']:>11,} orders  "
+                          f"{stat['ms']:>8,.1f} ms{'' if stat['exhaustive'] else '  (node limit reached)'}")
+    
+    yield {
+        "section": "Search per Key Length",
+        "subsections": [{"title": "Branch and bound", "content": '\n'.join(stat_lines) or "No key length divides the text length"}]
+    }
+    
+    if not candidates:
+        return {"success": False, "error": f"No key length from {min_length} to {max_length} divides the ciphertext length ({len(text)})"}
+    
+    # Section 3: Top Candidates
+    cand_lines = []
+    for rank, cand in enumerate(candidates, 1):
+        cand_lines.append(f"#{rank}  length {cand['length']}, order {cand['column_order']}  mean score {cand['score']:.4f}")
+        cand_lines.append(f"  Plaintext: {abbreviate(cand['plaintext'], keep=32, unit='characters')}")
+        cand_lines.append("")
+    
+    yield {
+        "section": "Top Candidates",
+        "subsections": [{"title": f"Best {len(candidates)} by mean bigram score", "content": '\n'.join(cand_lines)}]
+    }
+    
+    # Section 4: Final Result
+    yield final_result_section(_attack_summary_lines(text, candidates[0]))
     
     return {
         "success": True,
         "ciphertext": text,
-        "plaintext": plaintext_clean,
-        "keyword": keyword,
-        "mode": "decrypt",
-        "sections": all_sections
+        "plaintext": candidates[0]["plaintext"],
+        "column_order": candidates[0]["column_order"],
+        "candidates": candidates,
+        "lengths": stats,
     }
 
 
+def keyed_attack_detailed(ciphertext, min_length=MIN_ATTACK_LENGTH, max_length=MAX_ATTACK_LENGTH, top=5,
+                          verbosity='full'):
+    """Keyed Columnar ciphertext-only key search with detailed steps"""
+    if verbosity != 'full':
+        text = ''.join(c for c in ciphertext.upper() if c.isalpha())
+        candidates, stats = search_keys(text, min_length, max_length, top)
+        if not candidates:
+            return {"success": False, "error": f"No key length from {min_length} to {max_length} divides the ciphertext length ({len(text)})"}
+        result = {"success": True, "ciphertext": text, "plaintext": candidates[0]["plaintext"],
+                  "column_order": candidates[0]["column_order"], "candidates": candidates, "lengths": stats}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_attack_summary_lines(text, candidates[0]))]
+        return result
+    
+    return collect_sections(keyed_attack_sections(ciphertext, min_length, max_length, top))
+
+
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         self.send_response(200)
@@ -420,13 +773,14 @@ class handler(BaseHTTPRequestHandler):
             mode = data.get('mode', 'encrypt')
             keyword = data.get('keyword', 'KEY')
             column_order = data.get('columnOrder', None)
+            second_keyword = data.get('secondKeyword', '')
             
             if mode == 'encrypt':
                 plaintext = data.get('plaintext', 'WEAREDISCOVEREDFLEEATONCE')
-                result = keyed_encrypt_detailed(plaintext, keyword, column_order)
+                result = keyed_encrypt_detailed(plaintext, keyword, column_order, second_keyword=second_keyword)
             else:
                 ciphertext = data.get('ciphertext', '')
-                result = keyed_decrypt_detailed(ciphertext, keyword, column_order)
+                result = keyed_decrypt_detailed(ciphertext, keyword, column_order, second_keyword=second_keyword)
             
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
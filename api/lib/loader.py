@@ -0,0 +1,96 @@
+"""
+Shared module loader for the serverless entry points (co1, co2, math-ops) and the dev server.
+Each api/lib module is executed once per warm instance and reused for every later request.
+Set DPS_RELOAD_MODULES=1 to re-execute a module whenever its file changes on disk (development).
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+
+LIB_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Make sibling lib modules importable from each other (e.g. `import loader`)
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+_cache = {}  # name -> (mtime, module)
+_lock = threading.Lock()
+
+
+def reload_enabled():
+    """True when modules should be reloaded after their file changes on disk"""
+    return os.environ.get('DPS_RELOAD_MODULES', '').lower() in ('1', 'true', 'yes')
+
+
+def module_path(name):
+    """Path of the api/lib file backing module `name` (e.g. 'mod-exp')"""
+    return os.path.join(LIB_DIR, f'{name}.py')
+
+
+def import_name(name):
+    """Importable name for a lib file ('mod-exp' -> 'mod_exp')"""
+    return name.replace('-', '_')
+
+
+def _exec_module(name, path):
+    """Execute the module file and register it in sys.modules"""
+    mod_name = import_name(name)
+    spec = importlib.util.spec_from_file_location(mod_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so pickling (process pools) and sibling imports resolve to this instance
+    sys.modules[mod_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(mod_name, None)
+        raise
+    return module
+
+
+def load_module(name, reload=None):
+    """Return the api/lib module `name`, executing its file at most once per process.
+
+    reload: re-execute the module if its file changed since it was loaded.
+            Defaults to the DPS_RELOAD_MODULES environment variable.
+    """
+    if reload is None:
+        reload = reload_enabled()
+
+    cached = _cache.get(name)
+    if cached is not None and not reload:
+        return cached[1]
+
+    path = module_path(name)
+    mtime = os.path.getmtime(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _lock:
+        cached = _cache.get(name)
+        if cached is not None and (not reload or cached[0] == mtime):
+            return cached[1]
+
+        # Reuse an instance already imported normally by a sibling module
+        existing = sys.modules.get(import_name(name))
+        if (cached is None and existing is not None
+                and os.path.abspath(getattr(existing, '__file__', '') or '') == path):
+            module = existing
+        else:
+            module = _exec_module(name, path)
+        _cache[name] = (mtime, module)
+    return module
+
+
+def clear_cache():
+    """Forget every loaded module (next load_module call re-executes the file)"""
+    with _lock:
+        for name in _cache:
+            sys.modules.pop(import_name(name), None)
+        _cache.clear()
+
+
+def loaded_modules():
+    """Names of the modules currently cached"""
+    return sorted(_cache)
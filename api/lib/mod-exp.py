@@ -1,144 +1,522 @@
 from http.server import BaseHTTPRequestHandler
 import json
 
-def mod_exp_detailed(a, n, m):
-    """Modular Exponentiation using repeated squaring with detailed steps"""
-    all_sections = []
+import time
+
+from narration import DEFAULT_MAX_STEPS, abbreviate, collect_sections, final_result_section, step_window
+
+def _summary_lines(a, n, m, result, algorithm='right_to_left', mults=None):
+    """Lines of the "Final Result" section; mults: the selected engine's multiplication count"""
+    binary = bin(n)[2:]
+    lines = [
+        "═" * 55,
+        "FINAL RESULT",
+        "═" * 55,
+        "",
+        f"<b>★ {abbreviate(a)}^{abbreviate(n)} mod {abbreviate(m)} = {abbreviate(result)}</b>",
+        "",
+        f"Computation Efficiency:",
+        f"  - Without optimization: {abbreviate(n)} multiplications",
+        f"  - With repeated squaring: {len(binary)} squarings + {binary.count('1')} multiplications",
+        f"  - Total operations: ~{len(binary) + binary.count('1')}",
+    ]
+    if algorithm != 'right_to_left' and mults is not None:
+        lines.append(f"  - {ENGINES[algorithm][0]}: {mults} multiplications (including squarings)")
+    lines.append("")
+    lines.append("═" * 55)
+    return lines
+
+def _omitted_line(skipped, squarings, multiplications):
+    """Placeholder for the steps step_window left out"""
+    return (f"  ⋯ Steps {skipped.start + 1}–{skipped.stop}: {len(skipped)} steps not shown "
+            f"({squarings} squarings, {multiplications} multiplications) ⋯")
+
+def square_and_multiply_lines(a, n, m, max_steps=DEFAULT_MAX_STEPS):
+    """Right-to-left square-and-multiply narration for a^n mod m; returns (result, lines).
+    Only the first and last `max_steps` bits are narrated in full."""
+    lines = []
+    result = 1
+    base = a % m
+    binary = bin(n)[2:]
+    skipped = step_window(len(binary) if n > 0 else 0, max_steps)
     
+    lines.append(f"Initial: result = 1, base = {abbreviate(a)} mod {abbreviate(m)} = {abbreviate(base)}")
+    lines.append("")
+    
+    bit_position = 0
+    temp_n = n
+    while temp_n > 0:
+        bit = temp_n & 1
+        if skipped is not None and bit_position in skipped:
+            if bit_position == skipped.start:
+                lines.append(_omitted_line(skipped, len(skipped), binary[::-1][skipped.start:skipped.stop].count('1')))
+                lines.append("")
+                lines.append("─" * 55)
+                lines.append("")
+            if bit == 1:
+                result = (result * base) % m
+            base = (base * base) % m
+            temp_n >>= 1
+            bit_position += 1
+            continue
+        
+        lines.append(f"Step {bit_position + 1}: Processing bit {bit_position}")
+        lines.append(f"  Current bit = {bit}")
+        lines.append(f"  Binary position = 2^{bit_position} = {abbreviate(2**bit_position)}")
+        lines.append("")
+        
+        if bit == 1:
+            old_result = result
+            result = (result * base) % m
+            lines.append(f"  Bit = 1, so multiply:")
+            lines.append(f"    result = result × base mod {abbreviate(m)}")
+            lines.append(f"    result = {abbreviate(old_result)} × {abbreviate(base)} mod {abbreviate(m)}")
+            lines.append(f"    result = {abbreviate(old_result * base)} mod {abbreviate(m)}")
+            lines.append(f"    result = {abbreviate(result)}")
+        else:
+            lines.append(f"  Bit = 0, so skip multiplication")
+            lines.append(f"    result = {abbreviate(result)} (unchanged)")
+        
+        lines.append("")
+        
+        old_base = base
+        base = (base * base) % m
+        lines.append(f"  Square the base for next iteration:")
+        lines.append(f"    base = base × base mod {abbreviate(m)}")
+        lines.append(f"    base = {abbreviate(old_base)} × {abbreviate(old_base)} mod {abbreviate(m)}")
+        lines.append(f"    base = {abbreviate(old_base * old_base)} mod {abbreviate(m)}")
+        lines.append(f"    base = {abbreviate(base)}")
+        lines.append("")
+        lines.append("─" * 55)
+        lines.append("")
+        
+        temp_n >>= 1
+        bit_position += 1
+    
+    return result, lines
+
+# ========== Exponentiation Engines ==========
+# Each returns (a^n mod m, modular multiplications performed); squarings count as multiplications.
+# Like the narrated loop, a^0 is 1 even when m = 1.
+
+def right_to_left(a, n, m):
+    """Right-to-left binary: square the base for every bit, multiply it in on 1-bits"""
+    if n == 0:
+        return 1, 0
+    base = a % m
+    result = None
+    mults = 0
+    while True:
+        if n & 1:
+            if result is None:
+                result = base
+            else:
+                result = result * base % m
+                mults += 1
+        n >>= 1
+        if not n:
+            return result, mults
+        base = base * base % m
+        mults += 1
+
+def left_to_right(a, n, m):
+    """Left-to-right binary: square the result for every bit after the leading one, multiply by a on 1-bits"""
+    if n == 0:
+        return 1, 0
+    base = a % m
+    result = base
+    mults = 0
+    for bit in bin(n)[3:]:
+        result = result * result % m
+        mults += 1
+        if bit == '1':
+            result = result * base % m
+            mults += 1
+    return result, mults
+
+def window_size(bits):
+    """Sliding-window width k minimizing table cost 2^(k-1) plus about bits/(k+1) window multiplications"""
+    return min(range(1, 8), key=lambda k: (1 << (k - 1) if k > 1 else 0) + bits / (k + 1))
+
+def _windows(n, k):
+    """Left-to-right sliding windows of n: (zero bits skipped before, window bits, window value)"""
+    bits = bin(n)[2:]
+    i, zeros = 0, 0
+    while i < len(bits):
+        if bits[i] == '0':
+            zeros += 1
+            i += 1
+            continue
+        j = min(i + k, len(bits))
+        while bits[j - 1] == '0':
+            j -= 1
+        yield zeros, bits[i:j], int(bits[i:j], 2)
+        zeros = 0
+        i = j
+    if zeros:
+        yield zeros, '', 0
+
+def _odd_powers(base, m, k):
+    """{1: a, 3: a³, …, 2^k - 1: a^(2^k - 1)} mod m and the multiplications it took"""
+    table = {1: base}
+    if k == 1:
+        return table, 0
+    square = base * base % m
+    for odd in range(3, 1 << k, 2):
+        table[odd] = table[odd - 2] * square % m
+    return table, 1 << (k - 1)
+
+def sliding_window(a, n, m, k=None):
+    """Left-to-right sliding window: precompute odd powers, then one multiplication per window of up to k bits"""
+    if n == 0:
+        return 1, 0
+    k = k or window_size(n.bit_length())
+    table, mults = _odd_powers(a % m, m, k)
+    result = None
+    for zeros, window, value in _windows(n, k):
+        if result is not None:
+            for _ in range(zeros + len(window)):
+                result = result * result % m
+            mults += zeros + len(window)
+        if value:
+            if result is None:
+                result = table[value]
+            else:
+                result = result * table[value] % m
+                mults += 1
+    return result, mults
+
+def montgomery_ladder(a, n, m):
+    """Montgomery ladder: one multiplication and one squaring for every bit, whatever its value"""
+    if n == 0:
+        return 1, 0
+    r0 = a % m
+    r1 = r0 * r0 % m
+    mults = 1
+    for bit in bin(n)[3:]:
+        if bit == '1':
+            r0, r1 = r0 * r1 % m, r1 * r1 % m
+        else:
+            r0, r1 = r0 * r0 % m, r0 * r1 % m
+        mults += 2
+    return r0, mults
+
+def builtin(a, n, m):
+    """CPython's pow (C, sliding window); its multiplication count is not observable"""
+    return (pow(a, n, m) if n > 0 else 1), None
+
+# name -> (label, engine)
+ENGINES = {
+    'right_to_left': ('Right-to-left binary', right_to_left),
+    'left_to_right': ('Left-to-right binary', left_to_right),
+    'sliding_window': ('Sliding window', sliding_window),
+    'montgomery_ladder': ('Montgomery ladder', montgomery_ladder),
+    'builtin': ('Built-in pow (C)', builtin),
+}
+
+def multiplication_count(algorithm, n):
+    """Multiplications (including squarings) the engine performs for exponent n, from the bits
+    of n alone, without running it; None for the built-in pow"""
+    if n == 0 or algorithm == 'builtin':
+        return 0 if n == 0 else None
+    bits, ones = n.bit_length(), bin(n).count('1')
+    if algorithm == 'montgomery_ladder':
+        return 1 + 2 * (bits - 1)
+    if algorithm == 'sliding_window':
+        k = window_size(bits)
+        mults = 1 << (k - 1) if k > 1 else 0
+        started = False
+        for zeros, window, value in _windows(n, k):
+            if started:
+                mults += zeros + len(window)
+            if value:
+                mults += started
+                started = True
+        return mults
+    return bits - 1 + ones - 1
+
+def _engine_mults(algorithm, n, comparison=None):
+    """The selected engine's multiplication count: from compare_engines rows when they exist"""
+    for row in comparison or ():
+        if row["algorithm"] == algorithm:
+            return row["multiplications"]
+    return multiplication_count(algorithm, n)
+
+# Used for every non-narrated result: fastest below 1536 bits and within a few percent of the
+# sliding window above (benchmarks/bench_mod_exp_engines.py)
+FASTEST_ENGINE = 'builtin'
+
+def compare_engines(a, n, m):
+    """Run every engine once; returns [{algorithm, label, multiplications, time_ms}]"""
+    rows = []
+    for name, (label, engine) in ENGINES.items():
+        start = time.perf_counter()
+        _, mults = engine(a, n, m)
+        elapsed = time.perf_counter() - start
+        rows.append({"algorithm": name, "label": label, "multiplications": mults,
+                     "time_ms": round(elapsed * 1000, 4)})
+    return rows
+
+def _comparison_lines(rows):
+    """Table of compare_engines rows, fastest first"""
+    lines = [f"{'Algorithm':<24}{'Multiplications':>16}{'Time (ms)':>12}", "─" * 52]
+    for row in sorted(rows, key=lambda r: r["time_ms"]):
+        mults = "n/a" if row["multiplications"] is None else f"{row['multiplications']:,}"
+        lines.append(f"{row['label']:<24}{mults:>16}{row['time_ms']:>12.4f}")
+    lines.append("")
+    lines.append("Multiplications include squarings. The built-in pow runs in C, so its count is not visible.")
+    return lines
+
+# ========== Narrated Engines ==========
+
+def left_to_right_lines(a, n, m, max_steps=DEFAULT_MAX_STEPS):
+    """Left-to-right binary narration for a^n mod m; returns (result, lines)"""
+    base = a % m
+    bits = bin(n)[2:]
+    lines = [f"Leading bit: result = a mod m = {abbreviate(base)}", ""]
+    result = base
+    skipped = step_window(len(bits) - 1, max_steps)
+    for i, bit in enumerate(bits[1:]):
+        old_result = result
+        result = result * result % m
+        if bit == '1':
+            squared = result
+            result = result * base % m
+        if skipped is not None and i in skipped:
+            if i == skipped.start:
+                ones = bits[1:][skipped.start:skipped.stop].count('1')
+                lines.extend([_omitted_line(skipped, len(skipped), ones), "", "─" * 55, ""])
+            continue
+        lines.append(f"Step {i + 1}: bit {len(bits) - 2 - i} = {bit}")
+        if bit == '1':
+            lines.append(f"  result = {abbreviate(old_result)}² mod {abbreviate(m)} = {abbreviate(squared)}")
+            lines.append(f"  result = {abbreviate(squared)} × {abbreviate(base)} mod {abbreviate(m)} = {abbreviate(result)}")
+        else:
+            lines.append(f"  result = {abbreviate(old_result)}² mod {abbreviate(m)} = {abbreviate(result)}")
+        lines.append("")
+    return result, lines
+
+def sliding_window_lines(a, n, m, max_steps=DEFAULT_MAX_STEPS):
+    """Sliding-window narration for a^n mod m; returns (result, lines)"""
+    base = a % m
+    k = window_size(n.bit_length())
+    table, _ = _odd_powers(base, m, k)
+    lines = [f"Window size k = {k} (chosen for a {n.bit_length()}-bit exponent)", ""]
+    lines.append(f"Precompute odd powers a^1 … a^{(1 << k) - 1} mod {abbreviate(m)}:")
+    odd = sorted(table)
+    skipped = step_window(len(odd), max_steps)
+    for i, power in enumerate(odd):
+        if skipped is not None and i in skipped:
+            if i == skipped.start:
+                lines.append(f"  ⋯ {len(skipped)} more table entries ⋯")
+            continue
+        lines.append(f"  a^{power} = {abbreviate(table[power])}")
+    lines.append("")
+    
+    windows = list(_windows(n, k))
+    skipped = step_window(len(windows), max_steps)
+    result = None
+    for i, (zeros, window, value) in enumerate(windows):
+        old_result = result
+        if result is not None:
+            for _ in range(zeros + len(window)):
+                result = result * result % m
+        if value:
+            result = table[value] if result is None else result * table[value] % m
+        if skipped is not None and i in skipped:
+            if i == skipped.start:
+                squarings = sum(z + len(w) for z, w, _ in windows[skipped.start:skipped.stop])
+                lines.extend([f"  ⋯ Windows {skipped.start + 1}–{skipped.stop}: {len(skipped)} windows not shown "
+                              f"({squarings} squarings, {len(skipped)} multiplications) ⋯", ""])
+            continue
+        if old_result is None:
+            lines.append(f"Window {i + 1}: bits {window} = {value} → result = a^{value} = {abbreviate(result)}")
+        elif value:
+            lines.append(f"Window {i + 1}: {zeros} zero bit(s), then bits {window} = {value}")
+            lines.append(f"  square {zeros + len(window)}×, multiply by a^{value} → result = {abbreviate(result)}")
+        else:
+            lines.append(f"Trailing {zeros} zero bit(s): square {zeros}× → result = {abbreviate(result)}")
+        lines.append("")
+    return result, lines
+
+def montgomery_ladder_lines(a, n, m, max_steps=DEFAULT_MAX_STEPS):
+    """Montgomery ladder narration for a^n mod m; returns (result, lines)"""
+    r0 = a % m
+    r1 = r0 * r0 % m
+    bits = bin(n)[2:]
+    lines = [f"Leading bit: R0 = a mod m = {abbreviate(r0)}, R1 = R0² mod m = {abbreviate(r1)}",
+             "Invariant: R1 = R0 × a", ""]
+    skipped = step_window(len(bits) - 1, max_steps)
+    for i, bit in enumerate(bits[1:]):
+        if bit == '1':
+            r0, r1 = r0 * r1 % m, r1 * r1 % m
+        else:
+            r0, r1 = r0 * r0 % m, r0 * r1 % m
+        if skipped is not None and i in skipped:
+            if i == skipped.start:
+                lines.extend([_omitted_line(skipped, len(skipped), len(skipped)), "", "─" * 55, ""])
+            continue
+        lines.append(f"Step {i + 1}: bit {len(bits) - 2 - i} = {bit}")
+        if bit == '1':
+            lines.append(f"  R0 = R0 × R1 = {abbreviate(r0)},  R1 = R1² = {abbreviate(r1)}")
+        else:
+            lines.append(f"  R0 = R0² = {abbreviate(r0)},  R1 = R0 × R1 = {abbreviate(r1)}")
+        lines.append("")
+    return r0, lines
+
+# name -> (section title, algorithm description lines, narration)
+NARRATED_ENGINES = {
+    'left_to_right': ("Left-to-Right Binary Steps", [
+        "  1. Start with result = a mod m (the leading bit of n)",
+        "  2. For each following bit of n (left to right):",
+        "     - Square: result = result² mod m",
+        "     - If bit == 1: result = (result × a) mod m",
+    ], left_to_right_lines),
+    'sliding_window': ("Sliding Window Steps", [
+        "  1. Precompute the odd powers a^1, a^3, …, a^(2^k - 1) mod m",
+        "  2. Scan n left to right in windows of up to k bits that start and end with a 1",
+        "  3. For each window: square once per bit, then multiply by a^(window value)",
+    ], sliding_window_lines),
+    'montgomery_ladder': ("Montgomery Ladder Steps", [
+        "  1. Start with R0 = a mod m, R1 = a² mod m (the leading bit of n)",
+        "  2. For each following bit of n (left to right):",
+        "     - bit == 1: R0 = R0 × R1, R1 = R1²",
+        "     - bit == 0: R1 = R0 × R1, R0 = R0²",
+        "  3. The same two operations run for every bit (no timing leak)",
+    ], montgomery_ladder_lines),
+}
+
+def mod_exp_sections(a, n, m, max_steps=DEFAULT_MAX_STEPS, algorithm='right_to_left', compare=False):
+    """Modular Exponentiation using repeated squaring, yielding each explanation section as soon as it is built"""
     # Section 1: Input Parameters
     input_content = f"""Given:
-  Base a = {a}
-  Exponent n = {n}
-  Modulus m = {m}
+  Base a = {abbreviate(a)}
+  Exponent n = {abbreviate(n)}
+  Modulus m = {abbreviate(m)}
 
-Goal: Compute {a}^{n} mod {m}
+Goal: Compute {abbreviate(a)}^{abbreviate(n)} mod {abbreviate(m)}
 
 Method: Fast Exponentiation (Square-and-Multiply / Repeated Squaring)"""
     
-    all_sections.append({
+    yield {
         "section": "Input Parameters",
         "subsections": [{"title": "Given Values", "content": input_content}]
-    })
+    }
     
     # Section 2: Binary Expansion
     binary = bin(n)[2:]  # Remove '0b' prefix
+    skipped = step_window(len(binary), max_steps)
     bin_lines = []
     bin_lines.append("═" * 55)
     bin_lines.append("BINARY EXPANSION OF EXPONENT")
     bin_lines.append("═" * 55)
     bin_lines.append("")
-    bin_lines.append(f"n = {n}")
-    bin_lines.append(f"n in binary = {binary}")
+    bin_lines.append(f"n = {abbreviate(n)}")
+    bin_lines.append(f"n in binary = {abbreviate(binary, keep=32, unit='bits')}")
     bin_lines.append("")
     bin_lines.append("Binary digits (right to left):")
     bin_lines.append("")
     
     # Show binary breakdown
-    power_of_2 = 1
     for i, bit in enumerate(reversed(binary)):
+        if skipped is not None and i in skipped:
+            if i == skipped.start:
+                bin_lines.append(f"  ⋯ Positions {skipped.start}–{skipped.stop - 1} not shown ⋯")
+            continue
         if bit == '1':
-            bin_lines.append(f"  Position {i}: 2^{i} = {power_of_2} ✓ (bit = 1)")
+            bin_lines.append(f"  Position {i}: 2^{i} = {abbreviate(2**i)} ✓ (bit = 1)")
         else:
-            bin_lines.append(f"  Position {i}: 2^{i} = {power_of_2} ✗ (bit = 0)")
-        power_of_2 *= 2
+            bin_lines.append(f"  Position {i}: 2^{i} = {abbreviate(2**i)} ✗ (bit = 0)")
     
     bin_lines.append("")
     bin_lines.append(f"Number of bits: {len(binary)}")
     bin_lines.append(f"Number of 1-bits: {binary.count('1')}")
     
-    all_sections.append({
+    yield {
         "section": "Binary Expansion",
-        "subsections": [{"title": f"n = {binary} (binary)", "content": '\n'.join(bin_lines)}]
-    })
-    
-    # Section 3: Repeated Squaring Algorithm
-    sq_lines = []
-    sq_lines.append("═" * 55)
-    sq_lines.append("REPEATED SQUARING ALGORITHM")
-    sq_lines.append("═" * 55)
-    sq_lines.append("")
-    sq_lines.append("Algorithm:")
-    sq_lines.append("  1. Start with result = 1, base = a mod m")
-    sq_lines.append("  2. For each bit of n (right to left):")
-    sq_lines.append("     - If bit == 1: result = (result × base) mod m")
-    sq_lines.append("     - Square the base: base = (base × base) mod m")
-    sq_lines.append("")
-    sq_lines.append("─" * 55)
-    sq_lines.append("")
-    
-    result = 1
-    base = a % m
-    bit_position = 0
-    
-    sq_lines.append(f"Initial: result = 1, base = {a} mod {m} = {base}")
-    sq_lines.append("")
+        "subsections": [{"title": f"n = {abbreviate(binary, keep=32, unit='bits')} (binary)",
+                         "content": '\n'.join(bin_lines)}]
+    }
     
-    temp_n = n
-    while temp_n > 0:
-        bit = temp_n & 1
-        sq_lines.append(f"Step {bit_position + 1}: Processing bit {bit_position}")
-        sq_lines.append(f"  Current bit = {bit}")
-        sq_lines.append(f"  Binary position = 2^{bit_position} = {2**bit_position}")
-        sq_lines.append("")
-        
-        if bit == 1:
-            old_result = result
-            result = (result * base) % m
-            sq_lines.append(f"  Bit = 1, so multiply:")
-            sq_lines.append(f"    result = result × base mod {m}")
-            sq_lines.append(f"    result = {old_result} × {base} mod {m}")
-            sq_lines.append(f"    result = {old_result * base} mod {m}")
-            sq_lines.append(f"    result = {result}")
-        else:
-            sq_lines.append(f"  Bit = 0, so skip multiplication")
-            sq_lines.append(f"    result = {result} (unchanged)")
-        
+    # Section 3: Exponentiation steps with the selected algorithm
+    if algorithm == 'right_to_left':
+        sq_lines = []
+        sq_lines.append("═" * 55)
+        sq_lines.append("REPEATED SQUARING ALGORITHM")
+        sq_lines.append("═" * 55)
         sq_lines.append("")
-        
-        old_base = base
-        base = (base * base) % m
-        sq_lines.append(f"  Square the base for next iteration:")
-        sq_lines.append(f"    base = base × base mod {m}")
-        sq_lines.append(f"    base = {old_base} × {old_base} mod {m}")
-        sq_lines.append(f"    base = {old_base * old_base} mod {m}")
-        sq_lines.append(f"    base = {base}")
+        sq_lines.append("Algorithm:")
+        sq_lines.append("  1. Start with result = 1, base = a mod m")
+        sq_lines.append("  2. For each bit of n (right to left):")
+        sq_lines.append("     - If bit == 1: result = (result × base) mod m")
+        sq_lines.append("     - Square the base: base = (base × base) mod m")
         sq_lines.append("")
         sq_lines.append("─" * 55)
         sq_lines.append("")
         
-        temp_n >>= 1
-        bit_position += 1
+        result, steps = square_and_multiply_lines(a, n, m, max_steps)
+        sq_lines.extend(steps)
+        
+        yield {
+            "section": "Repeated Squaring Steps",
+            "subsections": [{"title": "Square-and-Multiply Algorithm", "content": '\n'.join(sq_lines)}]
+        }
+    else:
+        title, description, narrate = NARRATED_ENGINES[algorithm]
+        label = ENGINES[algorithm][0]
+        alg_lines = ["═" * 55, label.upper(), "═" * 55, "", "Algorithm:", *description, "", "─" * 55, ""]
+        if n == 0:
+            result = 1
+            alg_lines.append("n = 0, so the result is 1 (no multiplications)")
+        else:
+            result, steps = narrate(a, n, m, max_steps)
+            alg_lines.extend(steps)
+        
+        yield {
+            "section": title,
+            "subsections": [{"title": label, "content": '\n'.join(alg_lines)}]
+        }
     
-    all_sections.append({
-        "section": "Repeated Squaring Steps",
-        "subsections": [{"title": "Square-and-Multiply Algorithm", "content": '\n'.join(sq_lines)}]
-    })
-    
-    # Section 4: Result
-    result_lines = []
-    result_lines.append("═" * 55)
-    result_lines.append("FINAL RESULT")
-    result_lines.append("═" * 55)
-    result_lines.append("")
-    result_lines.append(f"<b>★ {a}^{n} mod {m} = {result}</b>")
-    result_lines.append("")
-    result_lines.append(f"Computation Efficiency:")
-    result_lines.append(f"  - Without optimization: {n} multiplications")
-    result_lines.append(f"  - With repeated squaring: {len(binary)} squarings + {binary.count('1')} multiplications")
-    result_lines.append(f"  - Total operations: ~{len(binary) + binary.count('1')}")
-    result_lines.append("")
-    result_lines.append("═" * 55)
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Answer", "content": '\n'.join(result_lines)}]
-    })
-    
-    return {
+    response = {
         "success": True,
-        "result": result,
-        "sections": all_sections
+        "result": result
     }
+    
+    # Section 4: Algorithm comparison
+    if compare:
+        response["comparison"] = compare_engines(a, n, m)
+        yield {
+            "section": "Algorithm Comparison",
+            "subsections": [{"title": "Multiplications and Wall Time", "content": '\n'.join(
+                _comparison_lines(response["comparison"]))}]
+        }
+    
+    # Section 5: Result
+    yield final_result_section(_summary_lines(a, n, m, result, algorithm,
+                                              _engine_mults(algorithm, n, response.get("comparison"))),
+                               title="Answer")
+    
+    return response
+
+
+def mod_exp_detailed(a, n, m, verbosity='full', max_steps=DEFAULT_MAX_STEPS, algorithm='right_to_left',
+                     compare=False):
+    """Modular Exponentiation using repeated squaring with detailed steps
+    max_steps: bits narrated in full at each end of the squaring loop
+    algorithm: engine narrated in full mode (see ENGINES); other levels use FASTEST_ENGINE
+    compare: run every engine and report its multiplication count and wall time
+    """
+    if verbosity != 'full':
+        result, _ = ENGINES[FASTEST_ENGINE][1](a, n, m)
+        response = {"success": True, "result": result}
+        if compare:
+            response["comparison"] = compare_engines(a, n, m)
+        if verbosity == 'summary':
+            response["sections"] = [final_result_section(_summary_lines(
+                a, n, m, result, algorithm, _engine_mults(algorithm, n, response.get("comparison"))), title="Answer")]
+        return response
+    
+    return collect_sections(mod_exp_sections(a, n, m, max_steps, algorithm, compare))
 
 
 class handler(BaseHTTPRequestHandler):
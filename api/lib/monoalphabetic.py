@@ -1,12 +1,14 @@
 from http.server import BaseHTTPRequestHandler
+import functools
 import json
 import math
 
-def gcd(a, b):
-    """Greatest Common Divisor"""
-    while b:
-        a, b = b, a % b
-    return a
+from narration import final_result_section
+from numtheory import gcd, modinv
+
+# Multiplicative inverses mod 26 (None where gcd(a, 26) ≠ 1), and compiled keys per (mode, a, b, k)
+INVERSES_26 = tuple(modinv(a, 26) for a in range(26))
+KEY_CACHE_SIZE = 256
 
 def brute_force_inverse_detailed(a, m):
     """Find modular inverse using brute force (trial method)"""
@@ -169,8 +171,123 @@ def extended_euclidean_detailed(a, m):
     
     return inverse, '\n'.join(lines)
 
-def monoalphabetic_cipher_detailed(plaintext, mode, key_k=None, key_a=None, key_b=None, operation='encrypt'):
-    """Monoalphabetic cipher with detailed steps for all modes"""
+def affine_coefficients(mode, key_k, key_a, key_b, operation):
+    """
+    (multiplier, offset) so that every mode/operation is y = (multiplier × x + offset) mod 26.
+    Returns None when the multiplicative key has no inverse mod 26.
+    """
+    if mode == 'additive':
+        return (1, key_k) if operation == 'encrypt' else (1, -key_k)
+    mult = key_k if mode == 'multiplicative' else key_a
+    add = 0 if mode == 'multiplicative' else key_b
+    inv = INVERSES_26[mult % 26]
+    if inv is None:
+        return None
+    if operation == 'encrypt':
+        return mult, add
+    return inv, -inv * add
+
+
+class LetterTable(dict):
+    """str.translate table for y = (multiplier × x + offset) mod 26: letters map to uppercase,
+    anything else to None (dropped). The 256 Latin-1 code points are filled in up front; other
+    characters are computed on each use and not stored, so cached keys stay bounded."""
+
+    def __init__(self, multiplier, offset):
+        super().__init__()
+        self.multiplier = multiplier % 26
+        self.offset = offset % 26
+        for code in range(256):
+            self[code] = self._map(code)
+
+    def _map(self, code):
+        char = chr(code)
+        if not char.isalpha():
+            return None
+        return chr((self.multiplier * (ord(char.lower()) - ord('a')) + self.offset) % 26 + ord('A'))
+
+    def __missing__(self, code):
+        return self._map(code)
+
+
+class AffineKey:
+    """A compiled additive/multiplicative/affine key: translate tables for y = (a × x + b) mod 26
+    and its inverse, so a whole text is encrypted or decrypted by one str.translate"""
+
+    def __init__(self, multiplier, offset):
+        self.multiplier = multiplier % 26
+        self.offset = offset % 26
+        self.inverse = INVERSES_26[self.multiplier]
+        self.encrypt_table = LetterTable(self.multiplier, self.offset)
+        self.decrypt_table = LetterTable(self.inverse, -self.inverse * self.offset)
+
+    def encrypt(self, text):
+        return text.translate(self.encrypt_table)
+
+    def decrypt(self, text):
+        return text.translate(self.decrypt_table)
+
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def compile_key(mode, key_a, key_b, key_k):
+    """AffineKey of a mode's key (additive: k, multiplicative: k, affine: a and b);
+    None when the multiplier has no inverse mod 26"""
+    coefficients = affine_coefficients(mode, key_k, key_a, key_b, 'encrypt')
+    if coefficients is None:
+        return None
+    return AffineKey(*coefficients)
+
+
+def monoalphabetic_transform(text, multiplier, offset):
+    """Apply y = (multiplier × x + offset) mod 26 to every letter; non-letters are dropped"""
+    return text.translate(LetterTable(multiplier, offset))
+
+
+def _summary_lines(plaintext, mode, operation, key_k, key_a, key_b, key_inv, output):
+    """Lines of the "Final Result" section"""
+    lines = [
+        f"MONOALPHABETIC CIPHER ({mode.upper()}) COMPLETE",
+        "",
+        f"Input:     \"{plaintext}\"",
+        f"Operation: {operation.upper()}",
+    ]
+    if mode == 'additive':
+        lines.append(f"Key (k):   {key_k}")
+    elif mode == 'multiplicative':
+        lines.append(f"Key (k):   {key_k}")
+        if operation == 'decrypt':
+            lines.append(f"Key⁻¹:     {key_inv}")
+    else:
+        lines.append(f"Key (a):   {key_a}")
+        lines.append(f"Key (b):   {key_b}")
+        if operation == 'decrypt':
+            lines.append(f"a⁻¹:       {key_inv}")
+    lines.append("")
+    lines.append(f"★ OUTPUT: \"{output}\"")
+    return lines
+
+
+def monoalphabetic_cipher_detailed(plaintext, mode, key_k=None, key_a=None, key_b=None, operation='encrypt',
+                                   verbosity='full', schedule=None):
+    """Monoalphabetic cipher with detailed steps for all modes.
+    schedule: compile_key(mode, key_a, key_b, key_k), when already built (used by non-full verbosity)"""
+    if verbosity != 'full':
+        key = schedule or compile_key(mode, key_a, key_b, key_k)
+        if key is None:
+            if mode == 'multiplicative':
+                error = f"Key {key_k} is not coprime with 26. Valid keys: 1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25"
+            else:
+                error = f"Key 'a' ({key_a}) is not coprime with 26"
+            return {"success": False, "error": error}
+        output = key.encrypt(plaintext) if operation == 'encrypt' else key.decrypt(plaintext)
+        result = {"success": True, "plaintext": plaintext, "mode": mode,
+                  "operation": operation, "result": output}
+        if verbosity == 'summary':
+            key_inv = key.inverse if operation == 'decrypt' and mode != 'additive' else None
+            result["sections"] = [final_result_section(
+                _summary_lines(plaintext, mode, operation, key_k, key_a, key_b, key_inv, output))]
+        return result
+    
     all_sections = []
     
     # Section 1: Input Parameters
@@ -295,10 +412,14 @@ def monoalphabetic_cipher_detailed(plaintext, mode, key_k=None, key_a=None, key_
     # Section 4: Find Inverse (if needed for decryption)
     key_inv = None
     if operation == 'decrypt' and mode in ['multiplicative', 'affine']:
-        inv_key = key_k if mode == 'multiplicative' else key_a
+        raw_key = key_k if mode == 'multiplicative' else key_a
+        # Both searches work on the residue in 0..25 (a key outside that range has the same inverse)
+        inv_key = raw_key % 26
         
         # Method 1: Brute Force
         inv_brute, brute_steps = brute_force_inverse_detailed(inv_key, 26)
+        if raw_key != inv_key:
+            brute_steps = f"Reducing the key first: {raw_key} mod 26 = {inv_key}\n\n{brute_steps}"
         all_sections.append({
             "section": "Finding Inverse - Method 1: Brute Force (Trial)",
             "subsections": [{"title": f"Finding {inv_key}⁻¹ mod 26", "content": brute_steps}]
@@ -410,29 +531,8 @@ def monoalphabetic_cipher_detailed(plaintext, mode, key_k=None, key_a=None, key_
     })
     
     # Section 6: Final Result
-    result_lines = []
-    result_lines.append(f"MONOALPHABETIC CIPHER ({mode.upper()}) COMPLETE")
-    result_lines.append("")
-    result_lines.append(f"Input:     \"{plaintext}\"")
-    result_lines.append(f"Operation: {operation.upper()}")
-    if mode == 'additive':
-        result_lines.append(f"Key (k):   {key_k}")
-    elif mode == 'multiplicative':
-        result_lines.append(f"Key (k):   {key_k}")
-        if operation == 'decrypt':
-            result_lines.append(f"Key⁻¹:     {key_inv}")
-    else:
-        result_lines.append(f"Key (a):   {key_a}")
-        result_lines.append(f"Key (b):   {key_b}")
-        if operation == 'decrypt':
-            result_lines.append(f"a⁻¹:       {key_inv}")
-    result_lines.append("")
-    result_lines.append(f"★ OUTPUT: \"{result.upper()}\"")
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
-    })
+    all_sections.append(final_result_section(
+        _summary_lines(plaintext, mode, operation, key_k, key_a, key_b, key_inv, result.upper())))
     
     return {
         "success": True,
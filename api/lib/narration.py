@@ -0,0 +1,66 @@
+"""
+Narration levels shared by every cipher/operation module.
+
+  full    - every step-by-step section (default)
+  summary - computed values plus the "Final Result" section only
+  result  - computed values only; no explanation text is built at all
+
+With "stream": true a request is answered as NDJSON: one line per section as soon
+as it is built, then a final line holding the result fields (without "sections").
+"""
+
+VERBOSITY_LEVELS = ('result', 'summary', 'full')
+DEFAULT_VERBOSITY = 'full'
+
+# Step-by-step loops narrate this many steps at each end and summarize the middle
+DEFAULT_MAX_STEPS = 16
+
+
+def final_result_section(lines, title="Summary"):
+    """Build the closing "Final Result" section from its text lines"""
+    return {
+        "section": "Final Result",
+        "subsections": [{"title": title, "content": '\n'.join(lines)}]
+    }
+
+
+def abbreviate(value, keep=12, unit="digits"):
+    """Text of an integer (or digit string), shortened to its leading/trailing digits when long:
+    1234567890…0987654321 (617 digits)"""
+    if isinstance(value, int) and abs(value) >= 10 ** (2 * keep + 1):
+        # Slice the digits arithmetically: str() of a huge int is quadratic (and capped at 4300 digits)
+        magnitude = abs(value)
+        count = int((magnitude.bit_length() - 1) * 0.30102999566398120) + 1
+        if magnitude >= 10 ** count:
+            count += 1
+        head = magnitude // 10 ** (count - keep)
+        tail = str(magnitude % 10 ** keep).zfill(keep)
+        return f"{'-' if value < 0 else ''}{head}…{tail} ({count} {unit})"
+    digits = value if isinstance(value, str) else str(value)
+    if len(digits) <= 2 * keep + 1:
+        return digits
+    return f"{digits[:keep]}…{digits[-keep:]} ({len(digits)} {unit})"
+
+
+def step_window(total, max_steps):
+    """Steps left out when narrating `total` loop steps with the first and last
+    `max_steps` in full: a range of step indices, or None when all are shown"""
+    if total <= 2 * max_steps:
+        return None
+    return range(max_steps, total - max_steps)
+
+
+def collect_sections(sections):
+    """Run a section generator to the end; returns its result dict with "sections" attached.
+
+    Generators yield section dicts as they are built and `return` the result fields,
+    so the same code serves both the buffered JSON response and NDJSON streaming.
+    """
+    collected = []
+    while True:
+        try:
+            collected.append(next(sections))
+        except StopIteration as stop:
+            result = stop.value
+            result["sections"] = collected
+            return result
@@ -0,0 +1,392 @@
+"""
+Iterative number-theory core shared by the cipher and math modules (RSA, Hill,
+monoalphabetic, extended Euclidean) and the dev server.
+
+Nothing here recurses, so RSA-sized operands (2048/4096-bit) cost no stack depth.
+egcd switches from the textbook Euclidean loop to Lehmer's algorithm once the
+operands are large enough for it to pay off (see benchmarks/bench_numtheory.py).
+Primality is Miller–Rabin: deterministic below 3.3 × 10²⁴, probabilistic above.
+Factorization is wheel trial division, then Pollard rho (Brent) under a time budget.
+Matrices over Z/26 (Hill keys) are eliminated over GF(2) and GF(13) separately in
+O(n³) and recombined entrywise by CRT, instead of cofactor expansion's O(n!).
+"""
+
+import math
+import random
+import secrets
+import time
+
+# Leading bits Lehmer's algorithm simulates per round (one CPython int digit)
+LEHMER_DIGIT = 30
+# Below this many bits the plain Euclidean loop is faster than Lehmer's
+LEHMER_THRESHOLD = 1536
+
+
+def gcd(a, b):
+    """Greatest common divisor (CPython's math.gcd already uses Lehmer's algorithm in C)"""
+    return math.gcd(a, b)
+
+
+def binary_gcd(a, b):
+    """Stein's binary GCD: shifts and subtractions only, no division"""
+    a, b = abs(a), abs(b)
+    if a == 0 or b == 0:
+        return a | b
+    shift = ((a | b) & -(a | b)).bit_length() - 1
+    a >>= (a & -a).bit_length() - 1
+    while b:
+        b >>= (b & -b).bit_length() - 1
+        if a > b:
+            a, b = b, a
+        b -= a
+    return a << shift
+
+
+def euclid_egcd(a, b):
+    """Iterative extended Euclid for a, b ≥ 0; returns (g, x, y) with a×x + b×y = g"""
+    x0, x1 = 1, 0
+    y0, y1 = 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+        y0, y1 = y1, y0 - q * y1
+    return a, x0, y0
+
+
+def lehmer_egcd(a, b):
+    """Extended Euclid for a, b ≥ 0 by Lehmer's algorithm (Knuth, TAOCP 4.5.2 Algorithm L).
+
+    Each round runs Euclid on the leading LEHMER_DIGIT bits with small integers and
+    applies the accumulated quotients to the full operands in one 2×2 step. Only
+    quotients guaranteed to match the full-precision ones are applied, so the result,
+    including the Bézout coefficients, is identical to euclid_egcd's.
+    """
+    swapped = a < b
+    if swapped:
+        a, b = b, a
+    a0, b0 = a, b
+    x0, x1 = 1, 0
+    while b.bit_length() > LEHMER_DIGIT:
+        shift = a.bit_length() - LEHMER_DIGIT
+        ah, bh = a >> shift, b >> shift
+        A, B, C, D = 1, 0, 0, 1
+        while bh + C and bh + D:
+            q = (ah + A) // (bh + C)
+            if q != (ah + B) // (bh + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            ah, bh = bh, ah - q * bh
+        if B == 0:
+            q, r = divmod(a, b)
+            a, b = b, r
+            x0, x1 = x1, x0 - q * x1
+        else:
+            a, b = A * a + B * b, C * a + D * b
+            x0, x1 = A * x0 + B * x1, C * x0 + D * x1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q * x1
+    y0 = (a - a0 * x0) // b0 if b0 else 0
+    return (a, y0, x0) if swapped else (a, x0, y0)
+
+
+def egcd(a, b):
+    """(g, x, y) with a×x + b×y = g = gcd(a, b), for a, b ≥ 0"""
+    if max(a, b).bit_length() < LEHMER_THRESHOLD:
+        return euclid_egcd(a, b)
+    return lehmer_egcd(a, b)
+
+
+def modinv(a, m):
+    """Inverse of a modulo m, or None when gcd(a, m) ≠ 1 (pow's C loop beats egcd here)"""
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        return None
+
+
+def crt(residues, moduli):
+    """Combine x ≡ rᵢ (mod mᵢ) into (x, lcm of the mᵢ); None when the congruences conflict.
+    Moduli need not be pairwise coprime."""
+    x, m = 0, 1
+    for r, n in zip(residues, moduli):
+        g, p, _ = egcd(m, n)
+        if (r - x) % g:
+            return None
+        lcm = m // g * n
+        x = (x + (r - x) // g * p % (n // g) * m) % lcm
+        m = lcm
+    return x, m
+
+
+# ========== Primality ==========
+
+SMALL_PRIMES = [p for p in range(2, 1000) if all(p % d for d in range(2, math.isqrt(p) + 1))]
+_SMALL_PRODUCT = math.prod(SMALL_PRIMES)
+
+# The first 13 prime bases make Miller–Rabin exact for every n below this bound
+MR_BASES = tuple(SMALL_PRIMES[:13])
+MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+
+def miller_rabin(n, bases):
+    """True when odd n > 2 is a strong probable prime to every base"""
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a % n, d, n)
+        if x in (0, 1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n, rounds=40):
+    """Miller–Rabin primality test after trial division by the primes below 1000.
+    Exact below MR_DETERMINISTIC_LIMIT; above it, `rounds` random bases (error ≤ 4⁻ʳᵒᵘⁿᵈˢ)."""
+    if n < 2:
+        return False
+    if n < 1000:
+        return n in SMALL_PRIMES
+    if math.gcd(n, _SMALL_PRODUCT) != 1:
+        return False
+    if n < MR_DETERMINISTIC_LIMIT:
+        return miller_rabin(n, MR_BASES)
+    return miller_rabin(n, [2 + secrets.randbelow(n - 3) for _ in range(rounds)])
+
+
+def prime_rounds(bits):
+    """Miller–Rabin rounds for a random `bits`-bit candidate (FIPS 186-4, table C.2, error < 2⁻¹⁰⁰)"""
+    if bits >= 1536:
+        return 3
+    if bits >= 1024:
+        return 4
+    if bits >= 512:
+        return 7
+    return 40
+
+
+def random_prime(bits, accept=None):
+    """Random prime with exactly `bits` bits and its top two bits set, so the product of
+    two of them has exactly 2×bits bits. `accept(candidate)` can reject candidates early.
+    Returns (prime, candidates tested)."""
+    rounds = prime_rounds(bits)
+    tested = 0
+    while True:
+        candidate = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        tested += 1
+        if accept is not None and not accept(candidate):
+            continue
+        if is_prime(candidate, rounds):
+            return candidate, tested
+
+
+# ========== Factorization ==========
+
+# Trial division bound; the rest is split by Pollard rho
+WHEEL_LIMIT = 10000
+# Seconds factorize may spend before giving up on a cofactor
+FACTOR_TIME_BUDGET = 2.0
+FACTOR_CACHE_SIZE = 256
+
+_WHEEL_STEPS = (4, 2, 4, 2, 4, 6, 2, 6)  # gaps between numbers coprime to 30, from 7
+_factor_cache = {}  # n -> factors of every completed factorization, oldest first
+
+
+def _wheel_divide(n, factors):
+    """Strip prime factors below WHEEL_LIMIT from n into `factors`; returns the cofactor"""
+    for p in (2, 3, 5):
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    p, i = 7, 0
+    while p < WHEEL_LIMIT and p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += _WHEEL_STEPS[i]
+        i = (i + 1) % 8
+    if 1 < n < WHEEL_LIMIT * WHEEL_LIMIT:
+        factors[n] = factors.get(n, 0) + 1
+        n = 1
+    return n
+
+
+def pollard_brent(n, deadline=None, rng=random):
+    """A nontrivial factor of odd composite n by Pollard rho with Brent's cycle detection
+    and batched gcds; None once `deadline` (a time.perf_counter value) passes"""
+    while True:
+        y, c, batch = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+                if deadline is not None and time.perf_counter() > deadline:
+                    return None
+            r *= 2
+        if g == n:
+            # The batch overshot: redo it one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factorize(n, time_budget=FACTOR_TIME_BUDGET):
+    """Prime factorization of n ≥ 1 as ({prime: exponent} in ascending order, unfactored cofactor).
+    The cofactor is 1 unless the time budget ran out; only complete results are cached."""
+    if n in _factor_cache:
+        return dict(_factor_cache[n]), 1
+    factors = {}
+    rest = 1
+    deadline = time.perf_counter() + time_budget
+    pending = [_wheel_divide(n, factors)]
+    while pending:
+        m = pending.pop()
+        if m == 1:
+            continue
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        root = math.isqrt(m)
+        if root * root == m:
+            pending += [root, root]
+            continue
+        d = pollard_brent(m, deadline)
+        if d is None:
+            rest *= m
+            continue
+        pending += [d, m // d]
+    factors = dict(sorted(factors.items()))
+    if rest == 1:
+        if len(_factor_cache) >= FACTOR_CACHE_SIZE:
+            del _factor_cache[next(iter(_factor_cache))]
+        _factor_cache[n] = factors
+    return dict(factors), rest
+
+
+def totient(n, time_budget=FACTOR_TIME_BUDGET):
+    """Euler's φ(n) from the factorization of n; None when n cannot be factored in time"""
+    factors, rest = factorize(n, time_budget)
+    if rest != 1:
+        return None
+    result = n
+    for p in factors:
+        result -= result // p
+    return result
+
+
+# ========== Matrices over Z/m ==========
+
+def eliminate_mod_p(matrix, p):
+    """Gauss–Jordan elimination over GF(p) in O(n³): (det mod p, inverse mod p or None)"""
+    n = len(matrix)
+    rows = [[x % p for x in row] + [int(i == j) for j in range(n)] for i, row in enumerate(matrix)]
+    det = 1
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if rows[r][col]), None)
+        if pivot is None:
+            return 0, None
+        if pivot != col:
+            rows[col], rows[pivot] = rows[pivot], rows[col]
+            det = -det
+        det = det * rows[col][col] % p
+        scale = pow(rows[col][col], -1, p)
+        pivot_row = rows[col] = [x * scale % p for x in rows[col]]
+        for r in range(n):
+            factor = rows[r][col]
+            if r != col and factor:
+                rows[r] = [(x - factor * y) % p for x, y in zip(rows[r], pivot_row)]
+    return det % p, [row[n:] for row in rows]
+
+
+def modulus_primes(mod):
+    """Prime factors of a squarefree modulus (26 → (2, 13)); Z/mod is then a product of fields"""
+    factors, rest = factorize(mod)
+    if rest != 1 or any(e > 1 for e in factors.values()):
+        raise ValueError(f"Matrix modulus {mod} must be squarefree")
+    return tuple(factors)
+
+
+def crt_basis(primes):
+    """Idempotents eᵢ ≡ 1 (mod pᵢ), 0 (mod pⱼ): x = Σ rᵢ×eᵢ solves x ≡ rᵢ (mod pᵢ)"""
+    return [crt([int(i == j) for j in range(len(primes))], primes)[0] for i in range(len(primes))]
+
+
+def matrix_det_mod(matrix, mod=26):
+    """det(matrix) mod a squarefree modulus, by elimination modulo each prime factor and CRT"""
+    primes = modulus_primes(mod)
+    return crt([eliminate_mod_p(matrix, p)[0] for p in primes], primes)[0]
+
+
+def matrix_inverse_mod(matrix, mod=26):
+    """matrix⁻¹ mod a squarefree modulus in O(n³), or None when it is not invertible"""
+    primes = modulus_primes(mod)
+    parts = [eliminate_mod_p(matrix, p)[1] for p in primes]
+    if any(part is None for part in parts):
+        return None
+    basis = crt_basis(primes)
+    return [[sum(e * part[i][j] for e, part in zip(basis, parts)) % mod for j in range(len(matrix))]
+            for i in range(len(matrix))]
+
+
+def matrix_invertible_mod(matrix, mod=26):
+    """True when det(matrix) is a unit mod `mod`"""
+    return math.gcd(matrix_det_mod(matrix, mod), mod) == 1
+
+
+def solve_mod_p(a_rows, b_rows, p):
+    """Solve A·X = B over GF(p), A having n ≥ m rows of length m.
+    Returns (X, indices of the m rows of A used as pivots), or None when rank(A) < m.
+    Rows beyond the pivots are not checked for consistency; verify X against them."""
+    m = len(a_rows[0])
+    rows = [[x % p for x in a] + [x % p for x in b] for a, b in zip(a_rows, b_rows)]
+    order = list(range(len(rows)))
+    for col in range(m):
+        pivot = next((r for r in range(col, len(rows)) if rows[r][col]), None)
+        if pivot is None:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        order[col], order[pivot] = order[pivot], order[col]
+        scale = pow(rows[col][col], -1, p)
+        pivot_row = rows[col] = [x * scale % p for x in rows[col]]
+        for r in range(len(rows)):
+            factor = rows[r][col]
+            if r != col and factor:
+                rows[r] = [(x - factor * y) % p for x, y in zip(rows[r], pivot_row)]
+    return [row[m:] for row in rows[:m]], sorted(order[:m])
+
+
+def solve_mod(a_rows, b_rows, mod=26):
+    """Solve A·X = B mod a squarefree modulus: (X, {prime: pivot row indices}), or None
+    when A does not have full column rank modulo every prime factor"""
+    primes = modulus_primes(mod)
+    parts = [solve_mod_p(a_rows, b_rows, p) for p in primes]
+    if any(part is None for part in parts):
+        return None
+    basis = crt_basis(primes)
+    cols = len(b_rows[0])
+    X = [[sum(e * part[0][i][j] for e, part in zip(basis, parts)) % mod for j in range(cols)]
+         for i in range(len(a_rows[0]))]
+    return X, {p: part[1] for p, part in zip(primes, parts)}
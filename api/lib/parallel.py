@@ -0,0 +1,81 @@
+"""
+Process-pool helper for the CPU-bound key searches (Hill, Playfair, rail fence,
+columnar). Work is split into chunks and each chunk is handled by a module-level
+function, so it pickles by reference (loader registers lib modules in sys.modules).
+Serverless sandboxes often cannot start processes (no /dev/shm for semaphores, or
+fork is forbidden); the pool then degrades to running the chunks in-process.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+def worker_count(tasks=None):
+    """CPU cores available to this process, capped by the number of tasks"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    return max(1, min(cores, tasks or cores))
+
+
+def pool_map(fn, chunks, workers=None):
+    """[fn(chunk) for chunk in chunks], spread over a process pool when one is worth starting"""
+    chunks = list(chunks)
+    workers = workers or worker_count(len(chunks))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(fn, chunks))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+    return [fn(chunk) for chunk in chunks]
+
+
+def pool_as_completed(fn, tasks, workers=None):
+    """Yield fn(task) for every task as soon as it finishes (completion order, for progress streams).
+    If the pool breaks midway, the tasks not yet yielded run in-process."""
+    tasks = list(tasks)
+    workers = workers or worker_count(len(tasks))
+    pool = None
+    if workers > 1:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            futures = [pool.submit(fn, task) for task in tasks]
+        except (OSError, NotImplementedError):
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            pool = None
+    if pool is None:
+        for task in tasks:
+            yield fn(task)
+        return
+    pending = set(futures)
+    try:
+        with pool:
+            for future in as_completed(futures):
+                result = future.result()
+                pending.discard(future)
+                yield result
+    except BrokenProcessPool:
+        # A worker died (OOM, sandbox kill): keep what finished, run the rest in-process
+        for future, task in zip(futures, tasks):
+            if future in pending:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    yield future.result()
+                else:
+                    yield fn(task)
+
+
+def split(n, parts):
+    """Split range(n) into at most `parts` contiguous (start, stop) ranges of near-equal size"""
+    parts = max(1, min(parts, n))
+    step, extra = divmod(n, parts)
+    bounds = []
+    start = 0
+    for i in range(parts):
+        stop = start + step + (i < extra)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
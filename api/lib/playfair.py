@@ -1,8 +1,176 @@
 from http.server import BaseHTTPRequestHandler
+import functools
 import json
+import math
+import operator
+import random
+import re
+import time
 
-def playfair_cipher_detailed(plaintext, keyword):
-    """Playfair cipher with detailed atomic steps"""
+try:
+    import numpy as np
+except ImportError:  # the key search scores candidates in pure Python
+    np = None
+
+import english
+from narration import collect_sections, final_result_section
+from parallel import pool_as_completed, worker_count
+
+# Compiled keys kept per process (least recently used evicted first)
+KEY_CACHE_SIZE = 256
+
+# The 25 letters of a key square as numbers (A=0), J left out
+SQUARE_LETTERS = [ord(ch) - 97 for ch in "abcdefghiklmnopqrstuvwxyz"]
+DEFAULT_ATTACK_SECONDS = 5
+DEFAULT_RESTARTS = 4
+# Starting annealing temperature per ciphertext letter (log₁₀ score units), with a floor
+ANNEAL_TEMPERATURE_PER_LETTER = 0.03
+ANNEAL_MIN_TEMPERATURE = 2.0
+
+def prepare_text(plaintext):
+    """Lowercase, keep letters, J → I, split repeated letters with 'x' and pad with 'z'"""
+    text = ''.join(ch for ch in plaintext.lower() if ch.isalpha()).replace('j', 'i')
+    prepared = []
+    i = 0
+    while i < len(text):
+        char1 = text[i]
+        char2 = text[i + 1] if i + 1 < len(text) else 'z'
+        if char1 == char2 and i + 1 < len(text):
+            prepared.append(char1 + 'x')
+            i += 1
+        else:
+            prepared.append(char1 + char2)
+            i += 2
+    return ''.join(prepared)
+
+def build_key_matrix(keyword):
+    """5×5 key matrix (list of rows) from the keyword, no narration"""
+    letters = []
+    for ch in ''.join(ch for ch in keyword.lower() if ch.isalpha()).replace('j', 'i') + "abcdefghiklmnopqrstuvwxyz":
+        if ch not in letters:
+            letters.append(ch)
+    return [letters[r*5:(r+1)*5] for r in range(5)]
+
+class PlayfairKey:
+    """A compiled key: the 5×5 matrix, a letter → (row, col) index (J shares I's cell) and the
+    full 625-entry digram → digram tables for encryption and decryption"""
+
+    def __init__(self, key_matrix):
+        self.matrix = key_matrix
+        self.index = {ch: (r, c) for r, row in enumerate(key_matrix) for c, ch in enumerate(row)}
+        if 'i' in self.index:
+            self.index.setdefault('j', self.index['i'])
+        cells = [ch for row in key_matrix for ch in row]
+        self.encrypt_table = {a + b: self._encrypt_digram(a, b) for a in cells for b in cells}
+        self.decrypt_table = {enc: dec for dec, enc in self.encrypt_table.items()}
+
+    def _encrypt_digram(self, a, b):
+        """Same row: letters to the right; same column: letters below; else swap columns"""
+        (r1, c1), (r2, c2) = self.index[a], self.index[b]
+        m = self.matrix
+        if r1 == r2:
+            return m[r1][(c1 + 1) % 5] + m[r2][(c2 + 1) % 5]
+        if c1 == c2:
+            return m[(r1 + 1) % 5][c1] + m[(r2 + 1) % 5][c2]
+        return m[r1][c2] + m[r2][c1]
+
+    def position(self, ch):
+        """(row, col) of a letter, or (None, None) when it is not in the matrix"""
+        return self.index.get(ch, (None, None))
+
+    def encrypt(self, prepared):
+        """Encrypt prepared (even-length, J-free) text: one table lookup per digram"""
+        return ''.join(map(self.encrypt_table.__getitem__, map(operator.add, prepared[0::2], prepared[1::2])))
+
+    def decrypt(self, ciphertext):
+        """Decrypt lowercase ciphertext of even length: one table lookup per digram"""
+        return ''.join(map(self.decrypt_table.__getitem__, map(operator.add, ciphertext[0::2], ciphertext[1::2])))
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile(keyword):
+    return PlayfairKey(build_key_matrix(keyword))
+
+def compile_key(keyword):
+    """Compiled key for a keyword, LRU-cached on its normalized letters"""
+    return _compile(''.join(ch for ch in keyword.lower() if ch.isalpha()).replace('j', 'i'))
+
+def key_schedule(keyword):
+    """Compiled key, built once per keyword and reusable across messages"""
+    return compile_key(keyword)
+
+def _key_matrix_section(keyword_ji):
+    """(key matrix, section narrating its construction from the cleaned, J-free keyword)"""
+    matrix_lines = ["Building 5x5 Playfair Matrix:"]
+    matrix_lines.append("")
+    matrix_lines.append("Process:")
+    matrix_lines.append("  1. Add unique letters from keyword (left to right)")
+    matrix_lines.append("  2. Fill remaining cells with unused alphabet letters")
+    matrix_lines.append("  3. Skip 'j' (combined with 'i')")
+    matrix_lines.append("")
+    
+    matrix = []
+    used = []
+    
+    matrix_lines.append("Adding keyword letters:")
+    for ch in keyword_ji:
+        if ch not in used and ch.isalpha():
+            used.append(ch)
+            matrix.append(ch)
+            matrix_lines.append(f"  + '{ch}' added at position {len(used)}")
+    
+    matrix_lines.append("")
+    matrix_lines.append("Adding remaining alphabet letters:")
+    for ch in "abcdefghiklmnopqrstuvwxyz":  # no 'j'
+        if ch not in used:
+            used.append(ch)
+            matrix.append(ch)
+            matrix_lines.append(f"  + '{ch}' added at position {len(used)}")
+    
+    # Form 5x5 matrix
+    key_matrix = []
+    for r in range(5):
+        row = matrix[r*5:(r+1)*5]
+        key_matrix.append(row)
+    
+    matrix_lines.append("")
+    matrix_lines.append("Final 5×5 Key Matrix:")
+    matrix_lines.append("     Col0  Col1  Col2  Col3  Col4")
+    for r, row in enumerate(key_matrix):
+        matrix_lines.append(f"Row{r}:  {row[0]}     {row[1]}     {row[2]}     {row[3]}     {row[4]}")
+    
+    return key_matrix, {
+        "section": "Generate 5×5 Key Matrix",
+        "subsections": [{"title": "Matrix Construction", "content": '\n'.join(matrix_lines)}]
+    }
+
+def _summary_lines(plaintext, keyword, prepared, ciphertext):
+    """Lines of the "Final Result" section"""
+    digrams = [prepared[k:k+2] for k in range(0, len(prepared), 2)]
+    return [
+        "PLAYFAIR CIPHER COMPLETE",
+        "",
+        f"Original Plaintext:  \"{plaintext}\"",
+        f"Keyword:             \"{keyword}\"",
+        f"Prepared Text:       \"{prepared}\"",
+        f"Digrams:             {' '.join(digrams)}",
+        "",
+        f"★ CIPHERTEXT: \"{ciphertext}\"",
+    ]
+
+def playfair_cipher_detailed(plaintext, keyword, verbosity='full', schedule=None):
+    """Playfair cipher with detailed atomic steps
+    schedule: key_schedule(keyword), when already computed (used by non-full verbosity)
+    """
+    if verbosity != 'full':
+        prepared = prepare_text(plaintext)
+        key = schedule or key_schedule(keyword)
+        ciphertext = key.encrypt(prepared).upper()
+        result = {"success": True, "plaintext": plaintext, "keyword": keyword, "prepared": prepared,
+                  "ciphertext": ciphertext, "matrix": key.matrix}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_summary_lines(plaintext, keyword, prepared, ciphertext))]
+        return result
+    
     all_sections = []
     
     # Section 1: Input Parameters
@@ -134,58 +302,10 @@ Letters I and J are combined (J → I)."""
     })
     
     # Section 6: Generate 5x5 Key Matrix
-    matrix_lines = ["Building 5x5 Playfair Matrix:"]
-    matrix_lines.append("")
-    matrix_lines.append("Process:")
-    matrix_lines.append("  1. Add unique letters from keyword (left to right)")
-    matrix_lines.append("  2. Fill remaining cells with unused alphabet letters")
-    matrix_lines.append("  3. Skip 'j' (combined with 'i')")
-    matrix_lines.append("")
-    
-    matrix = []
-    used = []
-    
-    matrix_lines.append("Adding keyword letters:")
-    for ch in keyword_ji:
-        if ch not in used and ch.isalpha():
-            used.append(ch)
-            matrix.append(ch)
-            matrix_lines.append(f"  + '{ch}' added at position {len(used)}")
-    
-    matrix_lines.append("")
-    matrix_lines.append("Adding remaining alphabet letters:")
-    for ch in "abcdefghiklmnopqrstuvwxyz":  # no 'j'
-        if ch not in used:
-            used.append(ch)
-            matrix.append(ch)
-            matrix_lines.append(f"  + '{ch}' added at position {len(used)}")
+    key_matrix, matrix_section = _key_matrix_section(keyword_ji)
+    all_sections.append(matrix_section)
     
-    # Form 5x5 matrix
-    key_matrix = []
-    for r in range(5):
-        row = matrix[r*5:(r+1)*5]
-        key_matrix.append(row)
-    
-    matrix_lines.append("")
-    matrix_lines.append("Final 5×5 Key Matrix:")
-    matrix_lines.append("     Col0  Col1  Col2  Col3  Col4")
-    for r, row in enumerate(key_matrix):
-        matrix_lines.append(f"Row{r}:  {row[0]}     {row[1]}     {row[2]}     {row[3]}     {row[4]}")
-    
-    all_sections.append({
-        "section": "Generate 5×5 Key Matrix",
-        "subsections": [{"title": "Matrix Construction", "content": '\n'.join(matrix_lines)}]
-    })
-    
-    # Helper function to find position
-    def find_pos(ch):
-        if ch == 'j':
-            ch = 'i'
-        for r in range(5):
-            for c in range(5):
-                if key_matrix[r][c] == ch:
-                    return r, c
-        return None, None
+    find_pos = compile_key(keyword).position
     
     # Section 7: Encryption with Rules
     enc_lines = ["Encrypting each digram using Playfair rules:"]
@@ -247,20 +367,7 @@ Letters I and J are combined (J → I)."""
     })
     
     # Section 8: Final Result
-    result_lines = []
-    result_lines.append("PLAYFAIR CIPHER COMPLETE")
-    result_lines.append("")
-    result_lines.append(f"Original Plaintext:  \"{plaintext}\"")
-    result_lines.append(f"Keyword:             \"{keyword}\"")
-    result_lines.append(f"Prepared Text:       \"{prepared}\"")
-    result_lines.append(f"Digrams:             {' '.join(digrams)}")
-    result_lines.append("")
-    result_lines.append(f"★ CIPHERTEXT: \"{ciphertext.upper()}\"")
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
-    })
+    all_sections.append(final_result_section(_summary_lines(plaintext, keyword, prepared, ciphertext.upper())))
     
     return {
         "success": True,
@@ -272,6 +379,368 @@ Letters I and J are combined (J → I)."""
         "sections": all_sections
     }
 
+def clean_ciphertext(ciphertext):
+    """Lowercase a–z letters of the ciphertext with J → I (spaces, digits and punctuation dropped)"""
+    return re.sub('[^a-z]', '', ciphertext.lower()).replace('j', 'i')
+
+def strip_fillers(decrypted):
+    """Drop the 'x' fillers encryption put between repeated letters ('balxloon' → 'balloon').
+    A filler is the second letter of a digram 'ax' followed by a digram starting with 'a'."""
+    fillers = [m.start() + 1 for m in re.finditer(r'(?=(.)x\1)', decrypted) if m.start() % 2 == 0]
+    bounds = zip([0] + [k + 1 for k in fillers], fillers + [len(decrypted)])
+    return ''.join(decrypted[start:stop] for start, stop in bounds)
+
+def _decrypt_summary_lines(ciphertext, keyword, decrypted, cleaned):
+    """Lines of the "Final Result" section for decryption"""
+    return [
+        "PLAYFAIR DECRYPTION COMPLETE",
+        "",
+        f"Ciphertext:          \"{ciphertext}\"",
+        f"Keyword:             \"{keyword}\"",
+        f"Decrypted Digrams:   {' '.join(re.findall('..', decrypted))}",
+        f"Fillers Removed:     \"{cleaned}\"",
+        "",
+        f"★ PLAINTEXT: \"{decrypted.upper()}\"",
+        "",
+        "Note: a trailing 'z' may be padding added to an odd-length message.",
+    ]
+
+def playfair_decrypt_detailed(ciphertext, keyword, verbosity='full', schedule=None):
+    """Playfair decryption with detailed atomic steps (the encryption rules run backwards)
+    schedule: key_schedule(keyword), when already computed (used by non-full verbosity)
+    """
+    letters = clean_ciphertext(ciphertext)
+    if verbosity != 'full':
+        key = schedule or key_schedule(keyword)
+        decrypted = key.decrypt(letters)
+        cleaned = strip_fillers(decrypted)
+        result = {"success": True, "mode": "decrypt", "ciphertext": ciphertext, "keyword": keyword,
+                  "plaintext": decrypted.upper(), "cleaned": cleaned.upper(), "matrix": key.matrix}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_decrypt_summary_lines(ciphertext, keyword, decrypted, cleaned))]
+        return result
+    
+    all_sections = []
+    
+    # Section 1: Input Parameters
+    input_content = f"""Original Inputs:
+  Keyword: "{keyword}"
+  Ciphertext: "{ciphertext}"
+
+Decryption uses the same 5x5 matrix as encryption,
+with each rule applied in the opposite direction."""
+    
+    all_sections.append({
+        "section": "Input Parameters",
+        "subsections": [{"title": "Given Values", "content": input_content}]
+    })
+    
+    # Section 2: Prepare Ciphertext
+    prep_lines = ["Lowercase, keep only letters, and replace 'j' with 'i':"]
+    prep_lines.append("")
+    prep_lines.append(f"  \"{ciphertext}\" → \"{letters}\"")
+    prep_lines.append("")
+    digrams = re.findall('..', letters)
+    prep_lines.append(f"Digrams: {' | '.join(digrams)}")
+    
+    all_sections.append({
+        "section": "Prepare Ciphertext",
+        "subsections": [{"title": "Split into Digrams", "content": '\n'.join(prep_lines)}]
+    })
+    
+    # Section 3: Generate 5x5 Key Matrix
+    keyword_ji = ''.join(ch for ch in keyword.lower() if ch.isalpha()).replace('j', 'i')
+    key_matrix, matrix_section = _key_matrix_section(keyword_ji)
+    all_sections.append(matrix_section)
+    
+    find_pos = compile_key(keyword).position
+    
+    # Section 4: Decryption with Reversed Rules
+    dec_lines = ["Decrypting each digram using the reversed Playfair rules:"]
+    dec_lines.append("")
+    dec_lines.append("Three Rules of Playfair (reversed):")
+    dec_lines.append("  Rule 1 (Same Row): Take letters to the LEFT (wrap around)")
+    dec_lines.append("  Rule 2 (Same Column): Take letters ABOVE (wrap around)")
+    dec_lines.append("  Rule 3 (Rectangle): Swap columns, keep rows (its own inverse)")
+    dec_lines.append("")
+    dec_lines.append("-" * 60)
+    
+    decrypted = ""
+    for idx, (a, b) in enumerate(digrams):
+        r1, c1 = find_pos(a)
+        r2, c2 = find_pos(b)
+        
+        dec_lines.append("")
+        dec_lines.append(f"Digram {idx + 1}: '{a}{b}'")
+        dec_lines.append(f"  Position of '{a}': Row {r1}, Col {c1}")
+        dec_lines.append(f"  Position of '{b}': Row {r2}, Col {c2}")
+        
+        if r1 == r2:
+            # Same Row Rule
+            dec_a = key_matrix[r1][(c1 - 1) % 5]
+            dec_b = key_matrix[r2][(c2 - 1) % 5]
+            dec_lines.append("")
+            dec_lines.append(f"  ★ RULE 1: SAME ROW (Row {r1})")
+            dec_lines.append(f"  Action: Take letter to the LEFT of each (wrap around)")
+            dec_lines.append(f"    '{a}' at Col {c1} → LEFT → Col {(c1-1)%5} → '{dec_a}'")
+            dec_lines.append(f"    '{b}' at Col {c2} → LEFT → Col {(c2-1)%5} → '{dec_b}'")
+        
+        elif c1 == c2:
+            # Same Column Rule
+            dec_a = key_matrix[(r1 - 1) % 5][c1]
+            dec_b = key_matrix[(r2 - 1) % 5][c2]
+            dec_lines.append("")
+            dec_lines.append(f"  ★ RULE 2: SAME COLUMN (Col {c1})")
+            dec_lines.append(f"  Action: Take letter ABOVE each (wrap around)")
+            dec_lines.append(f"    '{a}' at Row {r1} → ABOVE → Row {(r1-1)%5} → '{dec_a}'")
+            dec_lines.append(f"    '{b}' at Row {r2} → ABOVE → Row {(r2-1)%5} → '{dec_b}'")
+        
+        else:
+            # Rectangle Rule
+            dec_a = key_matrix[r1][c2]
+            dec_b = key_matrix[r2][c1]
+            dec_lines.append("")
+            dec_lines.append(f"  ★ RULE 3: RECTANGLE (Different Row & Column)")
+            dec_lines.append(f"  Action: Stay in same row, swap columns")
+            dec_lines.append(f"    '{a}' at (Row {r1}, Col {c1}) → (Row {r1}, Col {c2}) → '{dec_a}'")
+            dec_lines.append(f"    '{b}' at (Row {r2}, Col {c2}) → (Row {r2}, Col {c1}) → '{dec_b}'")
+        
+        decrypted += dec_a + dec_b
+        dec_lines.append(f"  Decrypted Digram: '{dec_a}{dec_b}'")
+        dec_lines.append(f"  Plaintext so far: \"{decrypted}\"")
+    
+    all_sections.append({
+        "section": "Decryption Process",
+        "subsections": [{"title": "Applying Reversed Playfair Rules", "content": '\n'.join(dec_lines)}]
+    })
+    
+    # Section 5: Remove Fillers
+    cleaned = strip_fillers(decrypted)
+    filler_lines = ["Encryption inserted 'x' between repeated letters that would have shared a digram."]
+    filler_lines.append("Dropping every 'x' that sits between two copies of the same letter:")
+    filler_lines.append("")
+    filler_lines.append(f"  \"{decrypted}\" → \"{cleaned}\"")
+    
+    all_sections.append({
+        "section": "Remove Filler Letters",
+        "subsections": [{"title": "Undo Pair Formation", "content": '\n'.join(filler_lines)}]
+    })
+    
+    # Section 6: Final Result
+    all_sections.append(final_result_section(_decrypt_summary_lines(ciphertext, keyword, decrypted, cleaned)))
+    
+    return {
+        "success": True,
+        "mode": "decrypt",
+        "ciphertext": ciphertext,
+        "keyword": keyword,
+        "plaintext": decrypted.upper(),
+        "cleaned": cleaned.upper(),
+        "matrix": key_matrix,
+        "sections": all_sections
+    }
+
+
+def _decrypt_cells():
+    """For every ciphertext cell pair (i, j) of the square, its plaintext cell pair.
+    The rules only depend on positions, so these tables serve every candidate key."""
+    first, second = [0] * 625, [0] * 625
+    for i in range(25):
+        r1, c1 = divmod(i, 5)
+        for j in range(25):
+            r2, c2 = divmod(j, 5)
+            if r1 == r2:
+                a, b = r1 * 5 + (c1 - 1) % 5, r2 * 5 + (c2 - 1) % 5
+            elif c1 == c2:
+                a, b = (r1 - 1) % 5 * 5 + c1, (r2 - 1) % 5 * 5 + c2
+            else:
+                a, b = r1 * 5 + c2, r2 * 5 + c1
+            first[i * 25 + j], second[i * 25 + j] = a, b
+    return first, second
+
+DECRYPT_FIRST, DECRYPT_SECOND = _decrypt_cells()
+
+def _fitness(key, first_letters, second_letters):
+    """Quadgram log₁₀ score of the ciphertext decrypted with `key` (25 letter numbers, A=0)"""
+    if np is not None:
+        first, second, quad = _np_tables()
+        key = np.array(key)
+        pos = np.zeros(26, dtype=np.int64)
+        pos[key] = np.arange(25)
+        cells = pos[first_letters] * 25 + pos[second_letters]
+        plain = np.empty(2 * len(cells), dtype=np.int64)
+        plain[0::2] = key[first[cells]]
+        plain[1::2] = key[second[cells]]
+        quads = ((plain[:-3] * 26 + plain[1:-2]) * 26 + plain[2:-1]) * 26 + plain[3:]
+        return float(quad[quads].sum())
+    quad = english.ngram_table(4)
+    pos = [0] * 26
+    for cell, letter in enumerate(key):
+        pos[letter] = cell
+    plain = []
+    for a, b in zip(first_letters, second_letters):
+        cells = pos[a] * 25 + pos[b]
+        plain.append(key[DECRYPT_FIRST[cells]])
+        plain.append(key[DECRYPT_SECOND[cells]])
+    return sum(quad[((w * 26 + x) * 26 + y) * 26 + z] for w, x, y, z in zip(plain, plain[1:], plain[2:], plain[3:]))
+
+_np_cache = []  # (first, second, quadgram) NumPy tables
+
+def _np_tables():
+    """(first, second, quadgram) tables as NumPy arrays, converted once per process"""
+    if not _np_cache:
+        _np_cache.extend((np.array(DECRYPT_FIRST), np.array(DECRYPT_SECOND), np.array(english.ngram_table(4))))
+    return _np_cache
+
+def _mutate(key, rng):
+    """A neighbouring key square: mostly a swap of two letters, sometimes a row/column move"""
+    key = key[:]
+    r = rng.random()
+    if r < 0.90:
+        i, j = rng.sample(range(25), 2)
+        key[i], key[j] = key[j], key[i]
+    elif r < 0.92:
+        a, b = rng.sample(range(5), 2)
+        key[a * 5:a * 5 + 5], key[b * 5:b * 5 + 5] = key[b * 5:b * 5 + 5], key[a * 5:a * 5 + 5]
+    elif r < 0.94:
+        a, b = rng.sample(range(5), 2)
+        for row in range(0, 25, 5):
+            key[row + a], key[row + b] = key[row + b], key[row + a]
+    elif r < 0.96:
+        key = [key[row + 4 - col] for row in range(0, 25, 5) for col in range(5)]
+    elif r < 0.98:
+        key = [key[(4 - row) * 5 + col] for row in range(5) for col in range(5)]
+    else:
+        key.reverse()
+    return key
+
+def _anneal(task):
+    """One restart: simulated annealing from a random square for `budget` seconds of wall clock
+    (counted from when the restart starts running), the temperature falling linearly to zero.
+    Returns (best score, best key, keys scored)."""
+    letters, budget, seed = task
+    letters = letters[:len(letters) // 2 * 2]
+    first_letters, second_letters = letters[0::2], letters[1::2]
+    if np is not None:
+        first_letters, second_letters = np.array(first_letters), np.array(second_letters)
+    rng = random.Random(seed)
+    key = list(SQUARE_LETTERS)
+    rng.shuffle(key)
+    score = _fitness(key, first_letters, second_letters)
+    best = (score, key)
+    start_temperature = max(ANNEAL_MIN_TEMPERATURE, ANNEAL_TEMPERATURE_PER_LETTER * len(letters))
+    start = time.time()
+    deadline = start + budget
+    span = max(budget, 1e-9)
+    temperature = start_temperature
+    evaluations = 0
+    while True:
+        if evaluations % 256 == 0:
+            now = time.time()
+            if now >= deadline:
+                break
+            temperature = start_temperature * (deadline - now) / span
+        child = _mutate(key, rng)
+        child_score = _fitness(child, first_letters, second_letters)
+        evaluations += 1
+        delta = child_score - score
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            key, score = child, child_score
+            if score > best[0]:
+                best = (score, key)
+    return best[0], best[1], evaluations
+
+def _square_matrix(key):
+    """5×5 lowercase matrix of a key given as letter numbers"""
+    return [[chr(97 + x) for x in key[r:r + 5]] for r in range(0, 25, 5)]
+
+def _attack_summary_lines(ciphertext, best_key, plaintext, score, restarts, evaluations):
+    """Lines of the "Final Result" section of the solver"""
+    lines = [
+        "PLAYFAIR KEY SEARCH COMPLETE",
+        "",
+        f"Restarts:            {restarts}",
+        f"Keys scored:         {evaluations:,}",
+        f"Best score:          {score:.2f}",
+        "",
+        "Best Key Square:",
+    ]
+    lines.extend(f"  {' '.join(row).upper()}" for row in best_key.matrix)
+    lines.append("")
+    lines.append(f"Ciphertext:          \"{ciphertext}\"")
+    lines.append(f"★ PLAINTEXT: \"{plaintext.upper()}\"")
+    return lines
+
+def playfair_attack_sections(ciphertext, time_limit=DEFAULT_ATTACK_SECONDS, restarts=DEFAULT_RESTARTS):
+    """Ciphertext-only key search, yielding a progress section as each restart finishes"""
+    letters_text = clean_ciphertext(ciphertext)
+    letters = [ord(ch) - 97 for ch in letters_text]
+    workers = worker_count(restarts)
+    waves = -(-restarts // workers)
+    start = time.time()
+    # Restarts beyond the worker count queue up, so each wave gets its slice of the budget.
+    # The deadline starts when a restart starts: a queued one (or one run in-process after
+    # the pool fails) still anneals for its full slice.
+    tasks = [(letters, time_limit / waves, random.randrange(2 ** 32)) for _ in range(restarts)]
+    
+    setup_lines = []
+    setup_lines.append(f"Ciphertext letters: {len(letters)} ({len(letters) // 2} digrams)")
+    setup_lines.append(f"Restarts: {restarts} from random key squares, {workers} worker process{'es' if workers > 1 else ''}")
+    setup_lines.append(f"Time budget: {time_limit} s wall clock")
+    setup_lines.append("")
+    setup_lines.append("Fitness: sum of log₁₀ English quadgram probabilities of the decryption,")
+    setup_lines.append(f"computed with {'NumPy' if np is not None else 'pure Python'} from a flat table of 26⁴ entries.")
+    setup_lines.append("")
+    setup_lines.append("Simulated annealing: each step changes the square (swap two letters, or")
+    setup_lines.append("swap rows/columns, or flip it) and keeps the change if it scores higher,")
+    setup_lines.append("or with probability e^(Δ/T) if lower. T falls linearly to 0 by the deadline.")
+    yield {
+        "section": "Search Setup",
+        "subsections": [{"title": "Simulated Annealing over Key Squares", "content": '\n'.join(setup_lines)}]
+    }
+    
+    best = None
+    evaluations = 0
+    for done, (score, key, scored) in enumerate(pool_as_completed(_anneal, tasks, workers), 1):
+        evaluations += scored
+        if best is None or score > best[0]:
+            best = (score, key)
+        candidate = PlayfairKey(_square_matrix(key))
+        progress_lines = [f"Score: {score:.2f}  ({scored:,} keys scored)", "", "Key Square:"]
+        progress_lines.extend(f"  {' '.join(row).upper()}" for row in candidate.matrix)
+        progress_lines.append("")
+        progress_lines.append(f"Decryption: {candidate.decrypt(letters_text)[:80].upper()}")
+        progress_lines.append("")
+        progress_lines.append(f"Best so far: {best[0]:.2f}")
+        yield {
+            "section": f"Restart {done} of {restarts}",
+            "subsections": [{"title": f"{time.time() - start:.1f} s elapsed", "content": '\n'.join(progress_lines)}]
+        }
+    
+    best_key = PlayfairKey(_square_matrix(best[1]))
+    plaintext = best_key.decrypt(letters_text)
+    yield final_result_section(_attack_summary_lines(ciphertext, best_key, plaintext, best[0], restarts, evaluations))
+    
+    return {
+        "success": True,
+        "key": ''.join(ch for row in best_key.matrix for ch in row).upper(),
+        "matrix": best_key.matrix,
+        "plaintext": plaintext.upper(),
+        "cleaned": strip_fillers(plaintext).upper(),
+        "score": round(best[0], 2),
+        "keys_scored": evaluations,
+    }
+
+def playfair_attack_detailed(ciphertext, time_limit=DEFAULT_ATTACK_SECONDS, restarts=DEFAULT_RESTARTS,
+                             verbosity='full'):
+    """Ciphertext-only Playfair key search (simulated annealing restarts in a process pool)"""
+    result = collect_sections(playfair_attack_sections(ciphertext, time_limit, restarts))
+    if verbosity == 'summary':
+        result["sections"] = result["sections"][-1:]
+    elif verbosity != 'full':
+        del result["sections"]
+    return result
+
 
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
@@ -1,295 +1,503 @@
+from array import array
 from http.server import BaseHTTPRequestHandler
+import functools
 import json
 
-def rail_fence_encrypt_detailed(plaintext, num_rails):
-    """Rail Fence Cipher Encryption with detailed steps"""
-    all_sections = []
-    
+import english
+from narration import DEFAULT_MAX_STEPS, abbreviate, collect_sections, final_result_section, step_window
+from parallel import pool_map, worker_count
+
+# Analysis mode: candidates are scored on the first SCORE_LENGTH plaintext characters,
+# so a long ciphertext costs no more per (rails, offset) than a short one
+SCORE_LENGTH = 400
+SCORE_NGRAM = 4
+# Read positions kept per process (as 8-byte arrays): a full maxRails=64 sweep is 4,032 candidates
+POSITIONS_CACHE_SIZE = 4096
+
+def cycle_length(num_rails):
+    """Positions in one down-and-up sweep of the zig-zag"""
+    return max(2 * (num_rails - 1), 1)
+
+
+def rail_residues(num_rails, offset=0):
+    """For each rail, the positions i (mod the cycle) that land on it, ascending.
+
+    Position i sits at phase t = (i + offset) mod cycle, on rail t or cycle - t, so the
+    top and bottom rails hold one residue class and every middle rail two."""
+    cycle = cycle_length(num_rails)
+    residues = []
+    for rail in range(num_rails):
+        first = (rail - offset) % cycle
+        second = (cycle - rail - offset) % cycle
+        residues.append((first,) if first == second else tuple(sorted((first, second))))
+    return residues
+
+
+def rail_pattern(n, num_rails, offset=0):
+    """Rail index (0-based) of each of the n positions in the zig-zag"""
+    cycle = cycle_length(num_rails)
+    return [min(t, cycle - t) for t in ((i + offset) % cycle for i in range(n))]
+
+
+def rail_lengths(n, num_rails, offset=0):
+    """Number of positions on each rail"""
+    cycle = cycle_length(num_rails)
+    return [sum(len(range(r, n, cycle)) for r in residues) for residues in rail_residues(num_rails, offset)]
+
+
+@functools.lru_cache(maxsize=POSITIONS_CACHE_SIZE)
+def read_positions(n, num_rails, offset, count):
+    """Ciphertext index of each of the first `count` plaintext positions (the inverse of
+    rail_permutation): from the start of its rail, plus its rank within the rail, which
+    grows by 1 per cycle on the top and bottom rails and by 2 on a middle rail"""
+    cycle = cycle_length(num_rails)
+    base = [0] * cycle
+    step = [0] * cycle
+    start = 0
+    for residues in rail_residues(num_rails, offset):
+        for parity, r in enumerate(residues):
+            base[r] = start + parity
+            step[r] = len(residues)
+        start += sum(len(range(r, n, cycle)) for r in residues)
+    return array('l', [base[i % cycle] + step[i % cycle] * (i // cycle) for i in range(min(count, n))])
+
+
+def _interleave(first, second):
+    """first[0], second[0], first[1], ... (first is as long as second or one longer)"""
+    merged = [None] * (len(first) + len(second))
+    merged[0::2] = first
+    merged[1::2] = second
+    return merged
+
+
+def rail_permutation(n, num_rails, offset=0):
+    """Ciphertext order: the plaintext index read at each ciphertext position"""
+    cycle = cycle_length(num_rails)
+    order = []
+    for residues in rail_residues(num_rails, offset):
+        if len(residues) == 1:
+            order.extend(range(residues[0], n, cycle))
+        else:
+            order.extend(_interleave(range(residues[0], n, cycle), range(residues[1], n, cycle)))
+    return order
+
+
+def rail_fence_encrypt(text, num_rails, offset=0):
+    """Rail fence encryption, no narration: each rail is one or two strided slices.
+    Every character is kept, '.' included (the old grid used '.' as its empty cell and lost them)."""
+    cycle = cycle_length(num_rails)
+    parts = []
+    for residues in rail_residues(num_rails, offset):
+        if len(residues) == 1:
+            parts.append(text[residues[0]::cycle])
+        else:
+            parts.append(''.join(_interleave(text[residues[0]::cycle], text[residues[1]::cycle])))
+    return ''.join(parts)
+
+
+def rail_fence_decrypt(text, num_rails, offset=0):
+    """Rail fence decryption, no narration: each rail's run of ciphertext is slice-assigned back"""
+    n = len(text)
+    cycle = cycle_length(num_rails)
+    plain = [''] * n
+    pos = 0
+    for residues in rail_residues(num_rails, offset):
+        if len(residues) == 1:
+            count = len(range(residues[0], n, cycle))
+            plain[residues[0]::cycle] = text[pos:pos + count]
+        else:
+            first, second = residues
+            count = len(range(first, n, cycle)) + len(range(second, n, cycle))
+            run = text[pos:pos + count]
+            plain[first::cycle] = run[0::2]
+            plain[second::cycle] = run[1::2]
+        pos += count
+    return ''.join(plain)
+
+
+def _window_columns(n, max_steps):
+    """Columns of the zig-zag diagram to draw: all of them, or both ends around a None gap"""
+    skipped = step_window(n, max_steps)
+    if skipped is None:
+        return list(range(n))
+    return list(range(skipped.start)) + [None] + list(range(skipped.stop, n))
+
+
+def _diagram_lines(text, num_rails, offset, max_steps):
+    """The zig-zag grid, one line per rail, drawn only for the windowed columns"""
+    cycle = cycle_length(num_rails)
+    columns = _window_columns(len(text), max_steps)
+    lines = []
+    for r in range(num_rails):
+        cells = []
+        for c in columns:
+            if c is None:
+                cells.append('⋯')
+            else:
+                t = (c + offset) % cycle
+                cells.append(text[c] if min(t, cycle - t) == r else '.')
+        lines.append(f"Rail {r+1}: " + ''.join(cell + ' ' for cell in cells))
+    skipped = step_window(len(text), max_steps)
+    if skipped:
+        lines.append("")
+        lines.append(f"(columns {skipped.start + 1}–{skipped.stop} not shown: {len(skipped)} of {len(text)})")
+    return lines
+
+
+def _position_lines(text, num_rails, offset, max_steps, describe):
+    """One line per position, the middle ones elided for long texts"""
+    cycle = cycle_length(num_rails)
+    lines = []
+    for i in _window_columns(len(text), max_steps):
+        if i is None:
+            skipped = step_window(len(text), max_steps)
+            lines.append(f"  ⋯ Positions {skipped.start + 1}–{skipped.stop}: {len(skipped)} not shown ⋯")
+            continue
+        t = (i + offset) % cycle
+        lines.append(describe(i, text[i], min(t, cycle - t)))
+    return lines
+
+
+def _summary_lines(mode, text, num_rails, output, offset=0):
+    """Lines of the "Final Result" section"""
+    if mode == 'encrypt':
+        lines = [
+            "RAIL FENCE ENCRYPTION COMPLETE",
+            "",
+            f"Input Plaintext:  \"{text}\"",
+            f"Number of Rails:  {num_rails}",
+            f"Output Ciphertext: \"{output}\"",
+        ]
+    else:
+        lines = [
+            "RAIL FENCE DECRYPTION COMPLETE",
+            "",
+            f"Input Ciphertext:  \"{text}\"",
+            f"Number of Rails:   {num_rails}",
+            f"Output Plaintext:  \"{output}\"",
+        ]
+    if offset:
+        lines.insert(4, f"Offset:           {offset}")
+    return lines
+
+
+def _input_lines(label, original, text, num_rails, offset):
+    """Opening lines of the "Input Parameters" section"""
+    lines = [
+        f"{label}: \"{original}\"",
+        f"Cleaned Text: \"{text}\"",
+        f"Text Length: {len(text)}",
+        f"Number of Rails: {num_rails}",
+    ]
+    if offset:
+        lines.append(f"Offset: {offset} (the zig-zag starts {offset} step(s) into its {cycle_length(num_rails)}-step cycle)")
+    return lines
+
+
+def _result(mode, text, output, num_rails, offset):
+    """Result fields shared by every verbosity"""
+    source, target = ('plaintext', 'ciphertext') if mode == 'encrypt' else ('ciphertext', 'plaintext')
+    result = {"success": True, source: text, target: output, "num_rails": num_rails, "mode": mode}
+    if offset:
+        result["offset"] = offset
+    return result
+
+
+def rail_fence_encrypt_sections(plaintext, num_rails, offset=0, max_steps=DEFAULT_MAX_STEPS):
+    """Rail Fence Cipher Encryption, yielding each explanation section as soon as it is built"""
     # Clean plaintext
     text = plaintext.upper().replace(" ", "")
-    n = len(text)
     
     # Section 1: Input Parameters
-    input_lines = []
-    input_lines.append(f"Plaintext: \"{plaintext}\"")
-    input_lines.append(f"Cleaned Text: \"{text}\"")
-    input_lines.append(f"Text Length: {n}")
-    input_lines.append(f"Number of Rails: {num_rails}")
+    input_lines = _input_lines("Plaintext", plaintext, text, num_rails, offset)
     input_lines.append("")
     input_lines.append("Rail Fence Cipher:")
     input_lines.append("  - Write plaintext diagonally down and up across rails")
     input_lines.append("  - Read off each rail from top to bottom to get ciphertext")
     
-    all_sections.append({
+    yield {
         "section": "Input Parameters",
         "subsections": [{"title": "Given Values", "content": '\n'.join(input_lines)}]
-    })
+    }
     
-    # Section 2: Create the Zig-Zag Pattern
+    # Section 2: Create the Zig-Zag Pattern (rails computed per position, no rails × n grid)
     pattern_lines = []
     pattern_lines.append("Creating the zig-zag pattern by writing characters diagonally:")
     pattern_lines.append("")
     
-    # Create empty rails
-    rails = [['.' for _ in range(n)] for _ in range(num_rails)]
-    
-    # Fill the rails in zig-zag pattern
-    rail = 0
-    direction = 1  # 1 = down, -1 = up
-    
-    rail_positions = []  # Track which rail each character goes to
-    
-    for i, char in enumerate(text):
-        rails[rail][i] = char
-        rail_positions.append(rail)
-        
-        # Change direction at top or bottom rail
-        if rail == 0:
-            direction = 1
-        elif rail == num_rails - 1:
-            direction = -1
-        
-        rail += direction
-    
-    # Display the zig-zag pattern with position tracking
     pattern_lines.append("Step-by-step character placement:")
     pattern_lines.append("")
-    for i, char in enumerate(text):
-        pattern_lines.append(f"  Position {i+1}: '{char}' → Rail {rail_positions[i] + 1}")
+    pattern_lines.extend(_position_lines(text, num_rails, offset, max_steps,
+                                         lambda i, char, rail: f"  Position {i+1}: '{char}' → Rail {rail + 1}"))
     
     pattern_lines.append("")
     pattern_lines.append("─" * 50)
     pattern_lines.append("")
     
-    # Display the visual grid
     pattern_lines.append("Visual Zig-Zag Pattern:")
     pattern_lines.append("")
+    pattern_lines.extend(_diagram_lines(text, num_rails, offset, max_steps))
     
-    # Create a visual representation
-    for r in range(num_rails):
-        rail_str = f"Rail {r+1}: "
-        for c in range(n):
-            rail_str += rails[r][c] + " "
-        pattern_lines.append(rail_str)
-    
-    all_sections.append({
+    yield {
         "section": "Zig-Zag Pattern Construction",
         "subsections": [{"title": "Building the Rail Fence", "content": '\n'.join(pattern_lines)}]
-    })
+    }
     
     # Section 3: Reading the Rails
     read_lines = []
     read_lines.append("Reading each rail from left to right:")
     read_lines.append("")
     
-    ciphertext = ""
-    for r in range(num_rails):
-        rail_chars = ""
-        for c in range(n):
-            if rails[r][c] != '.':
-                rail_chars += rails[r][c]
-        
-        read_lines.append(f"Rail {r+1}: {rail_chars}")
-        ciphertext += rail_chars
+    ciphertext = rail_fence_encrypt(text, num_rails, offset)
+    pos = 0
+    for r, count in enumerate(rail_lengths(len(text), num_rails, offset)):
+        read_lines.append(f"Rail {r+1}: {abbreviate(ciphertext[pos:pos + count], keep=max_steps, unit='characters')}")
+        pos += count
     
     read_lines.append("")
     read_lines.append("─" * 50)
     read_lines.append(f"Concatenating all rails: {ciphertext}")
     
-    all_sections.append({
+    yield {
         "section": "Reading Rails",
         "subsections": [{"title": "Extracting Ciphertext", "content": '\n'.join(read_lines)}]
-    })
+    }
     
     # Section 4: Final Result
-    result_lines = []
-    result_lines.append("RAIL FENCE ENCRYPTION COMPLETE")
-    result_lines.append("")
-    result_lines.append(f"Input Plaintext:  \"{text}\"")
-    result_lines.append(f"Number of Rails:  {num_rails}")
-    result_lines.append(f"Output Ciphertext: \"{ciphertext}\"")
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
-    })
+    yield final_result_section(_summary_lines('encrypt', text, num_rails, ciphertext, offset))
     
-    return {
-        "success": True,
-        "plaintext": text,
-        "ciphertext": ciphertext,
-        "num_rails": num_rails,
-        "mode": "encrypt",
-        "sections": all_sections
-    }
+    return _result('encrypt', text, ciphertext, num_rails, offset)
 
 
-def rail_fence_decrypt_detailed(ciphertext, num_rails):
-    """Rail Fence Cipher Decryption with detailed steps"""
-    all_sections = []
-    
+def rail_fence_encrypt_detailed(plaintext, num_rails, verbosity='full', offset=0, max_steps=DEFAULT_MAX_STEPS):
+    """Rail Fence Cipher Encryption with detailed steps"""
+    if verbosity != 'full':
+        text = plaintext.upper().replace(" ", "")
+        ciphertext = rail_fence_encrypt(text, num_rails, offset)
+        result = _result('encrypt', text, ciphertext, num_rails, offset)
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_summary_lines('encrypt', text, num_rails, ciphertext, offset))]
+        return result
+    
+    return collect_sections(rail_fence_encrypt_sections(plaintext, num_rails, offset, max_steps))
+
+
+def rail_fence_decrypt_sections(ciphertext, num_rails, offset=0, max_steps=DEFAULT_MAX_STEPS):
+    """Rail Fence Cipher Decryption, yielding each explanation section as soon as it is built"""
     # Clean ciphertext
     text = ciphertext.upper().replace(" ", "")
     n = len(text)
     
     # Section 1: Input Parameters
-    input_lines = []
-    input_lines.append(f"Ciphertext: \"{ciphertext}\"")
-    input_lines.append(f"Cleaned Text: \"{text}\"")
-    input_lines.append(f"Text Length: {n}")
-    input_lines.append(f"Number of Rails: {num_rails}")
+    input_lines = _input_lines("Ciphertext", ciphertext, text, num_rails, offset)
     input_lines.append("")
     input_lines.append("Decryption Process:")
     input_lines.append("  1. Determine how many characters go on each rail")
     input_lines.append("  2. Fill the rails with ciphertext characters")
     input_lines.append("  3. Read diagonally in zig-zag pattern")
     
-    all_sections.append({
+    yield {
         "section": "Input Parameters",
         "subsections": [{"title": "Given Values", "content": '\n'.join(input_lines)}]
-    })
+    }
     
     # Section 2: Calculate characters per rail
     calc_lines = []
     calc_lines.append("Step 1: Calculate how many characters belong to each rail")
     calc_lines.append("")
-    calc_lines.append("Simulating the zig-zag pattern to count positions per rail:")
+    calc_lines.append("Counting the zig-zag positions on each rail (one or two per cycle):")
     calc_lines.append("")
     
-    # Count characters per rail by simulating the zig-zag
-    rail_counts = [0] * num_rails
-    rail = 0
-    direction = 1
-    rail_order = []  # Track the order of rails visited
-    
-    for i in range(n):
-        rail_counts[rail] += 1
-        rail_order.append(rail)
-        
-        if rail == 0:
-            direction = 1
-        elif rail == num_rails - 1:
-            direction = -1
-        
-        rail += direction
-    
+    rail_counts = rail_lengths(n, num_rails, offset)
     for r in range(num_rails):
         calc_lines.append(f"  Rail {r+1}: {rail_counts[r]} characters")
     
     calc_lines.append("")
     calc_lines.append(f"Total: {sum(rail_counts)} characters (matches ciphertext length)")
     
-    all_sections.append({
+    yield {
         "section": "Character Distribution",
         "subsections": [{"title": "Characters per Rail", "content": '\n'.join(calc_lines)}]
-    })
+    }
     
     # Section 3: Fill the rails with ciphertext
     fill_lines = []
     fill_lines.append("Step 2: Distribute ciphertext characters to rails")
     fill_lines.append("")
     
-    # Create rails array
-    rails = [['.' for _ in range(n)] for _ in range(num_rails)]
-    
-    # Mark positions in each rail
-    rail = 0
-    direction = 1
-    for i in range(n):
-        rails[rail][i] = '*'  # Mark position
-        
-        if rail == 0:
-            direction = 1
-        elif rail == num_rails - 1:
-            direction = -1
-        
-        rail += direction
-    
-    # Fill rails with ciphertext characters
     idx = 0
-    rail_contents = []
     for r in range(num_rails):
-        rail_chars = ""
-        start_idx = idx
-        for c in range(n):
-            if rails[r][c] == '*':
-                rails[r][c] = text[idx]
-                rail_chars += text[idx]
-                idx += 1
-        rail_contents.append(rail_chars)
-        fill_lines.append(f"Rail {r+1} gets: \"{rail_chars}\" (positions {start_idx+1}-{idx})")
+        rail_chars = text[idx:idx + rail_counts[r]]
+        fill_lines.append(f"Rail {r+1} gets: \"{abbreviate(rail_chars, keep=max_steps, unit='characters')}\" "
+                          f"(positions {idx+1}-{idx + rail_counts[r]})")
+        idx += rail_counts[r]
+    
+    plaintext = rail_fence_decrypt(text, num_rails, offset)
     
     fill_lines.append("")
     fill_lines.append("Filled rail fence grid:")
     fill_lines.append("")
+    fill_lines.extend(_diagram_lines(plaintext, num_rails, offset, max_steps))
     
-    for r in range(num_rails):
-        rail_str = f"Rail {r+1}: "
-        for c in range(n):
-            rail_str += rails[r][c] + " "
-        fill_lines.append(rail_str)
-    
-    all_sections.append({
+    yield {
         "section": "Filling Rails",
         "subsections": [{"title": "Distributing Ciphertext", "content": '\n'.join(fill_lines)}]
-    })
+    }
     
     # Section 4: Read in zig-zag order
     read_lines = []
     read_lines.append("Step 3: Read diagonally in zig-zag pattern")
     read_lines.append("")
     
-    plaintext = ""
-    rail = 0
-    direction = 1
-    
     read_lines.append("Reading order:")
     read_lines.append("")
-    
-    for i in range(n):
-        char = rails[rail][i]
-        plaintext += char
-        read_lines.append(f"  Position {i+1}: Rail {rail+1}, Column {i+1} → '{char}'")
-        
-        if rail == 0:
-            direction = 1
-        elif rail == num_rails - 1:
-            direction = -1
-        
-        rail += direction
+    read_lines.extend(_position_lines(plaintext, num_rails, offset, max_steps,
+                                      lambda i, char, rail: f"  Position {i+1}: Rail {rail+1}, Column {i+1} → '{char}'"))
     
     read_lines.append("")
     read_lines.append("─" * 50)
     read_lines.append(f"Reconstructed Plaintext: {plaintext}")
     
-    all_sections.append({
+    yield {
         "section": "Reading Zig-Zag",
         "subsections": [{"title": "Reconstructing Plaintext", "content": '\n'.join(read_lines)}]
-    })
+    }
     
     # Section 5: Final Result
-    result_lines = []
-    result_lines.append("RAIL FENCE DECRYPTION COMPLETE")
-    result_lines.append("")
-    result_lines.append(f"Input Ciphertext:  \"{text}\"")
-    result_lines.append(f"Number of Rails:   {num_rails}")
-    result_lines.append(f"Output Plaintext:  \"{plaintext}\"")
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": '\n'.join(result_lines)}]
-    })
+    yield final_result_section(_summary_lines('decrypt', text, num_rails, plaintext, offset))
+    
+    return _result('decrypt', text, plaintext, num_rails, offset)
+
+
+def rail_fence_decrypt_detailed(ciphertext, num_rails, verbosity='full', offset=0, max_steps=DEFAULT_MAX_STEPS):
+    """Rail Fence Cipher Decryption with detailed steps"""
+    if verbosity != 'full':
+        text = ciphertext.upper().replace(" ", "")
+        plaintext = rail_fence_decrypt(text, num_rails, offset)
+        result = _result('decrypt', text, plaintext, num_rails, offset)
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_summary_lines('decrypt', text, num_rails, plaintext, offset))]
+        return result
+    
+    return collect_sections(rail_fence_decrypt_sections(ciphertext, num_rails, offset, max_steps))
+
+
+def _score_candidates(task):
+    """(score, rails, offset, prefix) for each (rails, offset) of a chunk: the first plaintext
+    characters are gathered through the cached read positions and quadgram-scored"""
+    text, candidates = task
+    results = []
+    for num_rails, offset in candidates:
+        prefix = ''.join(map(text.__getitem__, read_positions(len(text), num_rails, offset, SCORE_LENGTH)))
+        results.append((english.score(english.letters(prefix), SCORE_NGRAM), num_rails, offset, prefix))
+    return results
+
+
+def analysis_candidates(n, max_rails):
+    """Every (rails, offset) worth trying on n characters: rail counts past n add nothing new"""
+    return [(r, offset) for r in range(2, max(2, min(max_rails, n)) + 1) for offset in range(cycle_length(r))]
+
+
+def analyze(text, max_rails, top=5):
+    """Score the decryption under every rail count 2..max_rails and every offset across a
+    process pool; returns the `top` distinct candidates, best first"""
+    candidates = analysis_candidates(len(text), max_rails)
+    chunks = worker_count(len(candidates))
+    tasks = [(text, candidates[i::chunks]) for i in range(chunks)]
+    scored = sorted((item for chunk in pool_map(_score_candidates, tasks) for item in chunk),
+                    key=lambda item: (-item[0], item[1], item[2]))
+    best = []
+    seen = set()
+    for score, num_rails, offset, prefix in scored:
+        if prefix in seen:
+            continue
+        seen.add(prefix)
+        best.append({"num_rails": num_rails, "offset": offset, "score": round(score, 2), "preview": prefix})
+        if len(best) == top:
+            break
+    return best
+
+
+def _analyze_summary_lines(text, best):
+    """Lines of the "Final Result" section of the analysis"""
+    return [
+        "RAIL FENCE ANALYSIS COMPLETE",
+        "",
+        f"Input Ciphertext:  \"{text}\"",
+        f"Best Rails:        {best['num_rails']}",
+        f"Best Offset:       {best['offset']}",
+        f"Output Plaintext:  \"{best['plaintext']}\"",
+    ]
+
+
+def rail_fence_analyze_sections(ciphertext, max_rails, top=5):
+    """Rail Fence brute force over rail counts and offsets, yielding each section as it is built"""
+    text = ciphertext.upper().replace(" ", "")
+    tried = analysis_candidates(len(text), max_rails)
+    workers = worker_count(len(tried))
+    
+    # Section 1: Search Space
+    space_lines = []
+    space_lines.append(f"Ciphertext: \"{abbreviate(text, keep=2 * DEFAULT_MAX_STEPS, unit='characters')}\"")
+    space_lines.append(f"Text Length: {len(text)}")
+    space_lines.append("")
+    space_lines.append(f"Rail counts: 2 to {tried[-1][0]}, each with every offset 0 to 2·(rails − 1) − 1")
+    space_lines.append(f"Candidates: {len(tried)}")
+    space_lines.append("")
+    space_lines.append(f"Score: sum of log₁₀ English quadgram probabilities over the first {min(SCORE_LENGTH, len(text))}")
+    space_lines.append("plaintext characters, read straight from the ciphertext through each candidate's")
+    space_lines.append(f"inverse permutation ({workers} worker process{'es' if workers > 1 else ''}).")
+    
+    yield {
+        "section": "Search Space",
+        "subsections": [{"title": "All rail counts and offsets", "content": '\n'.join(space_lines)}]
+    }
+    
+    # Section 2: Top Candidates
+    candidates = analyze(text, max_rails, top)
+    best = dict(candidates[0], plaintext=rail_fence_decrypt(text, candidates[0]["num_rails"], candidates[0]["offset"]))
+    
+    cand_lines = []
+    for rank, cand in enumerate(candidates, 1):
+        cand_lines.append(f"#{rank}  rails {cand['num_rails']}, offset {cand['offset']}  score {cand['score']:.2f}")
+        cand_lines.append(f"  Plaintext: {abbreviate(cand['preview'], keep=2 * DEFAULT_MAX_STEPS, unit='characters')}")
+        cand_lines.append("")
+    
+    yield {
+        "section": "Top Candidates",
+        "subsections": [{"title": f"Best {len(candidates)} by quadgram score", "content": '\n'.join(cand_lines)}]
+    }
+    
+    # Section 3: Final Result
+    yield final_result_section(_analyze_summary_lines(text, best))
     
     return {
         "success": True,
+        "mode": "analyze",
         "ciphertext": text,
-        "plaintext": plaintext,
-        "num_rails": num_rails,
-        "mode": "decrypt",
-        "sections": all_sections
+        "plaintext": best["plaintext"],
+        "num_rails": best["num_rails"],
+        "offset": best["offset"],
+        "candidates": candidates,
     }
 
 
+def rail_fence_analyze_detailed(ciphertext, max_rails, top=5, verbosity='full'):
+    """Rail Fence brute force with detailed steps"""
+    if verbosity != 'full':
+        text = ciphertext.upper().replace(" ", "")
+        candidates = analyze(text, max_rails, top)
+        best = candidates[0]
+        plaintext = rail_fence_decrypt(text, best["num_rails"], best["offset"])
+        result = {"success": True, "mode": "analyze", "ciphertext": text, "plaintext": plaintext,
+                  "num_rails": best["num_rails"], "offset": best["offset"], "candidates": candidates}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_analyze_summary_lines(text, dict(best, plaintext=plaintext)))]
+        return result
+    
+    return collect_sections(rail_fence_analyze_sections(ciphertext, max_rails, top))
+
+
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         self.send_response(200)
@@ -313,13 +521,16 @@ class handler(BaseHTTPRequestHandler):
             
             mode = data.get('mode', 'encrypt')
             num_rails = int(data.get('numRails', 3))
+            offset = int(data.get('offset', 0))
             
-            if mode == 'encrypt':
+            if mode == 'analyze':
+                result = rail_fence_analyze_detailed(data.get('ciphertext', ''), int(data.get('maxRails', 10)))
+            elif mode == 'encrypt':
                 plaintext = data.get('plaintext', 'WEAREDISCOVEREDFLEEATONCE')
-                result = rail_fence_encrypt_detailed(plaintext, num_rails)
+                result = rail_fence_encrypt_detailed(plaintext, num_rails, offset=offset)
             else:
                 ciphertext = data.get('ciphertext', '')
-                result = rail_fence_decrypt_detailed(ciphertext, num_rails)
+                result = rail_fence_decrypt_detailed(ciphertext, num_rails, offset=offset)
             
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
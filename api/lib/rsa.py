@@ -1,27 +1,17 @@
 from http.server import BaseHTTPRequestHandler
 import json
 import math
+import time
 
-def gcd(a, b):
-    while b:
-        a, b = b, a % b
-    return a
-
-def extended_gcd(a, b):
-    """Returns (gcd, x, y) such that a*x + b*y = gcd"""
-    if a == 0:
-        return b, 0, 1
-    gcd_val, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return gcd_val, x, y
-
-def mod_inverse(e, phi):
-    """Find d such that e*d ≡ 1 (mod phi)"""
-    gcd_val, x, _ = extended_gcd(e, phi)
-    if gcd_val != 1:
+from narration import abbreviate, final_result_section
+from numtheory import egcd, gcd, is_prime, modinv, prime_rounds, random_prime
+
+def private_exponent(e, phi):
+    """d from the same extended Euclidean recurrence as extended_euclidean_detailed, no narration"""
+    g, _, t1 = egcd(phi, e)
+    if g != 1:
         return None
-    return x % phi
+    return t1 + phi if t1 < 0 else t1
 
 def mod_exp_detailed(base, exp, mod):
     """Modular exponentiation with detailed steps"""
@@ -201,8 +191,40 @@ def extended_euclidean_detailed(e, phi):
     
     return d, '\n'.join(lines)
 
-def rsa_encrypt_detailed(p, q, e, m):
+def _summary_lines(n, e, d, m, c, m_dec):
+    """Lines of the "Final Result" section"""
+    return [
+        "RSA COMPLETE",
+        "",
+        f"Original Message:    m = {m}",
+        f"Encrypted Ciphertext: c = {c}",
+        f"Decrypted Message:   m = {m_dec}",
+        "",
+        f"Public Key:  (e, n) = ({e}, {n})",
+        f"Private Key: (d, n) = ({d}, {n})",
+        "",
+        "✓ Verification: Original message matches decrypted message!" if m == m_dec else "✗ Error: Messages don't match!",
+    ]
+
+def rsa_encrypt_detailed(p, q, e, m, verbosity='full'):
     """Full RSA with detailed steps"""
+    if verbosity != 'full':
+        n = p * q
+        phi = (p - 1) * (q - 1)
+        gcd_val = gcd(e, phi)
+        if gcd_val != 1:
+            return {"success": False, "error": f"Invalid e: gcd({e}, {phi}) = {gcd_val}, must be 1"}
+        if m >= n:
+            return {"success": False, "error": f"Message m ({m}) must be less than n ({n})"}
+        d = private_exponent(e, phi)
+        c = pow(m, e, n)
+        m_dec = pow(c, d, n)
+        result = {"success": True, "p": p, "q": q, "n": n, "phi": phi, "e": e, "d": d,
+                  "m": m, "c": c, "m_decrypted": m_dec}
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_summary_lines(n, e, d, m, c, m_dec))]
+        return result
+    
     all_sections = []
     
     # Section 1: Input Parameters
@@ -321,21 +343,7 @@ Decrypted Message m = {m_dec}"""
     })
     
     # Section 9: Final Result
-    result_content = f"""RSA COMPLETE
-
-Original Message:    m = {m}
-Encrypted Ciphertext: c = {c}
-Decrypted Message:   m = {m_dec}
-
-Public Key:  (e, n) = ({e}, {n})
-Private Key: (d, n) = ({d}, {n})
-
-{"✓ Verification: Original message matches decrypted message!" if m == m_dec else "✗ Error: Messages don't match!"}"""
-    
-    all_sections.append({
-        "section": "Final Result",
-        "subsections": [{"title": "Summary", "content": result_content}]
-    })
+    all_sections.append(final_result_section(_summary_lines(n, e, d, m, c, m_dec)))
     
     return {
         "success": True,
@@ -351,6 +359,183 @@ Private Key: (d, n) = ({d}, {n})
         "sections": all_sections
     }
 
+# ========== RSA Engine (real-size keys) ==========
+
+def crt_key(p, q, e):
+    """Private key with CRT components: d, dp = d mod (p-1), dq = d mod (q-1), qinv = q⁻¹ mod p"""
+    phi = (p - 1) * (q - 1)
+    d = modinv(e, phi)
+    if d is None:
+        return None
+    return {"n": p * q, "e": e, "d": d, "p": p, "q": q,
+            "dp": d % (p - 1), "dq": d % (q - 1), "qinv": modinv(q, p)}
+
+def generate_keypair(bits, e=65537):
+    """RSA key of exactly `bits` bits from two Miller–Rabin primes with gcd(e, p-1) = 1.
+    Returns (key, candidates tested for p, for q)."""
+    coprime = lambda candidate: gcd(e, candidate - 1) == 1
+    p, tried_p = random_prime(bits - bits // 2, coprime)
+    while True:
+        q, tried_q = random_prime(bits // 2, coprime)
+        if q != p:
+            break
+    if p < q:
+        p, q = q, p
+    return crt_key(p, q, e), tried_p, tried_q
+
+def crt_decrypt(c, key):
+    """c^d mod n via two half-size exponentiations (Garner's recombination)"""
+    m1 = pow(c, key["dp"], key["p"])
+    m2 = pow(c, key["dq"], key["q"])
+    h = key["qinv"] * (m1 - m2) % key["p"]
+    return m2 + h * key["q"]
+
+def block_size(n):
+    """Message bytes per block: the largest count whose integer value is always < n"""
+    return (n.bit_length() - 1) // 8
+
+def encrypt_bytes(data, key):
+    """Split `data` into block_size(n) chunks and encrypt each as a big-endian integer"""
+    size = block_size(key["n"])
+    return [pow(int.from_bytes(data[i:i + size], 'big'), key["e"], key["n"])
+            for i in range(0, len(data), size)]
+
+def decrypt_blocks(blocks, key, length):
+    """Inverse of encrypt_bytes; `length` (total message bytes) restores leading zero bytes"""
+    size = block_size(key["n"])
+    out = bytearray()
+    for c in blocks:
+        chunk = min(size, length - len(out))
+        out += crt_decrypt(c, key).to_bytes(chunk, 'big')
+    return bytes(out)
+
+def _engine_summary_lines(key, message, blocks, decrypted):
+    """Lines of the engine's "Final Result" section"""
+    return [
+        "RSA ENGINE COMPLETE",
+        "",
+        f"Key size:   {key['n'].bit_length()} bits",
+        f"Public Key: (e, n) = ({key['e']}, {abbreviate(key['n'])})",
+        "",
+        f"Message:    {message!r} ({len(message.encode('utf-8'))} bytes)",
+        f"Blocks:     {len(blocks)} × up to {block_size(key['n'])} bytes",
+        f"Decrypted:  {decrypted!r}",
+        "",
+        "✓ Verification: CRT decryption recovered the message!" if decrypted == message else "✗ Error: Messages don't match!",
+    ]
+
+def rsa_engine_detailed(bits, e, message, p=None, q=None, verbosity='full'):
+    """Real-size RSA: Miller–Rabin key generation (or a supplied p, q), chunked byte
+    encryption and CRT decryption. Big integers are returned as hex strings."""
+    timings = {}
+    start = time.perf_counter()
+    if p is None:
+        key, tried_p, tried_q = generate_keypair(bits, e)
+    else:
+        if not (is_prime(p) and is_prime(q)) or p == q:
+            return {"success": False, "error": "p and q must be distinct primes"}
+        key, tried_p, tried_q = crt_key(max(p, q), min(p, q), e), None, None
+        if key is None:
+            return {"success": False, "error": f"Invalid e: gcd({e}, φ(n)) must be 1"}
+        if block_size(key["n"]) == 0:
+            return {"success": False, "error": "n must be at least 9 bits to hold one message byte"}
+    timings["keygen"] = time.perf_counter() - start
+    
+    data = message.encode('utf-8')
+    start = time.perf_counter()
+    blocks = encrypt_bytes(data, key)
+    timings["encrypt"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    decrypted = decrypt_blocks(blocks, key, len(data)).decode('utf-8')
+    timings["decrypt_crt"] = time.perf_counter() - start
+    
+    result = {
+        "success": True,
+        "bits": key["n"].bit_length(),
+        **{name: format(key[name], 'x') for name in ("n", "d", "p", "q", "dp", "dq", "qinv")},
+        "e": e,
+        "message": message,
+        "message_bytes": len(data),
+        "block_bytes": block_size(key["n"]),
+        "ciphertext": [format(c, 'x') for c in blocks],
+        "m_decrypted": decrypted,
+        "verified": decrypted == message,
+        "timings_ms": {name: round(seconds * 1000, 3) for name, seconds in timings.items()}
+    }
+    if verbosity == 'result':
+        return result
+    summary = final_result_section(_engine_summary_lines(key, message, blocks, decrypted))
+    if verbosity == 'summary':
+        result["sections"] = [summary]
+        return result
+    
+    all_sections = []
+    
+    # Section 1: Key Generation
+    if tried_p is None:
+        keygen_content = f"""Using the supplied primes (Miller–Rabin verified):
+  p = {abbreviate(key['p'])}
+  q = {abbreviate(key['q'])}"""
+    else:
+        keygen_content = f"""Random {bits // 2}-bit odd candidates with the top two bits set, so n = p × q has exactly {bits} bits.
+Each candidate is trial-divided by the primes below 1000, must satisfy gcd(e, p - 1) = 1,
+then passes {prime_rounds(bits // 2)} Miller–Rabin rounds with random bases (error < 2⁻¹⁰⁰).
+
+  p = {abbreviate(key['p'])}   ({tried_p} candidates tested)
+  q = {abbreviate(key['q'])}   ({tried_q} candidates tested)"""
+    keygen_content += f"""
+
+n = p × q = {abbreviate(key['n'])}
+φ(n) = (p - 1) × (q - 1)
+d = e⁻¹ mod φ(n) = {abbreviate(key['d'])}
+
+Time: {result['timings_ms']['keygen']} ms"""
+    
+    all_sections.append({
+        "section": "Key Generation",
+        "subsections": [{"title": f"{key['n'].bit_length()}-bit Key", "content": keygen_content}]
+    })
+    
+    # Section 2: Encryption
+    size = block_size(key["n"])
+    enc_content = f"""Message bytes (UTF-8): {len(data)}
+Block size: {size} bytes (the largest size whose value is always < n)
+Blocks: {len(blocks)}
+
+Each block mᵢ (big-endian integer) is encrypted as cᵢ = mᵢ^e mod n, e = {e}.
+
+Time: {result['timings_ms']['encrypt']} ms"""
+    
+    all_sections.append({
+        "section": "Encryption Process",
+        "subsections": [{"title": "Chunked Encryption", "content": enc_content}]
+    })
+    
+    # Section 3: CRT Decryption
+    dec_content = f"""Instead of one full-size cᵢ^d mod n, two half-size exponentiations:
+  dp = d mod (p - 1) = {abbreviate(key['dp'])}
+  dq = d mod (q - 1) = {abbreviate(key['dq'])}
+  qinv = q⁻¹ mod p   = {abbreviate(key['qinv'])}
+
+  m1 = c^dp mod p
+  m2 = c^dq mod q
+  h  = qinv × (m1 - m2) mod p
+  m  = m2 + h × q
+
+Half-size moduli and exponents make this about 4× faster than c^d mod n.
+
+Time: {result['timings_ms']['decrypt_crt']} ms"""
+    
+    all_sections.append({
+        "section": "Decryption Process",
+        "subsections": [{"title": "CRT Decryption", "content": dec_content}]
+    })
+    
+    all_sections.append(summary)
+    result["sections"] = all_sections
+    return result
+
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         self.send_response(200)
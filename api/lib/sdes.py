@@ -1,5 +1,32 @@
+import base64
 from http.server import BaseHTTPRequestHandler
+import functools
 import json
+import time
+
+try:
+    import numpy as np
+except ImportError:  # xor_bytes falls back to one big-integer XOR
+    np = None
+
+from narration import DEFAULT_MAX_STEPS, collect_sections, final_result_section
+from parallel import pool_map, split, worker_count
+
+# Bit-gather tables per (table, input width), and compiled keys per (key, tables)
+TABLE_CACHE_SIZE = 64
+KEY_CACHE_SIZE = 256
+# Without NumPy, CTR inputs at least this large are split across worker processes (with it,
+# one in-process XOR outruns shipping the chunks to a pool and back)
+CTR_PARALLEL_MIN = 8 * 1024 * 1024
+# Decrypted streams up to this size are also returned as UTF-8 text when they decode
+TEXT_RESULT_LIMIT = 64 * 1024
+# Key search: S-DES has 2¹⁰ keys; double S-DES key pairs found by meet in the middle are listed up to
+# this many (one known pair leaves ~4096 of the 2²⁰ consistent)
+KEY_SPACE = 1 << 10
+MITM_REPORT_LIMIT = 64
+# Byte → number of set bits, and byte → its bit b (bit 1 is the most significant) as 0/1
+POPCOUNT = bytes(bin(v).count('1') for v in range(256))
+OUTPUT_BITS = [bytes(v >> (7 - b) & 1 for v in range(256)) for b in range(8)]
 
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
@@ -62,8 +89,162 @@ def calculate_ip_inverse(IP):
     return IP_INV
 
 
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def bit_table(table, width):
+    """Bit-gather table of a 1-indexed permutation/selection table: the output for every
+    width-bit input (bit 1 is the most significant)"""
+    out = []
+    for x in range(1 << width):
+        value = 0
+        for src in table:
+            value = value << 1 | (x >> (width - src)) & 1
+        out.append(value)
+    return tuple(out)
+
+
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def sbox_table(box):
+    """4-bit input → 2-bit output of an S-box (row from bits 1 and 4, column from bits 2 and 3)"""
+    return tuple(int(box[(x >> 2 & 2) | (x & 1)][(x >> 1) & 3], 2) for x in range(16))
+
+
+def _rotate5(value, n):
+    return (value << n | value >> (5 - n)) & 0b11111
+
+
+def _subkeys(key, P10, P8):
+    """Integer K₁, K₂ of an integer 10-bit key: P10, LS-1 → P8, LS-2 → P8"""
+    p8 = bit_table(P8, 10)
+    shifted = bit_table(P10, 10)[key]
+    left, right = _rotate5(shifted >> 5, 1), _rotate5(shifted & 0b11111, 1)
+    return p8[left << 5 | right], p8[_rotate5(left, 2) << 5 | _rotate5(right, 2)]
+
+
+class SDESKey:
+    """A compiled key: integer subkeys K₁/K₂, the 16-entry round function of each round and the
+    full 256-entry encrypt/decrypt byte tables, so bulk work is one bytes.translate"""
+
+    def __init__(self, key, P10, P8, IP, EP, P4, S0, S1):
+        self.k1, self.k2 = _subkeys(key, P10, P8)
+        ep, p4, s0, s1 = bit_table(EP, 4), bit_table(P4, 4), sbox_table(S0), sbox_table(S1)
+        
+        def round_table(subkey):
+            return [p4[s0[(ep[r] ^ subkey) >> 4] << 2 | s1[(ep[r] ^ subkey) & 0xF]] for r in range(16)]
+        
+        self.f1, self.f2 = round_table(self.k1), round_table(self.k2)
+        self.ip = bit_table(IP, 8)
+        self.ip_inv = bit_table(tuple(calculate_ip_inverse(IP)), 8)
+        self.encrypt_table = bytes(self._block(x, self.f1, self.f2) for x in range(256))
+        self.decrypt_table = bytes(self._block(x, self.f2, self.f1) for x in range(256))
+
+    def _block(self, x, first, second):
+        """IP, fₖ, SW, fₖ, IP⁻¹ on one byte"""
+        x = self.ip[x]
+        x = ((x >> 4) ^ first[x & 0xF]) << 4 | (x & 0xF)
+        x = (x & 0xF) << 4 | x >> 4
+        x = ((x >> 4) ^ second[x & 0xF]) << 4 | (x & 0xF)
+        return self.ip_inv[x]
+
+    @property
+    def subkeys(self):
+        """K₁ and K₂ as bit strings"""
+        return format(self.k1, '08b'), format(self.k2, '08b')
+
+    def encrypt(self, data):
+        return data.translate(self.encrypt_table)
+
+    def decrypt(self, data):
+        return data.translate(self.decrypt_table)
+
+    @functools.cached_property
+    def chain_rows(self):
+        """CBC encryption as 256 rows of 256 bytes: chain_rows[previous][byte] = E(byte ⊕ previous)"""
+        return [bytes(self.encrypt_table[b ^ prev] for b in range(256)) for prev in range(256)]
+
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile(key, P10, P8, IP, EP, P4, S0, S1):
+    return SDESKey(key, P10, P8, IP, EP, P4, S0, S1)
+
+
+def compile_key(key, P10, P8, IP, EP, P4, S0, S1):
+    """Compiled key for a 10-bit key string (or int) and a set of tables, LRU-cached"""
+    return _compile(int(key, 2) if isinstance(key, str) else key, tuple(P10), tuple(P8), tuple(IP),
+                    tuple(EP), tuple(P4), tuple(map(tuple, S0)), tuple(map(tuple, S1)))
+
+
+def xor_bytes(a, b):
+    """Bytewise a ⊕ b of two equal-length byte strings (one big-integer XOR, or NumPy)"""
+    if np is not None:
+        return np.bitwise_xor(np.frombuffer(a, np.uint8), np.frombuffer(b, np.uint8)).tobytes()
+    return (int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def ecb_encrypt(key, data):
+    return key.encrypt(data)
+
+
+def ecb_decrypt(key, data):
+    return key.decrypt(data)
+
+
+def cbc_encrypt(key, data, iv):
+    """Cᵢ = E(Pᵢ ⊕ Cᵢ₋₁), C₀ = IV: inherently sequential, one row lookup per byte"""
+    rows = key.chain_rows
+    out = bytearray()
+    append = out.append
+    prev = iv
+    for b in data:
+        prev = rows[prev][b]
+        append(prev)
+    return bytes(out)
+
+
+def cbc_decrypt(key, data, iv):
+    """Pᵢ = D(Cᵢ) ⊕ Cᵢ₋₁: every block is independent, so one translate and one XOR"""
+    return xor_bytes(key.decrypt(data), bytes([iv]) + data[:-1])
+
+
+def ctr_keystream(encrypt_table, iv, offset, length):
+    """E(IV + i mod 256) for i in [offset, offset + length): with 8-bit blocks the counter
+    wraps, so the keystream repeats every 256 bytes"""
+    period = bytes(encrypt_table[(iv + i) & 0xFF] for i in range(256))
+    start = offset & 0xFF
+    return (period[start:] + period * (length // 256 + 1))[:length]
+
+
+def _ctr_chunk(task):
+    """CTR over one chunk of a stream; chunks only need their offset, so they run anywhere"""
+    encrypt_table, iv, offset, chunk = task
+    return xor_bytes(chunk, ctr_keystream(encrypt_table, iv, offset, len(chunk)))
+
+
+def ctr_crypt(key, data, iv, workers=None):
+    """CTR encryption and decryption (the same operation). Counter blocks are independent, so
+    the input can be split into chunks across a process pool (see CTR_PARALLEL_MIN)"""
+    workers = workers or (worker_count() if np is None and len(data) >= CTR_PARALLEL_MIN else 1)
+    tasks = [(key.encrypt_table, iv, start, data[start:stop]) for start, stop in split(len(data), workers)]
+    if len(tasks) <= 1:
+        return _ctr_chunk((key.encrypt_table, iv, 0, data))
+    return b''.join(pool_map(_ctr_chunk, tasks, workers))
+
+
+BLOCK_MODES = {
+    'ecb': (ecb_encrypt, ecb_decrypt),
+    'cbc': (cbc_encrypt, cbc_decrypt),
+    'ctr': (ctr_crypt, ctr_crypt),
+}
+
+
+def crypt_stream(key, data, block_mode, mode='encrypt', iv=0):
+    """Encrypt or decrypt a byte string in ECB, CBC or CTR mode"""
+    encrypt, decrypt = BLOCK_MODES[block_mode]
+    fn = encrypt if mode == 'encrypt' else decrypt
+    return fn(key, data) if block_mode == 'ecb' else fn(key, data, iv)
+
+
 def permute(bits, table):
-    return ''.join(bits[i-1] for i in table)
+    return format(bit_table(tuple(table), len(bits))[int(bits, 2)], f'0{len(table)}b')
 
 
 def left_shift(bits, n):
@@ -71,7 +252,7 @@ def left_shift(bits, n):
 
 
 def xor(a, b):
-    return ''.join('0' if i == j else '1' for i, j in zip(a, b))
+    return format(int(a, 2) ^ int(b, 2), f'0{len(a)}b')
 
 
 def sbox_lookup(bits, box):
@@ -86,6 +267,27 @@ def format_bits(bits):
     return ' '.join(bits)
 
 
+def generate_keys(key, P10, P8):
+    """K1 and K2 from the 10-bit key, no narration"""
+    K1, K2 = _subkeys(int(key, 2), tuple(P10), tuple(P8))
+    return format(K1, '08b'), format(K2, '08b')
+
+
+def _summary_lines(block, key, K1, K2, output, mode='encrypt'):
+    """Lines of the "Final Result" section"""
+    source, target = ('Plaintext', 'CIPHERTEXT') if mode == 'encrypt' else ('Ciphertext', 'PLAINTEXT')
+    return [
+        f"{mode.upper()}ION COMPLETE",
+        "",
+        f"{source + ':':<13}{format_bits(block)}",
+        f"Key:         {format_bits(key)}",
+        f"K₁:          {format_bits(K1)}",
+        f"K₂:          {format_bits(K2)}",
+        "",
+        f"★ {target}: {format_bits(output)}",
+    ]
+
+
 def generate_permutation_detail(input_bits, table, table_name):
     """Generate detailed permutation explanation"""
     lines = []
@@ -268,11 +470,42 @@ def fk_detailed(bits, key, EP, P4, S0, S1, round_num, key_name):
     return result, steps
 
 
-def encrypt_with_detailed_steps(plaintext, key, P10, P8, IP, IP_INV, EP, P4, S0, S1):
+def encrypt_with_detailed_steps(plaintext, key, P10, P8, IP, IP_INV, EP, P4, S0, S1, verbosity='full',
+                                schedule=None):
+    """schedule: compile_key(key, P10, P8, IP, EP, P4, S0, S1), when already built (used by non-full verbosity)"""
+    return _crypt_with_detailed_steps(plaintext, key, P10, P8, IP, IP_INV, EP, P4, S0, S1, verbosity, schedule, 'encrypt')
+
+
+def decrypt_with_detailed_steps(ciphertext, key, P10, P8, IP, IP_INV, EP, P4, S0, S1, verbosity='full',
+                                schedule=None):
+    """The same rounds with the subkeys in reverse order (K₂ first, then K₁)"""
+    return _crypt_with_detailed_steps(ciphertext, key, P10, P8, IP, IP_INV, EP, P4, S0, S1, verbosity, schedule, 'decrypt')
+
+
+def _crypt_with_detailed_steps(block, key, P10, P8, IP, IP_INV, EP, P4, S0, S1, verbosity, schedule, mode):
+    encrypting = mode == 'encrypt'
+    phase = "Encryption" if encrypting else "Decryption"
+    
+    def _result(output, K1, K2):
+        plaintext, ciphertext = (block, output) if encrypting else (output, block)
+        return {"success": True, "mode": mode, "plaintext": plaintext, "key": key, "ciphertext": ciphertext,
+                "K1": K1, "K2": K2, "IP_INV": IP_INV}
+    
+    if verbosity != 'full':
+        sdes = schedule or compile_key(key, P10, P8, IP, EP, P4, S0, S1)
+        K1, K2 = sdes.subkeys
+        table = sdes.encrypt_table if encrypting else sdes.decrypt_table
+        output = format(table[int(block, 2)], '08b')
+        result = _result(output, K1, K2)
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(
+                _summary_lines(block, key, K1, K2, output, mode))]
+        return result
+    
     all_sections = []
     
     # Section 1: Inputs & Parameters
-    inputs_content = f"""Plaintext (P): {format_bits(plaintext)} (8 bits)
+    inputs_content = f"""{'Plaintext (P)' if encrypting else 'Ciphertext (C)'}: {format_bits(block)} (8 bits)
 Key (K): {format_bits(key)} (10 bits)
 
 Standard Tables:
@@ -325,27 +558,28 @@ Column Selection: Use bits 2 and 3 (inner bits)"""
     })
     
     # Section 4: Initial Permutation
-    ip_result, ip_detail = generate_permutation_detail(plaintext, IP, "IP")
+    ip_result, ip_detail = generate_permutation_detail(block, IP, "IP")
     L0 = ip_result[:4]
     R0 = ip_result[4:]
     
     ip_subsections = [{
         "title": "Apply Initial Permutation (IP)",
-        "content": f"Input (Plaintext): {format_bits(plaintext)}\n\n{ip_detail}"
+        "content": f"Input ({'Plaintext' if encrypting else 'Ciphertext'}): {format_bits(block)}\n\n{ip_detail}"
     }, {
         "title": "Split into Halves",
         "content": f"L₀ (Left 4 bits):  {format_bits(L0)}\nR₀ (Right 4 bits): {format_bits(R0)}"
     }]
     
     all_sections.append({
-        "section": "Phase B: Encryption - Step 1: Initial Permutation",
+        "section": f"Phase B: {phase} - Step 1: Initial Permutation",
         "subsections": ip_subsections
     })
     
-    # Section 5: Round 1 (fk with K1)
-    r1_result, r1_steps = fk_detailed(ip_result, K1, EP, P4, S0, S1, 1, "K₁")
+    # Section 5: Round 1 (fk with K1; K2 when decrypting)
+    (first, first_name), (second, second_name) = ((K1, "K₁"), (K2, "K₂")) if encrypting else ((K2, "K₂"), (K1, "K₁"))
+    r1_result, r1_steps = fk_detailed(ip_result, first, EP, P4, S0, S1, 1, first_name)
     all_sections.append({
-        "section": "Phase B: Encryption - Step 2: Function fₖ (Round 1 with K₁)",
+        "section": f"Phase B: {phase} - Step 2: Function fₖ (Round 1 with {first_name})",
         "subsections": r1_steps
     })
     
@@ -362,24 +596,24 @@ After Switch (SW): {format_bits(sw_result)}
 The left and right halves are swapped."""
     
     all_sections.append({
-        "section": "Phase B: Encryption - Step 3: Switch (SW)",
+        "section": f"Phase B: {phase} - Step 3: Switch (SW)",
         "subsections": [{
             "title": "Swap Left and Right Halves",
             "content": sw_content
         }]
     })
     
-    # Section 7: Round 2 (fk with K2)
-    r2_result, r2_steps = fk_detailed(sw_result, K2, EP, P4, S0, S1, 2, "K₂")
+    # Section 7: Round 2 (fk with K2; K1 when decrypting)
+    r2_result, r2_steps = fk_detailed(sw_result, second, EP, P4, S0, S1, 2, second_name)
     all_sections.append({
-        "section": "Phase B: Encryption - Step 4: Function fₖ (Round 2 with K₂)",
+        "section": f"Phase B: {phase} - Step 4: Function fₖ (Round 2 with {second_name})",
         "subsections": r2_steps
     })
     
     # Section 8: Final Permutation (IP inverse)
     # Note: No swap after final round in S-DES
     final_input = r2_result
-    ciphertext, ipinv_detail = generate_permutation_detail(final_input, IP_INV, "IP⁻¹")
+    output, ipinv_detail = generate_permutation_detail(final_input, IP_INV, "IP⁻¹")
     
     final_content = f"""After Round 2: {format_bits(r2_result)}
   Left:  {format_bits(r2_result[:4])}
@@ -390,7 +624,7 @@ Combined Input for IP⁻¹: {format_bits(final_input)}
 {ipinv_detail}"""
     
     all_sections.append({
-        "section": "Phase B: Encryption - Step 5: Final Permutation (IP⁻¹)",
+        "section": f"Phase B: {phase} - Step 5: Final Permutation (IP⁻¹)",
         "subsections": [{
             "title": "Apply Inverse Initial Permutation",
             "content": final_content
@@ -398,30 +632,500 @@ Combined Input for IP⁻¹: {format_bits(final_input)}
     })
     
     # Section 9: Final Result
-    result_content = f"""ENCRYPTION COMPLETE
+    all_sections.append(final_result_section(_summary_lines(block, key, K1, K2, output, mode)))
+    
+    result = _result(output, K1, K2)
+    result["sections"] = all_sections
+    return result
 
-Plaintext:   {format_bits(plaintext)}
-Key:         {format_bits(key)}
-K₁:          {format_bits(K1)}
-K₂:          {format_bits(K2)}
 
-★ CIPHERTEXT: {format_bits(ciphertext)}"""
+def _encode(data, encoding):
+    return base64.b64encode(data).decode('ascii') if encoding == 'base64' else data.hex()
+
+
+def _block_lines(key, data, output, block_mode, mode, iv, max_steps):
+    """One line per block for the first max_steps blocks, with every value read from the
+    compiled key's tables"""
+    lines = []
+    prev = iv
+    for i, (x, y) in enumerate(zip(data[:max_steps], output)):
+        if block_mode == 'ecb':
+            lines.append(f"  Block {i+1}: {x:08b} → {'E' if mode == 'encrypt' else 'D'} → {y:08b}")
+        elif block_mode == 'ctr':
+            counter = (iv + i) & 0xFF
+            lines.append(f"  Block {i+1}: counter {counter:08b} → E → {key.encrypt_table[counter]:08b};  "
+                         f"{x:08b} ⊕ {key.encrypt_table[counter]:08b} = {y:08b}")
+        elif mode == 'encrypt':
+            lines.append(f"  Block {i+1}: {x:08b} ⊕ {prev:08b} = {x ^ prev:08b} → E → {y:08b}")
+            prev = y
+        else:
+            lines.append(f"  Block {i+1}: {x:08b} → D → {key.decrypt_table[x]:08b};  "
+                         f"⊕ {prev:08b} = {y:08b}")
+            prev = x
+    if len(data) > max_steps:
+        lines.append(f"  ⋯ {len(data) - max_steps:,} more blocks ⋯")
+    return lines
+
+
+def _stream_summary_lines(block_mode, mode, key, K1, K2, count, output, output_encoding):
+    """Lines of the "Final Result" section of a byte-stream run"""
+    return [
+        f"{block_mode.upper()} {'ENCRYPTION' if mode == 'encrypt' else 'DECRYPTION'} COMPLETE",
+        "",
+        f"Key:         {format_bits(key)}",
+        f"K₁:          {format_bits(K1)}",
+        f"K₂:          {format_bits(K2)}",
+        f"Bytes:       {count:,}",
+        "",
+        f"★ OUTPUT ({output_encoding}): {_encode(output[:48], output_encoding)}{'…' if len(output) > 48 else ''}",
+    ]
+
+
+def stream_with_detailed_steps(data, key, P10, P8, IP, EP, P4, S0, S1, block_mode='ecb', mode='encrypt', iv='00000000',
+                               output_encoding='base64', verbosity='full', max_steps=DEFAULT_MAX_STEPS, schedule=None):
+    """S-DES over a byte string in ECB, CBC or CTR mode (each byte is one 8-bit block).
+    schedule: compile_key(key, P10, P8, IP, EP, P4, S0, S1), when already built"""
+    sdes = schedule or compile_key(key, P10, P8, IP, EP, P4, S0, S1)
+    K1, K2 = sdes.subkeys
+    iv_value = int(iv, 2)
+    output = crypt_stream(sdes, data, block_mode, mode, iv_value)
+    
+    result = {"success": True, "mode": mode, "block_mode": block_mode, "key": key, "K1": K1, "K2": K2,
+              "bytes": len(data), "output": _encode(output, output_encoding), "output_encoding": output_encoding}
+    if block_mode != 'ecb':
+        result["iv"] = iv
+    if mode == 'decrypt' and len(output) <= TEXT_RESULT_LIMIT:
+        try:
+            result["text"] = output.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    
+    summary = final_result_section(_stream_summary_lines(block_mode, mode, key, K1, K2, len(data), output, output_encoding))
+    if verbosity == 'result':
+        return result
+    if verbosity == 'summary':
+        result["sections"] = [summary]
+        return result
+    
+    all_sections = []
+    
+    # Section 1: Input & Mode
+    descriptions = {
+        'ecb': "ECB: every byte is encrypted on its own, Cᵢ = E(Pᵢ) (one table lookup per byte)",
+        'cbc': "CBC: each block is chained to the previous ciphertext, Cᵢ = E(Pᵢ ⊕ Cᵢ₋₁), C₀ = IV",
+        'ctr': "CTR: a counter is encrypted into a keystream, Cᵢ = Pᵢ ⊕ E(IV + i mod 256)",
+    }
+    input_lines = [
+        f"Input: {len(data):,} bytes ({len(data):,} blocks of 8 bits)",
+        f"Key (K): {format_bits(key)}",
+        f"K₁ = {format_bits(K1)}, K₂ = {format_bits(K2)}",
+    ]
+    if block_mode != 'ecb':
+        input_lines.append(f"IV: {format_bits(iv)}")
+    input_lines.append("")
+    input_lines.append(descriptions[block_mode])
+    input_lines.append("")
+    input_lines.append("The key is compiled once into 256-entry encrypt and decrypt tables (every possible")
+    input_lines.append("block through IP, fₖ, SW, fₖ, IP⁻¹), so each block below is a table lookup.")
     
     all_sections.append({
-        "section": "Final Result",
-        "subsections": [{
-            "title": "Summary",
-            "content": result_content
-        }]
+        "section": "1. Input & Block Mode",
+        "subsections": [{"title": f"{block_mode.upper()} {mode}", "content": '\n'.join(input_lines)}]
     })
     
+    # Section 2: Blocks
+    all_sections.append({
+        "section": "2. Blocks",
+        "subsections": [{"title": f"First {min(max_steps, len(data))} blocks",
+                         "content": '\n'.join(_block_lines(sdes, data, output, block_mode, mode, iv_value, max_steps))}]
+    })
+    
+    # Section 3: Final Result
+    all_sections.append(summary)
+    result["sections"] = all_sections
+    return result
+
+
+def search_tables(P10, P8, IP, EP, P4, S0, S1):
+    """(K₁ of every key, K₂ of every key, round tables) for the key searches"""
+    k1, k2 = all_subkeys(tuple(P10), tuple(P8))
+    return k1, k2, _round_tables(tuple(IP), tuple(EP), tuple(P4), tuple(map(tuple, S0)), tuple(map(tuple, S1)))
+
+
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def all_subkeys(P10, P8):
+    """K₁ and K₂ of all 1024 keys, indexed by key (integer arrays with NumPy)"""
+    k1, k2 = zip(*(_subkeys(key, P10, P8) for key in range(KEY_SPACE)))
+    if np is not None:
+        return np.array(k1), np.array(k2)
+    return k1, k2
+
+
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _round_tables(IP, EP, P4, S0, S1):
+    """IP, IP⁻¹, E/P and the S-boxes plus P4 as one table over the 8-bit value E/P(R) ⊕ K"""
+    p4, s0, s1 = bit_table(P4, 4), sbox_table(S0), sbox_table(S1)
+    sp = tuple(p4[s0[x >> 4] << 2 | s1[x & 0xF]] for x in range(256))
+    tables = (bit_table(IP, 8), bit_table(tuple(calculate_ip_inverse(IP)), 8), bit_table(EP, 4), sp)
+    if np is not None:
+        return tuple(np.array(t) for t in tables)
+    return tables
+
+
+def _crypt_block(x, first, second, tables):
+    """One block through IP, fₖ, SW, fₖ, IP⁻¹. first/second are the round subkeys: ints, or
+    NumPy arrays holding one subkey per key, so every key is tried in the same few operations"""
+    ip, ip_inv, ep, sp = tables
+    x = ip[x]
+    left, right = x >> 4, x & 0xF
+    mixed = left ^ sp[ep[right] ^ first]
+    return ip_inv[(right ^ sp[ep[mixed] ^ second]) << 4 | mixed]
+
+
+def _all_keys(x, first, second, tables):
+    """_crypt_block of x under all 1024 keys, as a list indexed by key"""
+    if np is not None:
+        return _crypt_block(x, first, second, tables).tolist()
+    return [_crypt_block(x, a, b, tables) for a, b in zip(first, second)]
+
+
+def brute_force(pairs, P10, P8, IP, EP, P4, S0, S1):
+    """Every key with E_K(p) = c for all (p, c) integer pairs, and the keys left after each pair"""
+    k1, k2, tables = search_tables(P10, P8, IP, EP, P4, S0, S1)
+    remaining = []
+    if np is not None:
+        consistent = np.ones(KEY_SPACE, dtype=bool)
+        for p, c in pairs:
+            consistent &= _crypt_block(p, k1, k2, tables) == c
+            remaining.append(int(consistent.sum()))
+        return np.flatnonzero(consistent).tolist(), remaining
+    keys = range(KEY_SPACE)
+    for p, c in pairs:
+        keys = [k for k in keys if _crypt_block(p, k1[k], k2[k], tables) == c]
+        remaining.append(len(keys))
+    return list(keys), remaining
+
+
+def meet_in_the_middle(pairs, P10, P8, IP, EP, P4, S0, S1):
+    """Double S-DES, C = E_Kb(E_Ka(P)): every (Ka, Kb) consistent with all pairs.
+    The middle values E_Ka(p) of every first key are hashed; each second key then looks up
+    its D_Kb(c) values, so 2 × 1024 block operations per pair replace the 2²⁰ key pairs.
+    Returns (first MITM_REPORT_LIMIT matches, total matches, distinct middle values)."""
+    k1, k2, tables = search_tables(P10, P8, IP, EP, P4, S0, S1)
+    forward = [_all_keys(p, k1, k2, tables) for p, _ in pairs]
+    backward = [_all_keys(c, k2, k1, tables) for _, c in pairs]
+    
+    middles = {}
+    for ka, middle in enumerate(zip(*forward)):
+        middles.setdefault(middle, []).append(ka)
+    
+    matches = []
+    total = 0
+    for kb, middle in enumerate(zip(*backward)):
+        hits = middles.get(middle)
+        if hits:
+            total += len(hits)
+            matches.extend((ka, kb) for ka in hits[:MITM_REPORT_LIMIT - len(matches)])
+    return matches, total, len(middles)
+
+
+def _key_lines(key, P10, P8):
+    K1, K2 = generate_keys(key, P10, P8)
+    return f"K = {format_bits(key)}   (K₁ = {format_bits(K1)}, K₂ = {format_bits(K2)})"
+
+
+def _attack_summary_lines(mode, count, first):
+    """Lines of the "Final Result" section of a key search"""
+    lines = [f"{'DOUBLE S-DES MEET IN THE MIDDLE' if mode == 'double' else 'S-DES KEY SEARCH'} COMPLETE", ""]
+    if not count:
+        lines.append("No key is consistent with every pair")
+        return lines
+    lines.append(f"Consistent {'key pairs' if mode == 'double' else 'keys'}: {count:,}")
+    lines.append("")
+    if mode == 'double':
+        lines.append(f"★ KEYS: Ka = {format_bits(first[0])}, Kb = {format_bits(first[1])}")
+    else:
+        lines.append(f"★ KEY: {format_bits(first)}")
+    if count > 1:
+        lines.append("")
+        lines.append(f"The first of {count:,}: more pairs narrow the list, unless the keys are equivalent")
+        lines.append("(they then agree on every block and no pair can tell them apart).")
+    return lines
+
+
+def _run_attack(pairs, mode, P10, P8, IP, EP, P4, S0, S1):
+    """The search itself, timed; the result dict every verbosity returns"""
+    blocks = [(int(p, 2), int(c, 2)) for p, c in pairs]
+    start = time.perf_counter()
+    if mode == 'double':
+        matches, total, middles = meet_in_the_middle(blocks, P10, P8, IP, EP, P4, S0, S1)
+        result = {"key_pairs": [[format(a, '010b'), format(b, '010b')] for a, b in matches],
+                  "count": total, "middle_values": middles}
+    else:
+        keys, remaining = brute_force(blocks, P10, P8, IP, EP, P4, S0, S1)
+        result = {"keys": [format(k, '010b') for k in keys], "count": len(keys), "remaining": remaining}
+    result["ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return {"success": True, "mode": mode, "pairs": [list(pair) for pair in pairs], **result}
+
+
+def _first_found(result):
+    if not result["count"]:
+        return None
+    return result["key_pairs"][0] if result["mode"] == 'double' else result["keys"][0]
+
+
+def sdes_attack_sections(pairs, P10, P8, IP, EP, P4, S0, S1, mode='single'):
+    """S-DES known-plaintext key search, yielding each explanation section as soon as it is built"""
+    double = mode == 'double'
+    
+    # Section 1: Known Pairs & Key Space
+    space_lines = []
+    for i, (p, c) in enumerate(pairs, 1):
+        space_lines.append(f"  Pair {i}: P = {format_bits(p)}  →  C = {format_bits(c)}")
+    space_lines.append("")
+    if double:
+        space_lines.append("Double S-DES: C = E_Kb(E_Ka(P)), a 20-bit key space of 2²⁰ = 1,048,576 key pairs.")
+        space_lines.append("Meet in the middle: encrypt each P under all 1024 first keys Ka and hash the middle")
+        space_lines.append("values; decrypt each C under all 1024 second keys Kb and look the result up.")
+        space_lines.append(f"That is 2 × 1,024 block operations per pair instead of {1 << 20:,}.")
+    else:
+        space_lines.append("S-DES has a 10-bit key: all 2¹⁰ = 1,024 keys are tried against every pair.")
+        space_lines.append("K₁ and K₂ of all keys are computed once; each pair is then pushed through IP, fₖ, SW,")
+        space_lines.append("fₖ, IP⁻¹ for every key at once (one integer array per round value).")
+    
+    yield {
+        "section": "1. Known Pairs & Key Space",
+        "subsections": [{"title": "Double S-DES" if double else "Single S-DES", "content": '\n'.join(space_lines)}]
+    }
+    
+    result = _run_attack(pairs, mode, P10, P8, IP, EP, P4, S0, S1)
+    
+    # Section 2: Search
+    search_lines = []
+    if double:
+        search_lines.append(f"Forward table: 1,024 first keys → {result['middle_values']:,} distinct middle values")
+        search_lines.append(f"Backward lookups: 1,024 second keys → {result['count']:,} matching key pairs")
+    else:
+        for i, left in enumerate(result["remaining"], 1):
+            search_lines.append(f"  After pair {i}: {left:,} of 1,024 keys consistent")
+    search_lines.append("")
+    search_lines.append(f"Search time: {result['ms']:,.2f} ms")
+    
+    yield {
+        "section": "2. Search",
+        "subsections": [{"title": "Meet in the middle" if double else "Filtering all keys", "content": '\n'.join(search_lines)}]
+    }
+    
+    # Section 3: Consistent Keys
+    key_lines = []
+    if double:
+        for a, b in result["key_pairs"]:
+            key_lines.append(f"  Ka = {format_bits(a)}, Kb = {format_bits(b)}")
+        if result["count"] > len(result["key_pairs"]):
+            key_lines.append(f"  ⋯ {result['count'] - len(result['key_pairs']):,} more ⋯")
+    else:
+        for key in result["keys"]:
+            key_lines.append("  " + _key_lines(key, P10, P8))
+    
+    yield {
+        "section": "3. Consistent Keys",
+        "subsections": [{"title": f"{result['count']:,} found", "content": '\n'.join(key_lines) or "None"}]
+    }
+    
+    # Section 4: Final Result
+    yield final_result_section(_attack_summary_lines(mode, result["count"], _first_found(result)))
+    
+    return result
+
+
+def sdes_attack_detailed(pairs, P10, P8, IP, EP, P4, S0, S1, mode='single', verbosity='full'):
+    """S-DES known-plaintext key search with detailed steps"""
+    if verbosity != 'full':
+        result = _run_attack(pairs, mode, P10, P8, IP, EP, P4, S0, S1)
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_attack_summary_lines(mode, result["count"], _first_found(result)))]
+        return result
+    
+    return collect_sections(sdes_attack_sections(pairs, P10, P8, IP, EP, P4, S0, S1, mode))
+
+
+def difference_table(box):
+    """DDT of a 4-bit → 2-bit S-box: [Δin][Δout] = #{x : S(x) ⊕ S(x ⊕ Δin) = Δout}"""
+    out = sbox_table(tuple(map(tuple, box)))
+    table = [[0] * 4 for _ in range(16)]
+    for delta in range(16):
+        for x in range(16):
+            table[delta][out[x] ^ out[x ^ delta]] += 1
+    return table
+
+
+def linear_table(box):
+    """LAT of a 4-bit → 2-bit S-box: [a][b] = #{x : a·x = b·S(x)} − 8 (the bias, in sixteenths)"""
+    out = sbox_table(tuple(map(tuple, box)))
+    return [[sum(POPCOUNT[a & x] & 1 == POPCOUNT[b & out[x]] & 1 for x in range(16)) - 8 for b in range(4)]
+            for a in range(16)]
+
+
+def cipher_table(P10, P8, IP, EP, P4, S0, S1):
+    """E_K(x) for every key and block: 1024 × 256 bytes, byte K·256 + x"""
+    k1, k2, tables = search_tables(P10, P8, IP, EP, P4, S0, S1)
+    if np is not None:
+        return _crypt_block(np.arange(256), k1[:, None], k2[:, None], tables).astype(np.uint8).tobytes()
+    return b''.join(bytes(_crypt_block(x, a, b, tables) for x in range(256)) for a, b in zip(k1, k2))
+
+
+def _swap_halves(data, size):
+    """data with every adjacent pair of size-byte runs swapped: byte i moves to i ⊕ size"""
+    if np is not None:
+        return np.frombuffer(data, np.uint8).reshape(-1, 2, size)[:, ::-1].tobytes()
+    return b''.join(data[i + size:i + 2 * size] + data[i:i + size] for i in range(0, len(data), 2 * size))
+
+
+def _flip_stats(table, distance):
+    """Output differences between every (block, key) and its neighbour `distance` bytes away:
+    mean flipped bits, probability each output bit flips, and the Hamming-distance histogram"""
+    diff = xor_bytes(table, _swap_halves(table, distance))
+    if np is not None:
+        # One pass counting every difference value; both statistics follow from the 256 counts
+        counts = np.bincount(np.frombuffer(diff, np.uint8), minlength=256).tolist()
+        histogram = [0] * 9
+        for v, n in enumerate(counts):
+            histogram[POPCOUNT[v]] += n
+        flipped = [sum(n for v, n in enumerate(counts) if v >> (7 - b) & 1) for b in range(8)]
+    else:
+        weights = diff.translate(POPCOUNT)
+        histogram = [weights.count(v) for v in range(9)]
+        flipped = [diff.translate(bits).count(1) for bits in OUTPUT_BITS]
     return {
-        "success": True,
-        "plaintext": plaintext,
-        "key": key,
-        "ciphertext": ciphertext,
-        "K1": K1,
-        "K2": K2,
-        "IP_INV": IP_INV,
-        "sections": all_sections
-    }
\ No newline at end of file
+        "mean": sum(v * n for v, n in enumerate(histogram)) / len(diff),
+        "probabilities": [round(n / len(diff), 4) for n in flipped],
+        "histogram": histogram,
+    }
+
+
+def avalanche(table):
+    """Avalanche of the full cipher over all 256 × 1024 (block, key) combinations, flipping each
+    plaintext bit (neighbours 2^(8−i) bytes apart) and each key bit (256 · 2^(10−j) bytes apart)"""
+    result = {}
+    for name, width, unit in (("plaintext", 8, 1), ("key", 10, 256)):
+        flips = [_flip_stats(table, unit << (width - bit)) for bit in range(1, width + 1)]
+        histogram = [sum(column) for column in zip(*(f["histogram"] for f in flips))]
+        result[name] = {
+            "mean": round(sum(f["mean"] for f in flips) / width, 4),
+            "per_bit": [round(f["mean"], 4) for f in flips],
+            "probabilities": [f["probabilities"] for f in flips],
+            "histogram": histogram,
+            "sac_deviation": round(max(abs(p - 0.5) for f in flips for p in f["probabilities"]), 4),
+        }
+    return result
+
+
+def _box_stats(box):
+    ddt, lat = difference_table(box), linear_table(box)
+    return {
+        "ddt": ddt,
+        "lat": lat,
+        "differential_uniformity": max(max(row) for row in ddt[1:]),
+        "linearity": max(abs(v) for row in lat for v in row[1:]),
+    }
+
+
+def _run_analysis(P10, P8, IP, EP, P4, S0, S1):
+    """S-box tables and avalanche statistics, timed; the result dict every verbosity returns"""
+    start = time.perf_counter()
+    result = {"success": True, "S0": _box_stats(S0), "S1": _box_stats(S1),
+              "avalanche": avalanche(cipher_table(P10, P8, IP, EP, P4, S0, S1)),
+              "combinations": 256 * KEY_SPACE}
+    result["ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+def _table_lines(table, row_label, col_label, width):
+    """A DDT/LAT as aligned text: one row per input mask/difference"""
+    lines = [f"{row_label:>6} │ " + ' '.join(f"{col_label}={b:02b}".rjust(width) for b in range(len(table[0])))]
+    lines.append("───────┼─" + '─' * ((width + 1) * len(table[0])))
+    for a, row in enumerate(table):
+        lines.append(f"{a:04b}".rjust(6) + " │ " + ' '.join(f"{v:>{width}}" for v in row))
+    return lines
+
+
+def _avalanche_lines(stats, name, width):
+    lines = [f"Bit │ mean flipped │ P(output bit 1..8 flips)"]
+    for bit, (mean, probs) in enumerate(zip(stats["per_bit"], stats["probabilities"]), 1):
+        lines.append(f"{bit:>3} │ {mean:>12.3f} │ " + ' '.join(f"{p:.2f}" for p in probs))
+    lines.append("")
+    lines.append(f"Mean output bits flipped per {name} bit: {stats['mean']:.3f} of 8 (ideal 4)")
+    lines.append(f"Largest deviation from the strict avalanche criterion (P = 0.5): {stats['sac_deviation']:.3f}")
+    lines.append("Hamming distance histogram: " + ', '.join(f"{d}:{n:,}" for d, n in enumerate(stats["histogram"])))
+    return lines
+
+
+def _analysis_summary_lines(result):
+    """Lines of the "Final Result" section of an S-box/avalanche analysis"""
+    return [
+        "S-DES ANALYSIS COMPLETE",
+        "",
+        f"S0: differential uniformity {result['S0']['differential_uniformity']} of 16, "
+        f"linearity {result['S0']['linearity']} of 8",
+        f"S1: differential uniformity {result['S1']['differential_uniformity']} of 16, "
+        f"linearity {result['S1']['linearity']} of 8",
+        "",
+        f"Combinations: {result['combinations']:,} (block, key)",
+        f"★ AVALANCHE: {result['avalanche']['plaintext']['mean']:.3f} bits per plaintext bit, "
+        f"{result['avalanche']['key']['mean']:.3f} per key bit (ideal 4)",
+    ]
+
+
+def sdes_analysis_sections(P10, P8, IP, EP, P4, S0, S1):
+    """S-box DDT/LAT and full-cipher avalanche analysis, yielding each explanation section as soon as it is built"""
+    result = _run_analysis(P10, P8, IP, EP, P4, S0, S1)
+    
+    # Section 1: S-Boxes
+    subsections = []
+    for name in ("S0", "S1"):
+        stats = result[name]
+        ddt_lines = ["DDT[Δin][Δout] = number of inputs x with S(x) ⊕ S(x ⊕ Δin) = Δout", ""]
+        ddt_lines.extend(_table_lines(stats["ddt"], "Δin", "Δout", 8))
+        ddt_lines.append("")
+        ddt_lines.append(f"Differential uniformity (largest entry with Δin ≠ 0): {stats['differential_uniformity']} of 16")
+        lat_lines = ["LAT[a][b] = #{x : a·x = b·S(x)} − 8 (0 means no linear bias)", ""]
+        lat_lines.extend(_table_lines(stats["lat"], "a", "b", 5))
+        lat_lines.append("")
+        lat_lines.append(f"Linearity (largest |bias| with b ≠ 0): {stats['linearity']} of 8")
+        subsections.append({"title": f"{name} Difference Distribution Table", "content": '\n'.join(ddt_lines)})
+        subsections.append({"title": f"{name} Linear Approximation Table", "content": '\n'.join(lat_lines)})
+    
+    yield {"section": "1. S-Box Tables", "subsections": subsections}
+    
+    # Section 2: Avalanche
+    method_lines = [
+        f"Every one of the {result['combinations']:,} (block, key) combinations is encrypted once into a",
+        "1024 × 256 table. Flipping a plaintext or key bit pairs each entry with another entry of the",
+        "same table, so each bit is one XOR of the whole table with a reordered copy.",
+        "",
+        f"Time: {result['ms']:,.1f} ms",
+    ]
+    yield {
+        "section": "2. Avalanche",
+        "subsections": [
+            {"title": "Method", "content": '\n'.join(method_lines)},
+            {"title": "Flipping one plaintext bit", "content": '\n'.join(_avalanche_lines(result["avalanche"]["plaintext"], "plaintext", 8))},
+            {"title": "Flipping one key bit", "content": '\n'.join(_avalanche_lines(result["avalanche"]["key"], "key", 10))},
+        ]
+    }
+    
+    # Section 3: Final Result
+    yield final_result_section(_analysis_summary_lines(result))
+    
+    return result
+
+
+def sdes_analysis_detailed(P10, P8, IP, EP, P4, S0, S1, verbosity='full'):
+    """S-box DDT/LAT and full-cipher avalanche analysis with detailed steps"""
+    if verbosity != 'full':
+        result = _run_analysis(P10, P8, IP, EP, P4, S0, S1)
+        if verbosity == 'summary':
+            result["sections"] = [final_result_section(_analysis_summary_lines(result))]
+        return result
+    
+    return collect_sections(sdes_analysis_sections(P10, P8, IP, EP, P4, S0, S1))
@@ -1,6 +1,8 @@
 from http.server import BaseHTTPRequestHandler
 import json
 
+from narration import final_result_section
+
 def prepare_input(text, key):
     """Clean inputs - uppercase, letters only"""
     text = "".join([c.upper() for c in text if c.isalpha()])
@@ -8,13 +10,62 @@ def prepare_input(text, key):
     return text, key
 
 
-def vigenere_encrypt_detailed(plaintext, key):
+def vigenere_encrypt(text, key):
+    """Vigenere encryption of cleaned text, no narration"""
+    shifts = [ord(k) - 65 for k in key]
+    return ''.join(chr((ord(c) - 65 + shifts[i % len(shifts)]) % 26 + 65) for i, c in enumerate(text))
+
+
+def vigenere_decrypt(text, key):
+    """Vigenere decryption of cleaned text, no narration"""
+    shifts = [ord(k) - 65 for k in key]
+    return ''.join(chr((ord(c) - 65 - shifts[i % len(shifts)]) % 26 + 65) for i, c in enumerate(text))
+
+
+def autokey_encrypt(text, keyword):
+    """Autokey encryption of cleaned text, no narration"""
+    full_key = keyword + text
+    return ''.join(chr((ord(c) + ord(full_key[i]) - 130) % 26 + 65) for i, c in enumerate(text))
+
+
+def autokey_decrypt(text, keyword):
+    """Autokey decryption of cleaned text, no narration"""
+    current_key = list(keyword)
+    result = []
+    for i, c in enumerate(text):
+        p_char = chr((ord(c) - ord(current_key[i])) % 26 + 65)
+        result.append(p_char)
+        current_key.append(p_char)
+    return ''.join(result)
+
+
+def _summary_lines(title, in_label, text, key, out_label, output):
+    """Lines of the compact "Final Result" section"""
+    return [
+        title,
+        "",
+        f"{in_label + ':':<11} {text}",
+        f"{'Keyword:':<11} {key}",
+        "",
+        f"★ {out_label}: {output}",
+    ]
+
+
+def vigenere_encrypt_detailed(plaintext, key, verbosity='full'):
     """Standard Vigenere encryption with detailed steps"""
     all_sections = []
     
     # Clean inputs
     text, key = prepare_input(plaintext, key)
     
+    if verbosity != 'full':
+        result = vigenere_encrypt(text, key)
+        response = {"success": True, "mode": "encrypt", "cipher_type": "vigenere", "ciphertext": result}
+        if verbosity == 'summary':
+            response["sections"] = [final_result_section(
+                _summary_lines("VIGENÈRE ENCRYPTION COMPLETE", "Plaintext", text, key, "CIPHERTEXT", result))]
+        return response
+    
     # Section 1: Input Parameters
     input_content = f"""Original Plaintext: {plaintext}
 Cleaned Plaintext: {text}
@@ -104,12 +155,20 @@ Vigenère Cipher Overview:
     }
 
 
-def vigenere_decrypt_detailed(ciphertext, key):
+def vigenere_decrypt_detailed(ciphertext, key, verbosity='full'):
     """Standard Vigenere decryption with detailed steps"""
     all_sections = []
     
     text, key = prepare_input(ciphertext, key)
     
+    if verbosity != 'full':
+        result = vigenere_decrypt(text, key)
+        response = {"success": True, "mode": "decrypt", "cipher_type": "vigenere", "plaintext": result}
+        if verbosity == 'summary':
+            response["sections"] = [final_result_section(
+                _summary_lines("VIGENÈRE DECRYPTION COMPLETE", "Ciphertext", text, key, "PLAINTEXT", result))]
+        return response
+    
     # Section 1: Input
     input_content = f"""Ciphertext: {text}
 Keyword: {key}
@@ -185,12 +244,20 @@ Alignment:
     }
 
 
-def autokey_encrypt_detailed(plaintext, keyword):
+def autokey_encrypt_detailed(plaintext, keyword, verbosity='full'):
     """Autokey cipher encryption with detailed steps"""
     all_sections = []
     
     text, keyword = prepare_input(plaintext, keyword)
     
+    if verbosity != 'full':
+        result = autokey_encrypt(text, keyword)
+        response = {"success": True, "mode": "encrypt", "cipher_type": "autokey", "ciphertext": result}
+        if verbosity == 'summary':
+            response["sections"] = [final_result_section(
+                _summary_lines("AUTOKEY ENCRYPTION COMPLETE", "Plaintext", text, keyword, "CIPHERTEXT", result))]
+        return response
+    
     # Section 1: Input
     input_content = f"""Plaintext: {text}
 Keyword: {keyword}
@@ -283,12 +350,20 @@ Autokey Cipher Overview:
     }
 
 
-def autokey_decrypt_detailed(ciphertext, keyword):
+def autokey_decrypt_detailed(ciphertext, keyword, verbosity='full'):
     """Autokey cipher decryption with detailed steps"""
     all_sections = []
     
     text, keyword = prepare_input(ciphertext, keyword)
     
+    if verbosity != 'full':
+        result = autokey_decrypt(text, keyword)
+        response = {"success": True, "mode": "decrypt", "cipher_type": "autokey", "plaintext": result}
+        if verbosity == 'summary':
+            response["sections"] = [final_result_section(
+                _summary_lines("AUTOKEY DECRYPTION COMPLETE", "Ciphertext", text, keyword, "PLAINTEXT", result))]
+        return response
+    
     # Section 1: Input
     input_content = f"""Ciphertext: {text}
 Keyword: {keyword}
@@ -0,0 +1,48 @@
+"""
+Messages/sec encrypting N messages as N single requests vs one batch request.
+Both sides use verbosity "result"; messages cycle through a few keys so the batch
+reuses each key schedule (Playfair matrix, ADFGVX square, Hill inverse, S-DES K1/K2).
+
+Run: python benchmarks/bench_batch.py
+"""
+
+from harness import load_entry, post, throughput, print_table
+
+MESSAGES = 200
+KEYS = 4
+
+TEXTS = ['WEAREDISCOVEREDFLEEATONCE', 'ATTACKATDAWN', 'MEETMEAFTERTHETOGAPARTY', 'HELLOWORLD']
+
+CASES = [
+    ('playfair', lambda i: {'keyword': f'MONARCHY{"ABCD"[i % KEYS]}', 'plaintext': TEXTS[i % len(TEXTS)]}),
+    ('adfgvx', lambda i: {'polyKey': f'privacy{i % KEYS}', 'transKey': 'cipher', 'plaintext': TEXTS[i % len(TEXTS)]}),
+    ('hill', lambda i: {'m': 2, 'keyMatrix': [[3, 3 + 2 * (i % KEYS)], [2, 5]], 'plaintext': 'HELPME'}),
+    ('sdes', lambda i: {'key': format(0b1010000010 + i % KEYS, '010b'), 'plaintext': format(i % 256, '08b')}),
+]
+
+
+def main():
+    handler_cls = load_entry('co1').handler
+    rows = []
+    for cipher, make in CASES:
+        jobs = [{'cipher': cipher, 'params': make(i)} for i in range(MESSAGES)]
+        singles = [dict(job['params'], cipher=cipher, verbosity='result') for job in jobs]
+
+        def run_singles():
+            for payload in singles:
+                status, _, _ = post(handler_cls, payload)
+                assert status == 200, f'{cipher}: HTTP {status}'
+
+        def run_batch():
+            status, _, _ = post(handler_cls, {'jobs': jobs})
+            assert status == 200, f'{cipher} batch: HTTP {status}'
+
+        single_rate = throughput(run_singles) * MESSAGES
+        batch_rate = throughput(run_batch) * MESSAGES
+        rows.append((cipher, f'{single_rate:,.0f}', f'{batch_rate:,.0f}', f'{batch_rate / single_rate:.1f}x'))
+
+    print_table(('cipher', 'single msg/s', 'batch msg/s', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Response size and time of a narrated mod-exp with huge exponents: the default
+step cap (first/last 16 bits in full, abbreviated numbers) vs narrating every bit.
+
+Run: python benchmarks/bench_bounded_narration.py
+"""
+
+import time
+
+from harness import load_entry, post, print_table
+
+BITS = (256, 1024, 4096)
+MODULUS = 2 ** 2048 - 159
+UNCAPPED = 10 ** 6
+
+
+def timed(handler_cls, payload):
+    """(seconds, body bytes) for one request"""
+    start = time.perf_counter()
+    status, _, body = post(handler_cls, payload)
+    assert status == 200, f'HTTP {status}'
+    return time.perf_counter() - start, len(body)
+
+
+def main():
+    handler_cls = load_entry('math-ops').handler
+    rows = []
+    for bits in BITS:
+        payload = {'operation': 'mod-exp', 'a': 7, 'n': 2 ** bits - 1, 'm': MODULUS}
+        capped_time, capped_size = timed(handler_cls, payload)
+        full_time, full_size = timed(handler_cls, dict(payload, maxSteps=UNCAPPED))
+        rows.append((bits, f'{full_size:,}', f'{full_time * 1000:,.0f}',
+                     f'{capped_size:,}', f'{capped_time * 1000:,.0f}', f'{full_size / capped_size:.0f}x'))
+
+    print_table(('exponent bits', 'every step B', 'ms', 'capped B', 'ms', 'smaller'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Time to compute φ(n) for moduli of growing size: the old p += 1 trial division
+(only run where it finishes quickly), the factorization engine on a cold cache,
+and the engine again for a repeated modulus (cached).
+
+Run: python benchmarks/bench_factorization.py
+"""
+
+import time
+
+from harness import print_table
+import numtheory
+
+MODULI = [
+    ('12 digits, prime', 999999999989),
+    ('12 digits, 3 factors', 600851475143),
+    ('20 digits', 10 ** 20 + 1),
+    ('20 digits, 2 large primes', 1000000007 * 99999999977),
+    ('28 digits, 2 Mersenne primes', (2 ** 31 - 1) * (2 ** 61 - 1)),
+    ('48 digits, smooth', 3 ** 100 - 1),
+]
+TRIAL_DIVISION_MAX = 10 ** 13
+
+
+def trial_division_totient(n):
+    """The original euler.totient: p runs over every integer up to √n"""
+    result = n
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            while n % p == 0:
+                n //= p
+            result -= result // p
+        p += 1
+    if n > 1:
+        result -= result // n
+    return result
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    rows = []
+    for label, n in MODULI:
+        numtheory._factor_cache.clear()
+        phi, cold = timed(numtheory.totient, n)
+        _, warm = timed(numtheory.totient, n)
+        if n <= TRIAL_DIVISION_MAX:
+            old_phi, old = timed(trial_division_totient, n)
+            assert old_phi == phi
+            old = f'{old:,.1f}'
+        else:
+            old = 'does not finish'
+        rows.append((label, old, f'{cold:,.2f}', f'{warm:,.3f}'))
+
+    print_table(('modulus', 'trial division ms', 'engine ms', 'cached ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Time to invert a random invertible Hill key mod 26: the original cofactor expansion
+(det + adjugate, O(n!·n²)) vs Gauss–Jordan elimination mod 2 and mod 13 with CRT
+recombination (O(n³)). Cofactor expansion is only run where it finishes quickly.
+
+Run: python benchmarks/bench_hill_linalg.py
+"""
+
+import random
+import time
+
+from harness import print_table
+import numtheory
+
+SIZES = (2, 3, 4, 6, 8, 12, 16)
+COFACTOR_MAX = 8
+
+
+def cofactor_det(matrix, mod=26):
+    """The original hill.determinant: recursive expansion along the first row"""
+    n = len(matrix)
+    if n == 2:
+        return (matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]) % mod
+    det = 0
+    for j in range(n):
+        minor = [[matrix[i][k] for k in range(n) if k != j] for i in range(1, n)]
+        det += (-1) ** j * matrix[0][j] * cofactor_det(minor, mod)
+    return det % mod
+
+
+def cofactor_inverse(matrix):
+    """The original hill.inverse_key_matrix: det⁻¹ × adj(K), one determinant per minor"""
+    n = len(matrix)
+    det_inv = numtheory.modinv(cofactor_det(matrix), 26)
+    if det_inv is None:
+        return None
+    adj = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            minor = [[matrix[r][c] for c in range(n) if c != j] for r in range(n) if r != i]
+            cofactor = minor[0][0] if n == 2 else cofactor_det(minor)
+            adj[j][i] = (-1) ** (i + j) * cofactor
+    return [[det_inv * adj[i][j] % 26 for j in range(n)] for i in range(n)]
+
+
+def invertible_key(n, rng):
+    while True:
+        key = [[rng.randrange(26) for _ in range(n)] for _ in range(n)]
+        if numtheory.matrix_invertible_mod(key, 26):
+            return key
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    rng = random.Random(11)
+    rows = []
+    for n in SIZES:
+        key = invertible_key(n, rng)
+        inverse, fast = timed(numtheory.matrix_inverse_mod, key, 26)
+        if n <= COFACTOR_MAX:
+            old_inverse, old = timed(cofactor_inverse, key)
+            assert old_inverse == inverse
+            old = f'{old:,.2f}'
+        else:
+            old = 'does not finish'
+        rows.append((f'{n}×{n}', old, f'{fast:,.3f}'))
+
+    print_table(('key', 'cofactor ms', 'elimination ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
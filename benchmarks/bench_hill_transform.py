@@ -0,0 +1,58 @@
+"""
+Encrypt + decrypt throughput (KB/s) of the non-narrated Hill path on long texts:
+the original per-block, per-element loop vs hill_transform's pure-Python fallback
+vs its NumPy engine (one (blocks × m) matrix product; skipped when NumPy is absent).
+
+Run: python benchmarks/bench_hill_transform.py
+"""
+
+import random
+
+from harness import throughput, print_table
+import loader
+
+SIZES = (1024, 16 * 1024, 256 * 1024)
+KEY_SIZES = (3, 8)
+
+
+def block_loop_transform(nums, key_matrix, m):
+    """The original hill_transform: matrix_multiply on each block, element by element"""
+    out = []
+    for start in range(0, len(nums) - len(nums) % m, m):
+        block = nums[start:start + m]
+        out.extend(sum(key_matrix[i][j] * block[j] for j in range(m)) % 26 for i in range(m))
+    return out
+
+
+def main():
+    hill = loader.load_module('hill')
+    numpy = hill.np
+    rng = random.Random(12)
+    rows = []
+    for m in KEY_SIZES:
+        key = [[rng.randrange(26) for _ in range(m)] for _ in range(m)]
+        while hill.key_schedule(key)[1] is None:
+            key = [[rng.randrange(26) for _ in range(m)] for _ in range(m)]
+        _, key_inv = hill.key_schedule(key)
+        for size in SIZES:
+            nums = [rng.randrange(26) for _ in range(size - size % m)]
+
+            def original():
+                block_loop_transform(block_loop_transform(nums, key, m), key_inv, m)
+
+            def engine():
+                hill.hill_transform(hill.hill_transform(nums, key, m), key_inv, m)
+
+            kb = size / 1024
+            hill.np = None
+            row = [f'{m}×{m}', f'{size // 1024} KB',
+                   f'{throughput(original) * kb:,.0f}', f'{throughput(engine) * kb:,.0f}']
+            hill.np = numpy
+            row.append(f'{throughput(engine) * kb:,.0f}' if numpy is not None else 'not installed')
+            rows.append(row)
+
+    print_table(('key', 'text', 'block loop KB/s', 'fallback KB/s', 'NumPy KB/s'), rows)
+
+
+if __name__ == '__main__':
+    main()
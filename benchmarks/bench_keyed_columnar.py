@@ -0,0 +1,61 @@
+"""
+Keyed columnar transposition on long texts: the original decrypt (columns rebuilt, then
+read back one character at a time) vs the compiled key, whose column runs are cached per
+text length and slice-assigned back into place. Double transposition is two such passes.
+
+Run: python benchmarks/bench_keyed_columnar.py
+"""
+
+import time
+
+from harness import print_table
+import loader
+
+LENGTHS = (10_000, 100_000, 1_000_000)
+KEYWORD = 'ZEBRAS'
+SECOND_KEYWORD = 'STRIPED'
+
+
+def original_decrypt(text, keyword):
+    """The original keyed_decrypt"""
+    keyed = loader.load_module('keyed_cipher')
+    col_count = len(keyword)
+    _, read_order, _ = keyed.resolve_key_order(keyword)
+    heights = keyed.column_heights(len(text), col_count)
+    columns = [''] * col_count
+    pos = 0
+    for col in read_order:
+        columns[col] = text[pos:pos + heights[col]]
+        pos += heights[col]
+    plain = ''.join(columns[c][r] for r in range(max(heights, default=0))
+                    for c in range(col_count) if r < len(columns[c]))
+    return plain.rstrip('X')
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    keyed = loader.load_module('keyed_cipher')
+    rows = []
+    for n in LENGTHS:
+        text = ('WEAREDISCOVEREDFLEEATONCE' * (n // 25 + 1))[:n]
+        ciphertext, encrypt_ms = timed(keyed.keyed_encrypt, text, KEYWORD)
+        plaintext, decrypt_ms = timed(keyed.keyed_decrypt, ciphertext, KEYWORD)
+        original, original_ms = timed(original_decrypt, ciphertext, KEYWORD)
+        assert plaintext == original == text.rstrip('X')
+        double, double_ms = timed(keyed.keyed_encrypt, text, KEYWORD, None, SECOND_KEYWORD)
+        undone, undo_ms = timed(keyed.keyed_decrypt, double, KEYWORD, None, SECOND_KEYWORD)
+        assert undone == text.rstrip('X')
+        rows.append((f'{n:,}', f'{original_ms:,.1f}', f'{decrypt_ms:,.1f}', f'{encrypt_ms:,.1f}',
+                     f'{double_ms:,.1f}', f'{undo_ms:,.1f}'))
+
+    print_table(('letters', 'original decrypt ms', 'decrypt ms', 'encrypt ms',
+                 'double encrypt ms', 'double decrypt ms'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Multiplications and milliseconds per call for each mod-exp engine, with exponent and
+modulus of the same size. The fastest engine (mod-exp.FASTEST_ENGINE) computes every
+non-narrated result.
+
+Run: python benchmarks/bench_mod_exp_engines.py
+"""
+
+import random
+
+from harness import throughput, print_table
+import loader
+
+SIZES = (64, 512, 2048, 4096)
+
+
+def main():
+    mod_exp = loader.load_module('mod-exp')
+    rng = random.Random(9)
+    operands = {bits: (rng.getrandbits(bits), rng.getrandbits(bits) | 1 << (bits - 1), rng.getrandbits(bits) | 1)
+                for bits in SIZES}
+    rows = []
+    for name, (label, engine) in mod_exp.ENGINES.items():
+        row = [label]
+        for bits in SIZES:
+            a, n, m = operands[bits]
+            _, mults = engine(a, n, m)
+            rate = throughput(lambda: engine(a, n, m), min_time=0.3)
+            row.append(f"{'n/a' if mults is None else mults} / {1000 / rate:,.3f}")
+        rows.append(row)
+
+    print_table(('engine', *(f'{bits}-bit mults / ms' for bits in SIZES)), rows)
+    print(f'\nNon-narrated results use: {mod_exp.FASTEST_ENGINE}')
+
+
+if __name__ == '__main__':
+    main()
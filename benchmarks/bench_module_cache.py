@@ -0,0 +1,66 @@
+"""
+Requests/sec per cipher with and without the shared module cache.
+"before" re-executes the api/lib module on every request (the old load_module),
+"after" uses loader.load_module, which executes each module once per process.
+
+Run: python benchmarks/bench_module_cache.py
+"""
+
+import types
+
+from harness import load_entry, post, throughput, print_table
+import dispatch
+import loader
+
+CASES = [
+    ('co1', 'monoalphabetic', {'cipher': 'monoalphabetic', 'mode': 'additive', 'operation': 'encrypt'}),
+    ('co1', 'hill', {'cipher': 'hill', 'plaintext': 'ACT', 'm': 3}),
+    ('co1', 'adfgvx', {'cipher': 'adfgvx'}),
+    ('co1', 'playfair', {'cipher': 'playfair'}),
+    ('co1', 'sdes', {'cipher': 'sdes'}),
+    ('co1', 'vigenere', {'cipher': 'vigenere'}),
+    ('co1', 'rail_fence', {'cipher': 'rail_fence'}),
+    ('co1', 'keyed', {'cipher': 'keyed'}),
+    ('co2', 'rsa', {'cipher': 'rsa'}),
+    ('math-ops', 'gcd', {'operation': 'gcd'}),
+    ('math-ops', 'extended-euclidean', {'operation': 'extended-euclidean'}),
+    ('math-ops', 'mod-exp', {'operation': 'mod-exp'}),
+    ('math-ops', 'euler', {'operation': 'euler'}),
+    ('math-ops', 'fermat', {'operation': 'fermat'}),
+]
+
+
+def uncached_load_module(name):
+    """The original per-request loader: recompiles the module source every call.
+    Bytecode caching is bypassed because serverless bundles run from a read-only
+    filesystem without __pycache__, so every exec_module compiled from source."""
+    path = loader.module_path(name)
+    module = types.ModuleType(loader.import_name(name))
+    module.__file__ = path
+    with open(path, encoding='utf-8') as f:
+        exec(compile(f.read(), path, 'exec'), module.__dict__)
+    return module
+
+
+def main():
+    entries = {name: load_entry(name) for name in ('co1', 'co2', 'math-ops')}
+    rows = []
+    for entry_name, label, payload in CASES:
+        entry = entries[entry_name]
+
+        def run():
+            status, _, _ = post(entry.handler, payload)
+            assert status == 200, f'{label}: HTTP {status}'
+
+        dispatch.load_module = uncached_load_module
+        before = throughput(run)
+        dispatch.load_module = loader.load_module
+        loader.clear_cache()
+        after = throughput(run)
+        rows.append((entry_name, label, f'{before:,.0f}', f'{after:,.0f}', f'{after / before:.2f}x'))
+
+    print_table(('endpoint', 'cipher', 'before req/s', 'after req/s', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Monoalphabetic (additive/multiplicative/affine) throughput: the original per-character
+arithmetic vs a compiled key, whose translate tables make a whole text one str.translate.
+Compiling a key (both tables) is timed separately.
+
+Run: python benchmarks/bench_monoalphabetic.py
+"""
+
+import time
+
+from harness import print_table, throughput
+import loader
+
+LENGTHS = (1_000, 100_000, 10_000_000)
+KEYS = (('additive', 5, 8, 3), ('multiplicative', 5, 8, 7), ('affine', 5, 8, 3))
+
+
+def original_transform(text, multiplier, offset):
+    """The original monoalphabetic_transform"""
+    return ''.join(chr((multiplier * (ord(char.lower()) - ord('a')) + offset) % 26 + ord('A'))
+                   for char in text if char.isalpha())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+def main():
+    mono = loader.load_module('monoalphabetic')
+    compile_rate = throughput(lambda: mono.compile_key.__wrapped__('affine', 5, 8, 3))
+
+    rows = []
+    for n in LENGTHS:
+        text = ('The quick brown fox jumps over the lazy dog. ' * (n // 45 + 1))[:n]
+        for mode, a, b, k in KEYS:
+            key = mono.compile_key(mode, a, b, k)
+            fast, fast_s = timed(key.encrypt, text)
+            original, original_s = timed(original_transform, text,
+                                         *mono.affine_coefficients(mode, k, a, b, 'encrypt'))
+            assert fast == original
+            assert key.decrypt(fast) == text.upper().translate({ord(c): None for c in ' .'})
+            rows.append((f'{n:,}', mode, f'{n / original_s / 1e6:,.2f}', f'{n / fast_s / 1e6:,.0f}',
+                         f'{original_s / fast_s:,.0f}×'))
+
+    print(f"key compile (encrypt + decrypt tables): {1e6 / compile_rate:,.0f} µs\n")
+    print_table(('characters', 'mode', 'per-character MB/s', 'translate MB/s', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Microseconds per call for the number-theory core at RSA-relevant operand sizes.
+"recursive egcd" is the old rsa.py/dev_server extended_gcd, kept here for comparison;
+at 2048 bits and up it exceeds the default recursion limit.
+
+Run: python benchmarks/bench_numtheory.py
+"""
+
+import random
+
+from harness import throughput, print_table
+import numtheory
+
+SIZES = (64, 512, 2048, 4096)
+PAIRS = 20
+
+
+def recursive_egcd(a, b):
+    """The old recursive extended_gcd (one Python frame per division step)"""
+    if a == 0:
+        return b, 0, 1
+    gcd_val, x1, y1 = recursive_egcd(b % a, a)
+    return gcd_val, y1 - (b // a) * x1, x1
+
+
+def euclid_modinv(a, m):
+    """Modular inverse through the iterative extended Euclid"""
+    g, x, _ = numtheory.euclid_egcd(a, m)
+    return x % m if g == 1 else None
+
+
+FUNCTIONS = [
+    ('recursive egcd', recursive_egcd),
+    ('euclid egcd', numtheory.euclid_egcd),
+    ('lehmer egcd', numtheory.lehmer_egcd),
+    ('egcd', numtheory.egcd),
+    ('euclid modinv', euclid_modinv),
+    ('modinv', numtheory.modinv),
+    ('binary gcd', numtheory.binary_gcd),
+    ('gcd', numtheory.gcd),
+]
+
+
+def main():
+    rng = random.Random(2048)
+    operands = {bits: [(rng.getrandbits(bits) | 1 << (bits - 1), rng.getrandbits(bits) | 1) for _ in range(PAIRS)]
+                for bits in SIZES}
+    rows = []
+    for label, fn in FUNCTIONS:
+        row = [label]
+        for bits in SIZES:
+            pairs = operands[bits]
+
+            def run():
+                for a, b in pairs:
+                    fn(a, b)
+
+            try:
+                row.append(f'{1e6 / (throughput(run, min_time=0.2) * PAIRS):,.2f}')
+            except RecursionError:
+                row.append('RecursionError')
+        rows.append(row)
+
+    print_table(('function', *(f'{bits}-bit µs' for bits in SIZES)), rows)
+
+
+if __name__ == '__main__':
+    main()
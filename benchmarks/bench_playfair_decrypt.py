@@ -0,0 +1,36 @@
+"""
+Non-narrated Playfair decryption (verbosity "result") of growing ciphertexts through
+the compiled key's digram tables. Time per letter stays flat, i.e. the fast path
+scales linearly up to megabyte-sized inputs.
+
+Run: python benchmarks/bench_playfair_decrypt.py
+"""
+
+import random
+import time
+
+from harness import print_table
+import loader
+
+SIZES = (64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+KEYWORD = 'MONARCHY'
+
+
+def main():
+    playfair = loader.load_module('playfair')
+    key = playfair.compile_key(KEYWORD)
+    rng = random.Random(15)
+    rows = []
+    for size in SIZES:
+        ciphertext = ''.join(rng.choices('ABCDEFGHIKLMNOPQRSTUVWXYZ', k=size))
+        start = time.perf_counter()
+        result = playfair.playfair_decrypt_detailed(ciphertext, KEYWORD, verbosity='result', schedule=key)
+        elapsed = time.perf_counter() - start
+        assert key.encrypt(result['plaintext'].lower()) == ciphertext.lower()
+        rows.append((f'{size // 1024:,} KB', f'{elapsed * 1000:,.0f}', f'{size / elapsed / 2 ** 20:,.1f}',
+                     f'{elapsed / size * 1e9:,.0f}'))
+    print_table(('ciphertext', 'ms', 'MB/s', 'ns per letter'), rows)
+
+
+if __name__ == '__main__':
+    main()
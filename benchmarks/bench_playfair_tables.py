@@ -0,0 +1,58 @@
+"""
+Playfair encryption throughput (KB/s of prepared text): re-deriving the row/column/
+rectangle rule for every digram from a position dict (the previous playfair_encrypt)
+vs one lookup per digram in the compiled key's 625-entry table. Also the cost of
+compiling a key, cold and from the LRU cache.
+
+Run: python benchmarks/bench_playfair_tables.py
+"""
+
+import random
+import time
+
+from harness import throughput, print_table
+import loader
+
+SIZES = (1024, 64 * 1024, 1024 * 1024)
+KEYWORD = 'PLAYFAIR EXAMPLE'
+
+
+def rule_encrypt(prepared, key_matrix, pos):
+    """The previous playfair_encrypt: position lookups and the three rules per digram"""
+    out = []
+    for k in range(0, len(prepared), 2):
+        r1, c1 = pos[prepared[k]]
+        r2, c2 = pos[prepared[k + 1]]
+        if r1 == r2:
+            out.append(key_matrix[r1][(c1 + 1) % 5] + key_matrix[r2][(c2 + 1) % 5])
+        elif c1 == c2:
+            out.append(key_matrix[(r1 + 1) % 5][c1] + key_matrix[(r2 + 1) % 5][c2])
+        else:
+            out.append(key_matrix[r1][c2] + key_matrix[r2][c1])
+    return ''.join(out)
+
+
+def main():
+    playfair = loader.load_module('playfair')
+    rng = random.Random(14)
+    key = playfair.compile_key(KEYWORD)
+    rows = []
+    for size in SIZES:
+        prepared = playfair.prepare_text(''.join(rng.choice('abcdefghiklmnopqrstuvwxyz') for _ in range(size)))
+        assert rule_encrypt(prepared, key.matrix, key.index) == key.encrypt(prepared)
+        kb = len(prepared) / 1024
+        old = throughput(lambda: rule_encrypt(prepared, key.matrix, key.index)) * kb
+        new = throughput(lambda: key.encrypt(prepared)) * kb
+        rows.append((f'{size // 1024} KB', f'{old:,.0f}', f'{new:,.0f}', f'{new / old:.1f}x'))
+    print_table(('text', 'per-digram rules KB/s', 'table KB/s', 'speedup'), rows)
+
+    playfair._compile.cache_clear()
+    start = time.perf_counter()
+    playfair.compile_key(KEYWORD)
+    cold = (time.perf_counter() - start) * 1e6
+    warm = 1e6 / throughput(lambda: playfair.compile_key(KEYWORD))
+    print(f'\nCompile key: {cold:,.0f} µs cold, {warm:,.2f} µs cached')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Rail fence on long texts: the original rails × n grid walk (decrypt walks the zig-zag
+three times) vs the closed-form engine, where each rail is one or two strided slices.
+Also the size of the full narration, now that the diagram is drawn for a bounded window.
+
+Run: python benchmarks/bench_rail_fence.py
+"""
+
+import time
+
+from harness import print_table
+import loader
+
+CASES = ((10_000, 5), (100_000, 20), (1_000_000, 50))
+GRID_MAX = 100_000
+
+
+def grid_decrypt(text, num_rails):
+    """The original decrypt narration's grid: mark the zig-zag, fill rail by rail, read it back"""
+    n = len(text)
+    rails = [['.' for _ in range(n)] for _ in range(num_rails)]
+    rail, direction = 0, 1
+    for i in range(n):
+        rails[rail][i] = '*'
+        direction = 1 if rail == 0 else -1 if rail == num_rails - 1 else direction
+        rail += direction
+    idx = 0
+    for r in range(num_rails):
+        for c in range(n):
+            if rails[r][c] == '*':
+                rails[r][c] = text[idx]
+                idx += 1
+    plain = []
+    rail, direction = 0, 1
+    for i in range(n):
+        plain.append(rails[rail][i])
+        direction = 1 if rail == 0 else -1 if rail == num_rails - 1 else direction
+        rail += direction
+    return ''.join(plain)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    rail_fence = loader.load_module('rail_fence')
+    rows = []
+    for n, num_rails in CASES:
+        text = ('WEAREDISCOVEREDFLEEATONCE' * (n // 25 + 1))[:n]
+        ciphertext, encrypt_ms = timed(rail_fence.rail_fence_encrypt, text, num_rails)
+        plaintext, decrypt_ms = timed(rail_fence.rail_fence_decrypt, ciphertext, num_rails)
+        assert plaintext == text
+        if n <= GRID_MAX:
+            assert grid_decrypt(ciphertext, num_rails) == text
+            grid_ms = f'{timed(grid_decrypt, ciphertext, num_rails)[1]:,.0f}'
+        else:
+            grid_ms = 'skipped'
+        result, full_ms = timed(rail_fence.rail_fence_decrypt_detailed, ciphertext, num_rails)
+        narrated = sum(len(sub['content']) for section in result['sections'] for sub in section['subsections'])
+        rows.append((f'{n:,}', num_rails, grid_ms, f'{decrypt_ms:,.1f}', f'{encrypt_ms:,.1f}',
+                     f'{full_ms:,.0f}', f'{narrated / n:.1f}'))
+
+    print_table(('letters', 'rails', 'grid decrypt ms', 'decrypt ms', 'encrypt ms',
+                 'full narration ms', 'narration chars/letter'), rows)
+
+
+if __name__ == '__main__':
+    main()
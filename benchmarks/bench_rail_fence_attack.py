@@ -0,0 +1,44 @@
+"""
+Rail fence analysis mode: wall time to try every rail count 2..50 with every offset
+(2,450 candidates) as the ciphertext grows. Each candidate only gathers and scores its
+first rail_fence.SCORE_LENGTH plaintext characters, so the time stays flat in the length.
+
+Run: python benchmarks/bench_rail_fence_attack.py
+"""
+
+import time
+
+from harness import print_table
+import english
+import loader
+import parallel
+
+LENGTHS = (1_000, 10_000, 100_000, 1_000_000)
+MAX_RAILS = 50
+KEY = (37, 11)
+
+
+def main():
+    rail_fence = loader.load_module('rail_fence')
+    corpus = ''.join(chr(65 + x) for x in english.letters(english.CORPUS))
+    rows = []
+    for n in LENGTHS:
+        plaintext = (corpus * (n // len(corpus) + 1))[:n]
+        ciphertext = rail_fence.rail_fence_encrypt(plaintext, *KEY)
+        rail_fence.read_positions.cache_clear()
+        start = time.perf_counter()
+        result = rail_fence.rail_fence_analyze_detailed(ciphertext, MAX_RAILS, verbosity='result')
+        cold = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        rail_fence.rail_fence_analyze_detailed(ciphertext, MAX_RAILS, verbosity='result')
+        warm = (time.perf_counter() - start) * 1000
+        found = (result['num_rails'], result['offset']) == KEY and result['plaintext'] == plaintext
+        rows.append((f'{n:,}', f'{cold:,.0f}', f'{warm:,.0f}', 'yes' if found else 'no'))
+
+    print(f"{len(rail_fence.analysis_candidates(10 ** 6, MAX_RAILS)):,} candidates, "
+          f"{parallel.worker_count()} worker process(es)\n")
+    print_table(('letters', 'cold ms', 'cached positions ms', 'key found'), rows)
+
+
+if __name__ == '__main__':
+    main()
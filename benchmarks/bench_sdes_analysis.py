@@ -0,0 +1,57 @@
+"""
+S-DES avalanche over all 256 × 1024 (block, key) combinations: a per-combination loop over
+compiled keys (look up both ciphertexts, count differing bits) vs the full 1024 × 256
+ciphertext table, where each flipped bit is one XOR of the table with a reordered copy.
+
+Run: python benchmarks/bench_sdes_analysis.py
+"""
+
+import time
+
+from harness import print_table
+import loader
+
+TABLES = dict(
+    P10=[3, 5, 2, 7, 4, 10, 1, 9, 8, 6], P8=[6, 3, 7, 4, 8, 5, 10, 9], IP=[2, 6, 3, 1, 4, 8, 5, 7],
+    EP=[4, 1, 2, 3, 2, 3, 4, 1], P4=[2, 4, 3, 1],
+    S0=[["01", "00", "11", "10"], ["11", "10", "01", "00"], ["00", "10", "01", "11"], ["11", "01", "11", "10"]],
+    S1=[["00", "01", "10", "11"], ["10", "00", "01", "11"], ["11", "00", "01", "00"], ["10", "01", "00", "11"]],
+)
+
+
+def loop_avalanche():
+    """Mean flipped output bits per plaintext bit and per key bit, one combination at a time"""
+    sdes = loader.load_module('sdes')
+    keys = [sdes.compile_key(k, **TABLES).encrypt_table for k in range(1024)]
+    plain = [sum(sdes.POPCOUNT[keys[k][x] ^ keys[k][x ^ (1 << (8 - i))]] for k in range(1024) for x in range(256))
+             / 262144 for i in range(1, 9)]
+    key = [sum(sdes.POPCOUNT[keys[k][x] ^ keys[k ^ (1 << (10 - j))][x]] for k in range(1024) for x in range(256))
+           / 262144 for j in range(1, 11)]
+    return plain, key
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    sdes = loader.load_module('sdes')
+    (plain, key), loop_ms = timed(loop_avalanche)
+    result, first_ms = timed(sdes.sdes_analysis_detailed, *TABLES.values(), 'result')
+    result, warm_ms = timed(sdes.sdes_analysis_detailed, *TABLES.values(), 'result')
+    assert [round(m, 4) for m in plain] == result['avalanche']['plaintext']['per_bit']
+    assert [round(m, 4) for m in key] == result['avalanche']['key']['per_bit']
+
+    print(f"arrays: {'numpy' if sdes.np is not None else 'bytes'};  "
+          f"DDT + LAT + avalanche, {result['combinations']:,} combinations\n")
+    print_table(('method', 'ms'), [
+        ('per-combination loop (avalanche only)', f'{loop_ms:,.0f}'),
+        ('table sweep, first run', f'{first_ms:,.1f}'),
+        ('table sweep, cached subkeys', f'{warm_ms:,.1f}'),
+    ])
+
+
+if __name__ == '__main__':
+    main()
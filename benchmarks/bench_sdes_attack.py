@@ -0,0 +1,75 @@
+"""
+S-DES known-plaintext key search: compiling each of the 1024 keys and testing it (one
+SDESKey per key) vs pushing a pair through every key at once, and double S-DES by
+checking all 2²⁰ key pairs vs meet in the middle on hashed middle values.
+
+Run: python benchmarks/bench_sdes_attack.py
+"""
+
+import time
+
+from harness import print_table
+import loader
+
+TABLES = dict(
+    P10=[3, 5, 2, 7, 4, 10, 1, 9, 8, 6], P8=[6, 3, 7, 4, 8, 5, 10, 9], IP=[2, 6, 3, 1, 4, 8, 5, 7],
+    EP=[4, 1, 2, 3, 2, 3, 4, 1], P4=[2, 4, 3, 1],
+    S0=[["01", "00", "11", "10"], ["11", "10", "01", "00"], ["00", "10", "01", "11"], ["11", "01", "11", "10"]],
+    S1=[["00", "01", "10", "11"], ["10", "00", "01", "11"], ["11", "00", "01", "00"], ["10", "01", "00", "11"]],
+)
+KEY, SECOND_KEY = 0b1010000010, 0b0111111101
+PLAINTEXTS = (0b10111101, 0b01110010, 0b11001100, 0b00110101)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, (time.perf_counter() - start) * 1000
+
+
+def per_key_search(pairs):
+    """Compile every key and test it against the pairs"""
+    sdes = loader.load_module('sdes')
+    keys = [sdes.SDESKey(k, *(tuple(TABLES[t]) for t in ('P10', 'P8', 'IP', 'EP', 'P4')),
+                         tuple(map(tuple, TABLES['S0'])), tuple(map(tuple, TABLES['S1'])))
+            for k in range(1024)]
+    return keys, [k for k in range(1024) if all(keys[k].encrypt_table[p] == c for p, c in pairs)]
+
+
+def all_pairs_search(keys, pairs):
+    """Double S-DES over all 2²⁰ key pairs (tables already compiled by per_key_search)"""
+    p, c = pairs[0]
+    found = []
+    for a in range(1024):
+        middle = keys[a].encrypt_table[p]
+        for b in range(1024):
+            if keys[b].encrypt_table[middle] == c and all(
+                    keys[b].encrypt_table[keys[a].encrypt_table[x]] == y for x, y in pairs[1:]):
+                found.append((a, b))
+    return found
+
+
+def main():
+    sdes = loader.load_module('sdes')
+    key, second = sdes.compile_key(KEY, **TABLES), sdes.compile_key(SECOND_KEY, **TABLES)
+    single = [(p, key.encrypt_table[p]) for p in PLAINTEXTS[:3]]
+    double = [(p, second.encrypt_table[key.encrypt_table[p]]) for p in PLAINTEXTS]
+
+    (keys, naive), naive_ms = timed(per_key_search, single)
+    _, cold_ms = timed(sdes.brute_force, single, *TABLES.values())
+    (found, _), vector_ms = timed(sdes.brute_force, single, *TABLES.values())
+    assert found == naive == [KEY]
+
+    pairs_found, pairs_ms = timed(all_pairs_search, keys, double)
+    (matches, total, _), mitm_ms = timed(sdes.meet_in_the_middle, double, *TABLES.values())
+    assert sorted(matches) == sorted(pairs_found) and (KEY, SECOND_KEY) in matches
+
+    print(f"arrays: {'numpy' if sdes.np is not None else 'python lists'}\n")
+    print_table(('search', 'baseline ms', 'vectorized ms', 'first run ms', 'keys found'), [
+        ('S-DES, 3 pairs', f'{naive_ms:,.1f}', f'{vector_ms:,.2f}', f'{cold_ms:,.2f}', f'{len(found)}'),
+        ('double S-DES, 4 pairs', f'{pairs_ms:,.1f}', f'{mitm_ms:,.2f}', '', f'{total}'),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+S-DES block modes over byte streams: MB/s for ECB (one translate), CBC encryption
+(sequential, one 256-byte row lookup per byte), CBC decryption (translate, then one XOR
+with the shifted ciphertext) and CTR (a 256-byte keystream tiled and XORed), with CTR
+also timed with the process pool forced on. The upload row sends the bytes through the
+co1 handler as an application/octet-stream body, answered as JSON and as an NDJSON stream.
+
+Run: python benchmarks/bench_sdes_modes.py
+"""
+
+import base64
+import json
+import os
+import time
+
+from harness import load_entry, print_table, upload
+import loader
+
+KEY = '1010000010'
+TABLES = dict(
+    P10=[3, 5, 2, 7, 4, 10, 1, 9, 8, 6], P8=[6, 3, 7, 4, 8, 5, 10, 9], IP=[2, 6, 3, 1, 4, 8, 5, 7],
+    EP=[4, 1, 2, 3, 2, 3, 4, 1], P4=[2, 4, 3, 1],
+    S0=[["01", "00", "11", "10"], ["11", "10", "01", "00"], ["00", "10", "01", "11"], ["11", "01", "11", "10"]],
+    S1=[["00", "01", "10", "11"], ["10", "00", "01", "11"], ["11", "00", "01", "00"], ["10", "01", "00", "11"]],
+)
+SIZES = (100_000, 1_000_000, 16_000_000)
+IV = 0b10101010
+UPLOAD_SIZE = 1_000_000
+UPLOAD_PATH = '/api/co1?cipher=sdes_stream&blockMode=ctr&iv=10101010&key=' + KEY
+
+
+def rate(size, fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, f'{size / (time.perf_counter() - start) / 1e6:,.1f}'
+
+
+def main():
+    sdes = loader.load_module('sdes')
+    key = sdes.compile_key(KEY, **TABLES)
+    key.chain_rows  # built once per key; not part of the per-stream cost
+
+    rows = []
+    for size in SIZES:
+        data = os.urandom(size)
+        ecb, ecb_rate = rate(size, sdes.ecb_encrypt, key, data)
+        assert sdes.ecb_decrypt(key, ecb) == data
+        cbc, cbc_enc_rate = rate(size, sdes.cbc_encrypt, key, data, IV)
+        plain, cbc_dec_rate = rate(size, sdes.cbc_decrypt, key, cbc, IV)
+        assert plain == data
+        ctr, ctr_rate = rate(size, sdes.ctr_crypt, key, data, IV, 1)
+        pooled, pool_rate = rate(size, sdes.ctr_crypt, key, data, IV, 4)
+        assert pooled == ctr and sdes.ctr_crypt(key, ctr, IV) == data
+        rows.append((f'{size:,}', ecb_rate, cbc_enc_rate, cbc_dec_rate, ctr_rate, pool_rate))
+
+    co1 = load_entry('co1').handler
+    data = os.urandom(UPLOAD_SIZE)
+    start = time.perf_counter()
+    status, _, body = upload(co1, data, UPLOAD_PATH + '&verbosity=result')
+    upload_s = time.perf_counter() - start
+    assert status == 200 and base64.b64decode(json.loads(body)['output']) == sdes.ctr_crypt(key, data, IV)
+    start = time.perf_counter()
+    status, headers, body = upload(co1, data, UPLOAD_PATH + '&stream=true&maxSteps=4')
+    stream_s = time.perf_counter() - start
+    records = [json.loads(line) for line in body.splitlines()]
+    assert status == 200 and headers['Content-type'] == 'application/x-ndjson' and records[-1]['success']
+
+    print(f"xor: {'numpy' if sdes.np is not None else 'int.from_bytes'};  "
+          f"CTR pool threshold (without numpy): {sdes.CTR_PARALLEL_MIN:,} bytes\n")
+    print_table(('bytes', 'ECB MB/s', 'CBC enc MB/s', 'CBC dec MB/s', 'CTR MB/s', 'CTR ×4 pool MB/s'), rows)
+    print()
+    print_table(('upload bytes', 'CTR JSON MB/s', 'CTR NDJSON stream MB/s', 'stream records'), [
+        (f'{UPLOAD_SIZE:,}', f'{UPLOAD_SIZE / upload_s / 1e6:,.1f}', f'{UPLOAD_SIZE / stream_s / 1e6:,.1f}',
+         f'{len(records)}'),
+    ])
+
+
+if __name__ == '__main__':
+    main()
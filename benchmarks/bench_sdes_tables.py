@@ -0,0 +1,80 @@
+"""
+S-DES throughput: the original bit-string block function (every bit a character, joins and
+int(..., 2) per step) vs a compiled key, whose 256-entry byte table turns a whole message
+into one bytes.translate. Compiling a key (subkeys + both tables) is timed separately.
+
+Run: python benchmarks/bench_sdes_tables.py
+"""
+
+import os
+import time
+
+from harness import print_table, throughput
+import loader
+
+KEY = '1010000010'
+TABLES = dict(
+    P10=[3, 5, 2, 7, 4, 10, 1, 9, 8, 6], P8=[6, 3, 7, 4, 8, 5, 10, 9], IP=[2, 6, 3, 1, 4, 8, 5, 7],
+    EP=[4, 1, 2, 3, 2, 3, 4, 1], P4=[2, 4, 3, 1],
+    S0=[["01", "00", "11", "10"], ["11", "10", "01", "00"], ["00", "10", "01", "11"], ["11", "01", "11", "10"]],
+    S1=[["00", "01", "10", "11"], ["10", "00", "01", "11"], ["11", "00", "01", "00"], ["10", "01", "00", "11"]],
+)
+SIZES = (1_000, 100_000, 10_000_000)
+STRING_MAX = 100_000
+
+
+def _permute(bits, table):
+    return ''.join(bits[i - 1] for i in table)
+
+
+def _xor(a, b):
+    return ''.join('0' if i == j else '1' for i, j in zip(a, b))
+
+
+def _fk(bits, key, EP, P4, S0, S1):
+    left, right = bits[:4], bits[4:]
+    x = _xor(_permute(right, EP), key)
+    s0 = S0[int(x[0] + x[3], 2)][int(x[1] + x[2], 2)]
+    s1 = S1[int(x[4] + x[7], 2)][int(x[5] + x[6], 2)]
+    return _xor(_permute(s0 + s1, P4), left) + right
+
+
+def string_encrypt(block, K1, K2, IP_INV):
+    """The original sdes_encrypt on one 8-character bit string"""
+    t = TABLES
+    r1 = _fk(_permute(block, t['IP']), K1, t['EP'], t['P4'], t['S0'], t['S1'])
+    return _permute(_fk(r1[4:] + r1[:4], K2, t['EP'], t['P4'], t['S0'], t['S1']), IP_INV)
+
+
+def main():
+    sdes = loader.load_module('sdes')
+    key = sdes.compile_key(KEY, **TABLES)
+    K1, K2 = key.subkeys
+    IP_INV = sdes.calculate_ip_inverse(TABLES['IP'])
+    compile_rate = throughput(lambda: sdes._compile.__wrapped__(int(KEY, 2), *map(tuple, (
+        TABLES['P10'], TABLES['P8'], TABLES['IP'], TABLES['EP'], TABLES['P4'])),
+        tuple(map(tuple, TABLES['S0'])), tuple(map(tuple, TABLES['S1']))))
+
+    rows = []
+    for size in SIZES:
+        data = os.urandom(size)
+        start = time.perf_counter()
+        encrypted = key.encrypt(data)
+        table_s = time.perf_counter() - start
+        assert key.decrypt(encrypted) == data
+        if size <= STRING_MAX:
+            start = time.perf_counter()
+            strings = [string_encrypt(format(b, '08b'), K1, K2, IP_INV) for b in data]
+            string_s = time.perf_counter() - start
+            assert bytes(int(c, 2) for c in strings) == encrypted
+            string_rate = f'{size / string_s / 1e6:,.3f}'
+        else:
+            string_rate = 'skipped'
+        rows.append((f'{size:,}', string_rate, f'{size / table_s / 1e6:,.0f}'))
+
+    print(f"key compile (subkeys + 2×256-entry tables): {1e6 / compile_rate:,.0f} µs\n")
+    print_table(('bytes', 'bit-string MB/s', 'translate MB/s'), rows)
+
+
+if __name__ == '__main__':
+    main()
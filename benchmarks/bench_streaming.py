@@ -0,0 +1,65 @@
+"""
+Time-to-first-byte, total time and peak memory of buffered JSON vs NDJSON streaming
+for the section-generator ciphers on long inputs.
+
+Run: python benchmarks/bench_streaming.py
+"""
+
+import json
+import time
+import tracemalloc
+
+from harness import _FakeSocket, _quiet, load_entry, print_table
+
+LONG_TEXT = 'WEAREDISCOVEREDFLEEATONCE' * 80
+
+CASES = [
+    ('co1', 'rail_fence', {'cipher': 'rail_fence', 'numRails': 5, 'plaintext': LONG_TEXT}),
+    ('co1', 'keyed', {'cipher': 'keyed', 'keyword': 'ZEBRAS', 'plaintext': LONG_TEXT}),
+    ('math-ops', 'mod-exp', {'operation': 'mod-exp', 'a': 7, 'n': 2 ** 2048 - 1, 'm': 2 ** 521 - 1}),
+]
+
+
+class _TimedSocket(_FakeSocket):
+    """Records when each chunk is written (the first write is the header block).
+    The bytes are discarded so the client side does not count toward peak memory."""
+
+    def __init__(self, raw):
+        super().__init__(raw)
+        self.writes = []
+
+    def sendall(self, data):
+        self.writes.append(time.perf_counter())
+
+
+def timed_post(handler_cls, payload):
+    """(time to first body byte, total time, peak traced memory) for one request"""
+    body = json.dumps(payload).encode('utf-8')
+    raw = (f'POST / HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n'
+           f'Content-Length: {len(body)}\r\n\r\n').encode('latin-1') + body
+    sock = _TimedSocket(raw)
+    tracemalloc.start()
+    start = time.perf_counter()
+    _quiet(handler_cls)(sock, ('127.0.0.1', 0), None)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    first_body = sock.writes[1] if len(sock.writes) > 1 else sock.writes[0]
+    return first_body - start, total, peak
+
+
+def main():
+    entries = {name: load_entry(name) for name in ('co1', 'math-ops')}
+    rows = []
+    for entry_name, label, payload in CASES:
+        handler_cls = entries[entry_name].handler
+        for mode, stream in (('json', False), ('ndjson', True)):
+            ttfb, total, peak = min((timed_post(handler_cls, dict(payload, stream=stream)) for _ in range(3)),
+                                   key=lambda r: r[1])
+            rows.append((label, mode, f'{ttfb * 1000:.1f}', f'{total * 1000:.1f}', f'{peak / 1024:,.0f}'))
+
+    print_table(('cipher', 'response', 'first byte ms', 'total ms', 'peak KiB'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Requests/sec and response size per cipher at each verbosity level.
+"full" builds every narration section, "summary" only the Final Result section,
+"result" no explanation text at all.
+
+Run: python benchmarks/bench_verbosity.py
+"""
+
+from harness import load_entry, post, throughput, print_table
+from bench_module_cache import CASES
+
+LONG_TEXT = 'WEAREDISCOVEREDFLEEATONCE' * 8
+
+# Longer inputs where the narration dominates the work
+OVERRIDES = {
+    'vigenere': {'plaintext': LONG_TEXT},
+    'rail_fence': {'plaintext': LONG_TEXT},
+    'keyed': {'plaintext': LONG_TEXT},
+    'playfair': {'plaintext': LONG_TEXT},
+    'monoalphabetic': {'plaintext': LONG_TEXT},
+    'mod-exp': {'a': 7, 'n': 2 ** 255 - 19, 'm': 2 ** 127 - 1},
+}
+
+LEVELS = ('full', 'summary', 'result')
+
+
+def main():
+    entries = {name: load_entry(name) for name in ('co1', 'co2', 'math-ops')}
+    rows = []
+    for entry_name, label, payload in CASES:
+        entry = entries[entry_name]
+        payload = dict(payload, **OVERRIDES.get(label, {}))
+        row = [entry_name, label]
+        rates = {}
+        for level in LEVELS:
+            request = dict(payload, verbosity=level)
+            status, _, body = post(entry.handler, request)
+            assert status == 200, f'{label}/{level}: HTTP {status}'
+            rates[level] = throughput(lambda: post(entry.handler, request))
+            row.append(f'{rates[level]:,.0f} / {len(body):,}B')
+        row.append(f"{rates['result'] / rates['full']:.1f}x")
+        rows.append(row)
+
+    print_table(('endpoint', 'cipher', *(f'{level} req/s / size' for level in LEVELS), 'result vs full'), rows)
+
+
+if __name__ == '__main__':
+    main()
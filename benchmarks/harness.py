@@ -0,0 +1,89 @@
+"""
+In-process driver for the serverless handlers, used by the benchmark scripts.
+Feeds a raw HTTP request to a handler class and returns the parsed response,
+so benchmarks measure the real do_POST path without opening sockets.
+"""
+
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, 'api')
+LIB_DIR = os.path.join(API_DIR, 'lib')
+
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+
+def load_entry(name):
+    """Load a serverless entry point (api/<name>.py) as a module"""
+    path = os.path.join(API_DIR, f'{name}.py')
+    spec = importlib.util.spec_from_file_location(f'entry_{name.replace("-", "_")}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _FakeSocket:
+    def __init__(self, raw):
+        self._in = io.BytesIO(raw)
+        self.out = bytearray()
+
+    def makefile(self, mode, bufsize=None):
+        return self._in
+
+    def sendall(self, data):
+        self.out += data
+
+
+def _quiet(handler_cls):
+    """Subclass of handler_cls that does not log every request to stderr"""
+    return type(handler_cls.__name__, (handler_cls,), {'log_message': lambda self, *args: None})
+
+
+def post(handler_cls, payload, path='/'):
+    """Send one JSON POST through handler_cls; returns (status, headers, body bytes)"""
+    return _send(handler_cls, json.dumps(payload).encode('utf-8'), 'application/json', path)
+
+
+def upload(handler_cls, data, path='/'):
+    """Send raw bytes as an application/octet-stream POST (parameters go in the path's query string)"""
+    return _send(handler_cls, data, 'application/octet-stream', path)
+
+
+def _send(handler_cls, body, content_type, path):
+    raw = (f'POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: {content_type}\r\n'
+           f'Content-Length: {len(body)}\r\n\r\n').encode('latin-1') + body
+    sock = _FakeSocket(raw)
+    _quiet(handler_cls)(sock, ('127.0.0.1', 0), None)
+
+    head, _, resp_body = bytes(sock.out).partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+    return status, headers, resp_body
+
+
+def throughput(fn, min_time=0.5, min_runs=5):
+    """Call fn repeatedly for at least min_time seconds; returns calls per second"""
+    runs = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while runs < min_runs or elapsed < min_time:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+    return runs / elapsed
+
+
+def print_table(headers, rows):
+    """Print rows as a fixed-width text table"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('─' * w for w in widths))
+    for row in rows:
+        print('  '.join(str(c).ljust(w) for c, w in zip(row, widths)))
@@ -13,6 +13,11 @@ import math
 
 # Add api folder to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'api', 'lib'))
+# Pick up edits to api/lib modules without restarting the dev server
+os.environ.setdefault('DPS_RELOAD_MODULES', '1')
+from dispatch import ENDPOINTS, handle_post
+from numtheory import gcd, modinv, matrix_det_mod
 
 # ========== S-DES Functions ==========
 
@@ -205,19 +210,6 @@ K₂:          {format_bits(K2)}
 
 # ========== RSA Functions ==========
 
-def gcd_func(a, b):
-    while b:
-        a, b = b, a % b
-    return a
-
-def extended_gcd(a, b):
-    if a == 0:
-        return b, 0, 1
-    gcd_val, x1, y1 = extended_gcd(b % a, a)
-    x = y1 - (b // a) * x1
-    y = x1
-    return gcd_val, x, y
-
 def mod_exp_detailed(base, exp, mod):
     steps = []
     steps.append(f"Computing {base}^{exp} mod {mod}")
@@ -395,7 +387,7 @@ def rsa_encrypt_detailed(p, q, e, m):
     phi_content = f"φ(n) = (p - 1) × (q - 1)\nφ({n}) = ({p} - 1) × ({q} - 1)\nφ({n}) = {p-1} × {q-1}\nφ({n}) = {phi}"
     all_sections.append({"section": "Calculate φ(n) - Euler's Totient", "subsections": [{"title": "Computation", "content": phi_content}]})
     
-    gcd_val = gcd_func(e, phi)
+    gcd_val = gcd(e, phi)
     gcd_content = f"gcd({e}, {phi}) = {gcd_val}\n\n{'✓ Valid: e and φ(n) are coprime' if gcd_val == 1 else '✗ Invalid'}"
     all_sections.append({"section": "Verify Public Exponent e", "subsections": [{"title": "GCD Check", "content": gcd_content}]})
     
@@ -434,25 +426,7 @@ def num_to_char(num):
     return chr((num % 26) + ord('A'))
 
 def determinant(matrix, mod=26):
-    n = len(matrix)
-    if n == 2:
-        return (matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]) % mod
-    det = 0
-    for j in range(n):
-        minor = []
-        for i in range(1, n):
-            row = [matrix[i][k] for k in range(n) if k != j]
-            minor.append(row)
-        cofactor = ((-1) ** j) * matrix[0][j] * determinant(minor, mod)
-        det += cofactor
-    return det % mod
-
-def mod_inverse_26(a, m=26):
-    a = a % m
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None
+    return matrix_det_mod(matrix, mod)
 
 def adjugate(matrix):
     n = len(matrix)
@@ -539,7 +513,7 @@ def hill_cipher_detailed(plaintext, key_matrix, m, vector_mode='column'):
         det += 26
     all_sections.append({"section": "Determinant", "subsections": [{"title": "det(K) mod 26", "content": f"det(K) mod 26 = {det}"}]})
     
-    det_inv = mod_inverse_26(det)
+    det_inv = modinv(det, 26)
     if det_inv:
         all_sections.append({"section": "Modular Inverse", "subsections": [{"title": f"det⁻¹ mod 26 = {det_inv}", "content": f"{det} × {det_inv} mod 26 = {(det * det_inv) % 26}"}]})
         adj = adjugate(key_matrix)
@@ -673,6 +647,11 @@ class DevHandler(http.server.SimpleHTTPRequestHandler):
         self.end_headers()
     
     def do_POST(self):
+        # Consolidated endpoints share the serverless dispatch registry
+        endpoint = self.path[len('/api/'):]
+        if self.path.startswith('/api/') and endpoint in ENDPOINTS:
+            return handle_post(self, endpoint)
+        
         try:
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
@@ -815,188 +794,6 @@ class DevHandler(http.server.SimpleHTTPRequestHandler):
                         ciphertext = data.get('ciphertext', '')
                         result = vigenere_module.autokey_decrypt_detailed(ciphertext, key)
             
-            elif self.path == '/api/math-ops':
-                import importlib.util
-                operation = data.get('operation', 'gcd')
-                
-                if operation == 'gcd':
-                    spec = importlib.util.spec_from_file_location("gcd", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'gcd.py'))
-                    gcd_module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(gcd_module)
-                    a = int(data.get('a', 48))
-                    b = int(data.get('b', 18))
-                    result = gcd_module.gcd_detailed(a, b)
-                    
-                elif operation == 'extended-euclidean':
-                    spec = importlib.util.spec_from_file_location("extended_euclidean", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'extended-euclidean.py'))
-                    ee_module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(ee_module)
-                    a = int(data.get('a', 17))
-                    m = int(data.get('m', 26))
-                    result = ee_module.extended_euclidean_detailed(a, m)
-                    
-                elif operation == 'mod-exp':
-                    spec = importlib.util.spec_from_file_location("mod_exp", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'mod-exp.py'))
-                    me_module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(me_module)
-                    a = int(data.get('a', 7))
-                    n = int(data.get('n', 256))
-                    m = int(data.get('m', 13))
-                    result = me_module.mod_exp_detailed(a, n, m)
-                    
-                elif operation == 'euler':
-                    spec = importlib.util.spec_from_file_location("euler", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'euler.py'))
-                    euler_module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(euler_module)
-                    base = int(data.get('base', 7))
-                    exponent = int(data.get('exponent', 256))
-                    modulus = int(data.get('modulus', 13))
-                    result = euler_module.euler_theorem_detailed(base, exponent, modulus)
-                    
-                elif operation == 'fermat':
-                    spec = importlib.util.spec_from_file_location("fermat", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'fermat.py'))
-                    fermat_module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(fermat_module)
-                    base = int(data.get('base', 3))
-                    exponent = int(data.get('exponent', 100))
-                    modulus = int(data.get('modulus', 7))
-                    result = fermat_module.fermat_theorem_detailed(base, exponent, modulus)
-                    
-                else:
-                    result = {"success": False, "error": f"Unknown operation: {operation}"}
-            
-            elif self.path == '/api/co1':
-                import importlib.util
-                cipher = data.get('cipher', 'monoalphabetic')
-                
-                if cipher == 'monoalphabetic':
-                    spec = importlib.util.spec_from_file_location("monoalphabetic", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'monoalphabetic.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    plaintext = data.get('plaintext', 'HELLO')
-                    mode = data.get('mode', 'encrypt')
-                    key_k = data.get('key_k', 3)
-                    key_a = data.get('key_a', 5)
-                    key_b = data.get('key_b', 8)
-                    operation = data.get('operation', 'additive')
-                    result = module.monoalphabetic_cipher_detailed(plaintext, mode, key_k=key_k, key_a=key_a, key_b=key_b, operation=operation)
-                    
-                elif cipher == 'hill':
-                    spec = importlib.util.spec_from_file_location("hill", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'hill.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    plaintext = data.get('plaintext', 'HELLO')
-                    keyMatrix = data.get('keyMatrix', [[6, 24, 1], [13, 16, 10], [20, 17, 15]])
-                    m = data.get('m', 3)
-                    vectorMode = data.get('vectorMode', 'column')
-                    result = module.hill_cipher_detailed(plaintext, keyMatrix, m, vectorMode)
-                    
-                elif cipher == 'adfgvx':
-                    spec = importlib.util.spec_from_file_location("adfgvx", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'adfgvx.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    mode = data.get('mode', 'encrypt')
-                    poly_key = data.get('polyKey', 'privacy')
-                    trans_key = data.get('transKey', 'cipher')
-                    if mode == 'encrypt':
-                        plaintext = data.get('plaintext', 'attackat1200am')
-                        result = module.encrypt_adfgvx_detailed(plaintext, poly_key, trans_key)
-                    else:
-                        ciphertext = data.get('ciphertext', '')
-                        result = module.decrypt_adfgvx_detailed(ciphertext, poly_key, trans_key)
-                        
-                elif cipher == 'playfair':
-                    spec = importlib.util.spec_from_file_location("playfair", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'playfair.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    plaintext = data.get('plaintext', 'HELLO')
-                    keyword = data.get('keyword', 'MONARCHY')
-                    result = module.playfair_cipher_detailed(plaintext, keyword)
-                    
-                elif cipher == 'sdes':
-                    spec = importlib.util.spec_from_file_location("sdes", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'sdes.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    plaintext = data.get('plaintext', '10111101')
-                    key = data.get('key', '1010000010')
-                    P10 = data.get('P10', [3,5,2,7,4,10,1,9,8,6])
-                    P8 = data.get('P8', [6,3,7,4,8,5,10,9])
-                    IP = data.get('IP', [2,6,3,1,4,8,5,7])
-                    EP = data.get('EP', [4,1,2,3,2,3,4,1])
-                    P4 = data.get('P4', [2,4,3,1])
-                    S0 = data.get('S0', [["01","00","11","10"],["11","10","01","00"],["00","10","01","11"],["11","01","11","10"]])
-                    S1 = data.get('S1', [["00","01","10","11"],["10","00","01","11"],["11","00","01","00"],["10","01","00","11"]])
-                    IP_INV = module.calculate_ip_inverse(IP)
-                    result = module.encrypt_with_detailed_steps(plaintext, key, P10, P8, IP, IP_INV, EP, P4, S0, S1)
-                    
-                elif cipher == 'vigenere':
-                    spec = importlib.util.spec_from_file_location("vigenere", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'vigenere.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    mode = data.get('mode', 'encrypt')
-                    cipher_type = data.get('cipherType', 'vigenere')
-                    key = data.get('key', 'KEY')
-                    if cipher_type == 'vigenere':
-                        if mode == 'encrypt':
-                            plaintext = data.get('plaintext', 'HELLO')
-                            result = module.vigenere_encrypt_detailed(plaintext, key)
-                        else:
-                            ciphertext = data.get('ciphertext', '')
-                            result = module.vigenere_decrypt_detailed(ciphertext, key)
-                    else:  # autokey
-                        if mode == 'encrypt':
-                            plaintext = data.get('plaintext', 'HELLO')
-                            result = module.autokey_encrypt_detailed(plaintext, key)
-                        else:
-                            ciphertext = data.get('ciphertext', '')
-                            result = module.autokey_decrypt_detailed(ciphertext, key)
-                
-                elif cipher == 'rail_fence':
-                    spec = importlib.util.spec_from_file_location("rail_fence", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'rail_fence.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    mode = data.get('mode', 'encrypt')
-                    num_rails = int(data.get('numRails', 3))
-                    if mode == 'encrypt':
-                        plaintext = data.get('plaintext', 'WEAREDISCOVEREDFLEEATONCE')
-                        result = module.rail_fence_encrypt_detailed(plaintext, num_rails)
-                    else:
-                        ciphertext = data.get('ciphertext', '')
-                        result = module.rail_fence_decrypt_detailed(ciphertext, num_rails)
-                
-                elif cipher == 'keyed':
-                    spec = importlib.util.spec_from_file_location("keyed_cipher", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'keyed_cipher.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    mode = data.get('mode', 'encrypt')
-                    keyword = data.get('keyword', 'KEY')
-                    column_order = data.get('columnOrder', None)
-                    if mode == 'encrypt':
-                        plaintext = data.get('plaintext', 'WEAREDISCOVEREDFLEEATONCE')
-                        result = module.keyed_encrypt_detailed(plaintext, keyword, column_order)
-                    else:
-                        ciphertext = data.get('ciphertext', '')
-                        result = module.keyed_decrypt_detailed(ciphertext, keyword, column_order)
-                
-                else:
-                    result = {"success": False, "error": f"Unknown cipher: {cipher}"}
-            
-            elif self.path == '/api/co2':
-                import importlib.util
-                cipher = data.get('cipher', 'rsa')
-                
-                if cipher == 'rsa':
-                    spec = importlib.util.spec_from_file_location("rsa", os.path.join(os.path.dirname(__file__), 'api', 'lib', 'rsa.py'))
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    p = int(data.get('p', 61))
-                    q = int(data.get('q', 53))
-                    e = int(data.get('e', 17))
-                    m = int(data.get('m', 65))
-                    result = module.rsa_encrypt_detailed(p, q, e, m)
-                else:
-                    result = {"success": False, "error": f"Unknown cipher: {cipher}"}
-            
             else:
                 self.send_response(404)
                 self.end_headers()